@@ -4,7 +4,7 @@ import json
 import logging
 
 from aiohttp import web
-from aiohttp.web_exceptions import HTTPBadRequest
+from aiohttp.web_exceptions import HTTPBadRequest, HTTPInternalServerError
 import async_timeout
 import voluptuous as vol
 
@@ -12,6 +12,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_TIME_CHANGED,
     HTTP_BAD_REQUEST,
@@ -204,7 +205,7 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        return _states_json_response(states)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -222,7 +223,7 @@ class APIEntityStateView(HomeAssistantView):
 
         state = request.app["hass"].states.get(entity_id)
         if state:
-            return self.json(state)
+            return _states_json_response(state)
         return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
@@ -417,3 +418,22 @@ def async_events_json(hass):
         {"event": key, "listener_count": value}
         for key, value in hass.bus.async_listeners().items()
     ]
+
+
+def _states_json_response(states):
+    """Return a JSON response with a state or a list of states.
+
+    The states are encoded with their cached JSON.
+    """
+    try:
+        if isinstance(states, ha.State):
+            msg = states.as_json()
+        else:
+            msg = "[{}]".format(", ".join(state.as_json() for state in states))
+    except (ValueError, TypeError) as err:
+        _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, states)
+        raise HTTPInternalServerError
+
+    response = web.Response(body=msg.encode("UTF-8"), content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
@@ -4,6 +4,7 @@ import base64
 import collections
 from contextlib import suppress
 from datetime import timedelta
+from functools import partial
 import hashlib
 import logging
 from random import SystemRandom
@@ -49,6 +50,7 @@ from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.loader import bind_hass
 from homeassistant.setup import async_when_setup
 
+from .broker import FrameBroker
 from .const import DATA_CAMERA_PREFS, DOMAIN
 from .prefs import CameraPreferences
 
@@ -146,7 +148,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.frame_broker.async_get_frame()
 
             if image:
                 return Image(camera.content_type, image)
@@ -356,6 +358,14 @@ class Camera(Entity):
         """Return the interval between frames of the mjpeg stream."""
         return 0.5
 
+    @property
+    def frame_broker(self):
+        """Return the broker sharing the frames of the camera."""
+        broker = getattr(self, "_frame_broker", None)
+        if broker is None:
+            broker = self._frame_broker = FrameBroker(self)
+        return broker
+
     async def stream_source(self):
         """Return the source of the stream."""
         return None
@@ -378,7 +388,10 @@ class Camera(Entity):
         This method must be run in the event loop.
         """
         return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
+            request,
+            partial(self.frame_broker.async_get_frame, interval),
+            self.content_type,
+            interval,
         )
 
     async def handle_async_mjpeg_stream(self, request):
@@ -509,7 +522,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.frame_broker.async_get_frame()
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -0,0 +1,70 @@
+"""Share the frames of a camera between its clients."""
+import asyncio
+
+import async_timeout
+
+from homeassistant.core import callback
+
+# mypy: allow-untyped-defs, no-check-untyped-defs
+
+FETCH_TIMEOUT = 10
+# Seconds a frame fetched for a still image request is kept
+STILL_FRAME_TTL = 0.5
+
+
+class FrameBroker:
+    """Fetch the frames of a camera once for all of its clients.
+
+    Concurrent requests share a single fetch. A frame fetched for a stream
+    is kept for the interval of that stream, so all streams and still
+    requests during the interval receive the same bytes. Frames fetched
+    for still requests are kept briefly, for dashboards that load the same
+    camera in several cards.
+    """
+
+    def __init__(self, camera):
+        """Initialize the broker."""
+        self.camera = camera
+        self._frame = None
+        self._expires = 0.0
+        self._fetch = None
+
+    async def async_get_frame(self, ttl=None):
+        """Return the latest frame of the camera.
+
+        A new frame is kept for ttl seconds after its fetch started, or for
+        STILL_FRAME_TTL seconds without ttl.
+        """
+        if ttl is None:
+            ttl = STILL_FRAME_TTL
+        now = self.camera.hass.loop.time()
+        if self._frame is not None and now < self._expires:
+            return self._frame
+
+        if self._fetch is None:
+            self._fetch = self.camera.hass.async_create_task(
+                self._async_fetch(now, ttl)
+            )
+            self._fetch.add_done_callback(self._async_fetch_done)
+
+        # Clients that time out must not cancel the fetch of the others
+        return await asyncio.shield(self._fetch)
+
+    async def _async_fetch(self, started, ttl):
+        """Fetch a frame from the camera."""
+        async with async_timeout.timeout(FETCH_TIMEOUT):
+            frame = await self.camera.async_camera_image()
+
+        if frame:
+            self._frame = frame
+            self._expires = started + ttl
+
+        return frame
+
+    @callback
+    def _async_fetch_done(self, task):
+        """Allow a new fetch once the current one is done."""
+        self._fetch = None
+        if not task.cancelled():
+            # Mark the error as retrieved if all clients are gone
+            task.exception()
@@ -1,16 +1,16 @@
 """Allows the creation of a sensor that filters state property."""
+import asyncio
+from bisect import bisect_left, insort
 from collections import Counter, deque
 from copy import copy
 from datetime import timedelta
-from functools import partial
 import logging
 from numbers import Number
-import statistics
 from typing import Optional
 
 import voluptuous as vol
 
-from homeassistant.components import history
+from homeassistant.components.recorder.preload import async_load_states
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -233,35 +233,31 @@ class SensorFilter(Entity):
                     largest_window_time = filt.window_size
 
             # Retrieve the largest window_size of each type
+            requests = []
             if largest_window_items > 0:
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.get_last_state_changes,
+                requests.append(
+                    async_load_states(
                         self.hass,
-                        largest_window_items,
-                        entity_id=self._entity,
+                        self._entity,
+                        number_of_states=largest_window_items,
+                        changes_only=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(filter_history[self._entity])
             if largest_window_time > timedelta(seconds=0):
-                start = dt_util.utcnow() - largest_window_time
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.state_changes_during_period,
+                requests.append(
+                    async_load_states(
                         self.hass,
-                        start,
-                        entity_id=self._entity,
+                        self._entity,
+                        start_time=dt_util.utcnow() - largest_window_time,
+                        changes_only=True,
+                        include_start_time_state=True,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(
-                        [
-                            state
-                            for state in filter_history[self._entity]
-                            if state not in history_list
-                        ]
-                    )
+            # Both windows are loaded by the same query
+            for filter_history in await asyncio.gather(*requests):
+                history_list.extend(
+                    [state for state in filter_history if state not in history_list]
+                )
 
             # Sort the window states
             history_list = sorted(history_list, key=lambda s: s.last_updated)
@@ -389,12 +385,16 @@ class Filter:
         filtered = self._filter_state(FilterState(new_state))
         filtered.set_precision(self.precision)
         if self._store_raw:
-            self.states.append(copy(FilterState(new_state)))
+            self._store_state(copy(FilterState(new_state)))
         else:
-            self.states.append(copy(filtered))
+            self._store_state(copy(filtered))
         new_state.state = filtered.state
         return new_state
 
+    def _store_state(self, filter_state):
+        """Add a state to the window of previous states."""
+        self.states.append(filter_state)
+
 
 @FILTERS.register(FILTER_NAME_RANGE)
 class RangeFilter(Filter):
@@ -466,10 +466,32 @@ class OutlierFilter(Filter):
         self._radius = radius
         self._stats_internal = Counter()
         self._store_raw = True
+        # Values of the window of states, sorted for the median
+        self._sorted_states = []
+
+    def _store_state(self, filter_state):
+        """Add a state to the window and its sorted values."""
+        if self.states.maxlen == 0:
+            # An empty window keeps no values
+            return
+        if len(self.states) == self.states.maxlen:
+            del self._sorted_states[
+                bisect_left(self._sorted_states, self.states[0].state)
+            ]
+        insort(self._sorted_states, filter_state.state)
+        super()._store_state(filter_state)
+
+    def _median(self):
+        """Return the median of the window, like statistics.median."""
+        sorted_states = self._sorted_states
+        middle = len(sorted_states) // 2
+        if len(sorted_states) % 2:
+            return sorted_states[middle]
+        return (sorted_states[middle - 1] + sorted_states[middle]) / 2
 
     def _filter_state(self, new_state):
         """Implement the outlier filter."""
-        median = statistics.median([s.state for s in self.states]) if self.states else 0
+        median = self._median() if self.states else 0
         if (
             len(self.states) == self.states.maxlen
             and abs(new_state.state - median) > self._radius
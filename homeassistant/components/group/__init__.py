@@ -1,7 +1,7 @@
 """Provide the functionality to group entities."""
 import asyncio
 import logging
-from typing import Any, Iterable, List, Optional, cast
+from typing import Any, Dict, Iterable, List, Optional, Set, cast
 
 import voluptuous as vol
 
@@ -39,6 +39,9 @@ from homeassistant.loader import bind_hass
 
 DOMAIN = "group"
 
+# Data used to look up the groups of an entity
+DATA_ENTITY_GROUPS = "group_entity_groups"
+
 ENTITY_ID_FORMAT = DOMAIN + ".{}"
 
 CONF_ENTITIES = "entities"
@@ -196,13 +199,7 @@ def groups_with_entity(hass: HomeAssistantType, entity_id: str) -> List[str]:
     if DOMAIN not in hass.data:
         return []
 
-    groups = []
-
-    for group in hass.data[DOMAIN].entities:
-        if entity_id in group.tracking:
-            groups.append(group.entity_id)
-
-    return groups
+    return list(hass.data.get(DATA_ENTITY_GROUPS, {}).get(entity_id, ()))
 
 
 async def async_setup(hass, config):
@@ -441,6 +438,10 @@ class Group(Entity):
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed = None
+        # States of the existing members, kept up to date by the listener
+        self._member_states: Dict[str, str] = {}
+        self._assumed_members: Set[str] = set()
+        self._num_on = 0
 
     @staticmethod
     def create_group(
@@ -582,7 +583,9 @@ class Group(Entity):
         This method must be run in the event loop.
         """
         await self.async_stop()
+        self._async_unindex_members()
         self.tracking = tuple(ent_id.lower() for ent_id in entity_ids)
+        self._async_index_members()
         self.group_on, self.group_off = None, None
 
         await self.async_update_ha_state(True)
@@ -615,15 +618,36 @@ class Group(Entity):
 
     async def async_added_to_hass(self):
         """Handle addition to Home Assistant."""
+        self._async_index_members()
         if self.tracking:
             self.async_start()
 
     async def async_will_remove_from_hass(self):
         """Handle removal from Home Assistant."""
+        self._async_unindex_members()
         if self._async_unsub_state_changed:
             self._async_unsub_state_changed()
             self._async_unsub_state_changed = None
 
+    @callback
+    def _async_index_members(self):
+        """Add the group to the groups of its members."""
+        entity_groups = self.hass.data.setdefault(DATA_ENTITY_GROUPS, {})
+        for entity_id in self.tracking:
+            entity_groups.setdefault(entity_id, {})[self.entity_id] = None
+
+    @callback
+    def _async_unindex_members(self):
+        """Remove the group from the groups of its members."""
+        entity_groups = self.hass.data.get(DATA_ENTITY_GROUPS, {})
+        for entity_id in self.tracking:
+            groups = entity_groups.get(entity_id)
+            if groups is None:
+                continue
+            groups.pop(self.entity_id, None)
+            if not groups:
+                del entity_groups[entity_id]
+
     async def _async_state_changed_listener(self, entity_id, old_state, new_state):
         """Respond to a member state changing.
 
@@ -633,7 +657,11 @@ class Group(Entity):
         if self._async_unsub_state_changed is None:
             return
 
-        self._async_update_group_state(new_state)
+        if new_state is None:
+            self._async_update_member(entity_id, None)
+            self._async_update_aggregate()
+        else:
+            self._async_update_group_state(new_state)
         await self.async_update_ha_state()
 
     @property
@@ -653,63 +681,74 @@ class Group(Entity):
     def _async_update_group_state(self, tr_state=None):
         """Update group state.
 
-        Optionally you can provide the only state changed since last update
-        allowing this method to take shortcuts.
+        Optionally you can provide the only state changed since last update,
+        otherwise the states of all members are read again.
 
         This method must be run in the event loop.
         """
-        # To store current states of group entities. Might not be needed.
-        states = None
-        gr_state = self._state
-        gr_on = self.group_on
-        gr_off = self.group_off
+        if tr_state is None:
+            self._member_states = {}
+            self._assumed_members = set()
+            self._num_on = 0
+            for state in self._tracking_states:
+                self._async_update_member(state.entity_id, state)
+        else:
+            self._async_update_member(tr_state.entity_id, tr_state)
+
+        self._async_update_aggregate(tr_state)
+
+    @callback
+    def _async_update_member(self, entity_id, state):
+        """Update the counts with the new state of a member."""
+        old = self._member_states.pop(entity_id, None)
+        if old is not None and old == self.group_on:
+            self._num_on -= 1
+        self._assumed_members.discard(entity_id)
+
+        if state is None:
+            return
+
+        self._member_states[entity_id] = state.state
+        if state.state == self.group_on:
+            self._num_on += 1
+        if state.attributes.get(ATTR_ASSUMED_STATE):
+            self._assumed_members.add(entity_id)
 
+    @callback
+    def _async_update_aggregate(self, tr_state=None):
+        """Update the group state from the counts of the members."""
         # We have not determined type of group yet
-        if gr_on is None:
+        if self.group_on is None:
+            gr_on = gr_off = None
             if tr_state is None:
-                states = self._tracking_states
-
-                for state in states:
-                    gr_on, gr_off = _get_group_on_off(state.state)
+                for entity_id in self.tracking:
+                    member_state = self._member_states.get(entity_id)
+                    if member_state is None:
+                        continue
+                    gr_on, gr_off = _get_group_on_off(member_state)
                     if gr_on is not None:
                         break
             else:
                 gr_on, gr_off = _get_group_on_off(tr_state.state)
 
-            if gr_on is not None:
-                self.group_on, self.group_off = gr_on, gr_off
-
-        # We cannot determine state of the group
-        if gr_on is None:
-            return
-
-        if tr_state is None or (
-            (gr_state == gr_on and tr_state.state == gr_off)
-            or (gr_state == gr_off and tr_state.state == gr_on)
-            or tr_state.state not in (gr_on, gr_off)
-        ):
-            if states is None:
-                states = self._tracking_states
+            # We cannot determine state of the group
+            if gr_on is None:
+                return
 
-            if self.mode(state.state == gr_on for state in states):
-                self._state = gr_on
-            else:
-                self._state = gr_off
+            self.group_on, self.group_off = gr_on, gr_off
+            self._num_on = sum(
+                1
+                for member_state in self._member_states.values()
+                if member_state == gr_on
+            )
 
-        elif tr_state.state in (gr_on, gr_off):
-            self._state = tr_state.state
+        num_members = len(self._member_states)
 
-        if (
-            tr_state is None
-            or self._assumed_state
-            and not tr_state.attributes.get(ATTR_ASSUMED_STATE)
-        ):
-            if states is None:
-                states = self._tracking_states
-
-            self._assumed_state = self.mode(
-                state.attributes.get(ATTR_ASSUMED_STATE) for state in states
-            )
+        if self.mode is all:
+            is_on = self._num_on == num_members
+            self._assumed_state = len(self._assumed_members) == num_members
+        else:
+            is_on = self._num_on > 0
+            self._assumed_state = bool(self._assumed_members)
 
-        elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            self._assumed_state = True
+        self._state = self.group_on if is_on else self.group_off
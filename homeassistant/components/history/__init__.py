@@ -2,6 +2,7 @@
 from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
 
@@ -10,7 +11,13 @@ import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import States
+from homeassistant.components.http.stream import async_stream_json_array
+from homeassistant.components.recorder.models import States, Statistics
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOUR,
+    period_start,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     ATTR_HIDDEN,
@@ -21,6 +28,7 @@ from homeassistant.const import (
     HTTP_BAD_REQUEST,
 )
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -39,6 +47,11 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
+STATISTICS_PERIODS = {"5minute": PERIOD_5MINUTE, "hour": PERIOD_HOUR}
+
+# Number of rows fetched at once when streaming
+STREAM_BATCH_SIZE = 1000
+
 SIGNIFICANT_DOMAINS = ("thermostat", "climate", "water_heater")
 IGNORE_DOMAINS = ("zone", "scene")
 
@@ -61,20 +74,9 @@ def get_significant_states(
     timer_start = time.perf_counter()
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
-            (
-                States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
-            )
-            & (States.last_updated > start_time)
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters
         )
-
-        if filters:
-            query = filters.apply(query, entity_ids)
-
-        if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
-
         query = query.order_by(States.last_updated)
 
         states = (
@@ -216,6 +218,114 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
         ]
 
 
+def _significant_states_query(session, start_time, end_time, entity_ids, filters):
+    """Return a query for the states that could be significant."""
+    query = session.query(States).filter(
+        (
+            States.domain.in_(SIGNIFICANT_DOMAINS)
+            | (States.last_changed == States.last_updated)
+        )
+        & (States.last_updated > start_time)
+    )
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query
+
+
+def stream_significant_states(
+    hass,
+    send,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    compact=False,
+):
+    """Pass the JSON encoded significant states of each entity to send.
+
+    Rows are read from the cursor ordered by entity, and each entity is
+    sent as soon as all of its states are read. Entities are sent as a list
+    of states, or with compact as returned by states_to_compact.
+    """
+    timer_start = time.perf_counter()
+    start_states = {}
+
+    if include_start_time_state:
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    def encode(states):
+        """Encode the states of one entity like HomeAssistantView.json."""
+        if compact:
+            states = states_to_compact(states)
+        return json.dumps(states, sort_keys=True, cls=JSONEncoder, allow_nan=False)
+
+    with session_scope(hass=hass) as session:
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters
+        )
+        query = query.order_by(States.entity_id, States.last_updated).yield_per(
+            STREAM_BATCH_SIZE
+        )
+
+        states = (
+            state
+            for state in (row.to_native() for row in query)
+            if state is not None
+            and _is_significant(state)
+            and not state.attributes.get(ATTR_HIDDEN, False)
+        )
+
+        for ent_id, group in groupby(states, lambda state: state.entity_id):
+            entity_states = list(group)
+            if ent_id in start_states:
+                entity_states.insert(0, start_states.pop(ent_id))
+            send(encode(entity_states))
+
+    for state in start_states.values():
+        send(encode([state]))
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("stream_significant_states took %fs", elapsed)
+
+
+def states_to_compact(states):
+    """Convert the states of one entity into a columnar dictionary.
+
+    Timestamps are seconds since the epoch. Attributes are only included
+    for states where they changed, and are None otherwise.
+    """
+    last_updated = []
+    values = []
+    attributes = []
+    previous = None
+
+    for state in states:
+        last_updated.append(dt_util.as_timestamp(state.last_updated))
+        values.append(state.state)
+        if state.attributes == previous:
+            attributes.append(None)
+        else:
+            attributes.append(dict(state.attributes))
+            previous = state.attributes
+
+    return {
+        "entity_id": states[0].entity_id,
+        "last_updated": last_updated,
+        "state": values,
+        "attributes": attributes,
+    }
+
+
 def states_to_json(
     hass, states, start_time, entity_ids, filters=None, include_start_time_state=True
 ):
@@ -254,6 +364,40 @@ def states_to_json(
     return {key: val for key, val in result.items() if val}
 
 
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period=PERIOD_HOUR
+):
+    """Return the statistics of numeric sensors during UTC period.
+
+    The result is {'entity_id': [list of periods]}, each period being a
+    dictionary with its start and the min, max and mean of the sensor.
+    """
+    timer_start = time.perf_counter()
+
+    with session_scope(hass=hass) as session:
+        query = session.query(Statistics).filter(
+            (Statistics.period == period)
+            & (Statistics.start >= period_start(start_time, period))
+        )
+
+        if end_time is not None:
+            query = query.filter(Statistics.start < end_time)
+
+        if entity_ids is not None:
+            query = query.filter(Statistics.entity_id.in_(entity_ids))
+
+        rows = execute(query.order_by(Statistics.entity_id, Statistics.start))
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_statistics took %fs", elapsed)
+
+    return {
+        ent_id: list(group)
+        for ent_id, group in groupby(rows, lambda row: row["entity_id"])
+    }
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = list(get_states(hass, utc_point_in_time, (entity_id,), run))
@@ -330,6 +474,33 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
+        statistics = request.query.get("statistics")
+        if statistics:
+            if statistics not in STATISTICS_PERIODS:
+                return self.json_message("Invalid statistics", HTTP_BAD_REQUEST)
+
+            result = await hass.async_add_job(
+                statistics_during_period,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                STATISTICS_PERIODS[statistics],
+            )
+            return await hass.async_add_job(self.json, list(result.values()))
+
+        compact = "compact" in request.query
+
+        if "stream" in request.query:
+            return await self._async_stream(
+                request,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                compact,
+            )
+
         result = await hass.async_add_job(
             get_significant_states,
             hass,
@@ -357,8 +528,40 @@ class HistoryPeriodView(HomeAssistantView):
             sorted_result.extend(result)
             result = sorted_result
 
+        if compact:
+            result = [states_to_compact(states) for states in result]
+
         return await hass.async_add_job(self.json, result)
 
+    async def _async_stream(
+        self,
+        request,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        compact,
+    ):
+        """Stream the significant states while they are read.
+
+        Entities are ordered by entity_id instead of the include order.
+        """
+
+        def produce(send):
+            """Read and encode the states in the executor."""
+            stream_significant_states(
+                request.app["hass"],
+                send,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                compact,
+            )
+
+        return await async_stream_json_array(request, produce)
+
 
 class Filters:
     """Container for the configured include and exclude filters."""
@@ -5,7 +5,7 @@ import math
 
 import voluptuous as vol
 
-from homeassistant.components import history
+from homeassistant.components.recorder.preload import async_load_states
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     CONF_ENTITY_ID,
@@ -171,7 +171,7 @@ class HistoryStatsSensor(Entity):
         """Return the icon to use in the frontend, if any."""
         return ICON
 
-    def update(self):
+    async def async_update(self):
         """Get the latest data and updates the states."""
         # Get previous values of start and end
         p_start, p_end = self._period
@@ -203,23 +203,30 @@ class HistoryStatsSensor(Entity):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
+        # Get history between start and end, preceded by the state at start.
+        # Sensors polled together are loaded with a few batched queries.
+        history_list = await async_load_states(
+            self.hass,
+            self._entity_id,
+            start_time=start,
+            end_time=end,
+            changes_only=True,
+            include_start_time_state=True,
         )
 
-        if self._entity_id not in history_list.keys():
+        if not history_list:
             return
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
+        # The state at start is the first item, when the entity had one
+        last_state = False
+        if history_list[0].last_changed == start:
+            last_state = history_list.pop(0).state == self._entity_state
         last_time = start_timestamp
         elapsed = 0
         count = 0
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
+        for item in history_list:
             current_state = item.state == self._entity_state
             current_time = item.last_changed.timestamp()
 
@@ -250,7 +257,7 @@ class HistoryStatsSensor(Entity):
         # Parse start
         if self._start is not None:
             try:
-                start_rendered = self._start.render()
+                start_rendered = self._start.async_render()
             except (TemplateError, TypeError) as ex:
                 HistoryStatsHelper.handle_template_exception(ex, "start")
                 return
@@ -269,7 +276,7 @@ class HistoryStatsSensor(Entity):
         # Parse end
         if self._end is not None:
             try:
-                end_rendered = self._end.render()
+                end_rendered = self._end.async_render()
             except (TemplateError, TypeError) as ex:
                 HistoryStatsHelper.handle_template_exception(ex, "end")
                 return
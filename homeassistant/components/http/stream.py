@@ -0,0 +1,78 @@
+"""Stream JSON arrays encoded in the executor."""
+import asyncio
+import threading
+
+from aiohttp import web
+
+from homeassistant.const import CONTENT_TYPE_JSON
+
+from .const import KEY_HASS
+
+# mypy: allow-untyped-defs
+
+# Number of encoded chunks buffered while writing a streamed response
+STREAM_BUFFER_SIZE = 10
+
+
+class StreamCancelled(Exception):
+    """Error to stop producing chunks when the client disconnected."""
+
+
+async def async_stream_json_array(request, produce):
+    """Stream a JSON array while its items are encoded in the executor.
+
+    produce is called in the executor with a send function. Each chunk
+    passed to send holds one or more encoded items separated by commas, and
+    send waits while the buffer is full. Once the client disconnected, send
+    raises StreamCancelled to stop the producer.
+
+    When produce fails, its error is raised after the chunks sent so far
+    and the array is left open, the client never gets a truncated array
+    that looks complete.
+    """
+    hass = request.app[KEY_HASS]
+    queue = asyncio.Queue(STREAM_BUFFER_SIZE)
+    cancelled = threading.Event()
+
+    def send(chunk):
+        """Queue a chunk, waiting until there is room in the buffer."""
+        if cancelled.is_set():
+            raise StreamCancelled
+        asyncio.run_coroutine_threadsafe(queue.put(chunk), hass.loop).result()
+
+    def run():
+        """Run the producer and mark the end of the chunks."""
+        try:
+            produce(send)
+        except StreamCancelled:
+            return
+        finally:
+            if not cancelled.is_set():
+                send(None)
+
+    job = hass.async_add_executor_job(run)
+    response = web.StreamResponse()
+    response.content_type = CONTENT_TYPE_JSON
+
+    try:
+        await response.prepare(request)
+        separator = b"["
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            await response.write(separator + chunk.encode())
+            separator = b","
+
+        await job
+        await response.write(b"]" if separator == b"," else b"[]")
+        await response.write_eof()
+        return response
+
+    finally:
+        cancelled.set()
+        # Make room for a chunk the executor may be waiting to queue
+        while not job.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.wait([job], timeout=0.1)
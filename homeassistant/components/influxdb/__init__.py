@@ -1,4 +1,5 @@
 """Support for sending data to an Influx database."""
+import gzip
 import logging
 import math
 import queue
@@ -6,7 +7,7 @@ import re
 import threading
 import time
 
-from influxdb import InfluxDBClient, exceptions
+from influxdb import InfluxDBClient, exceptions, line_protocol
 import requests.exceptions
 import voluptuous as vol
 
@@ -41,6 +42,7 @@ CONF_COMPONENT_CONFIG = "component_config"
 CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_RETRY_COUNT = "max_retries"
+CONF_GZIP = "gzip"
 
 DEFAULT_DATABASE = "home_assistant"
 DEFAULT_VERIFY_SSL = True
@@ -53,6 +55,14 @@ RETRY_INTERVAL = 60  # seconds
 
 BATCH_TIMEOUT = 1
 BATCH_BUFFER_SIZE = 100
+# Batches grow up to this size to catch up with a deep queue
+BATCH_BUFFER_MAX_SIZE = 5000
+
+GZIP_HEADERS = {
+    "Content-Type": "application/octet-stream",
+    "Content-Encoding": "gzip",
+    "Accept": "text/plain",
+}
 
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string}
@@ -86,6 +96,7 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PORT): cv.port,
                     vol.Optional(CONF_SSL): cv.boolean,
                     vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+                    vol.Optional(CONF_GZIP, default=False): cv.boolean,
                     vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
                     vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string,
                     vol.Optional(CONF_TAGS, default={}): vol.Schema(
@@ -265,7 +276,13 @@ def setup(hass, config):
 
         return json
 
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass,
+        influx,
+        event_to_json,
+        max_tries,
+        database=conf[CONF_DB_NAME] if conf[CONF_GZIP] else None,
+    )
     instance.start()
 
     def shutdown(event):
@@ -280,19 +297,33 @@ def setup(hass, config):
 
 
 class InfluxThread(threading.Thread):
-    """A threaded event handler class."""
+    """A threaded event handler class.
+
+    Events are encoded to line protocol as they are taken from the queue.
+    Batches grow with the queue depth, so a backlog is written with a few
+    large requests instead of many small ones.
+    """
+
+    def __init__(self, hass, influx, event_to_json, max_tries, database=None):
+        """Initialize the listener.
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
-        """Initialize the listener."""
+        Request bodies are compressed with gzip when database is set.
+        """
         threading.Thread.__init__(self, name="InfluxDB")
         self.queue = queue.Queue()
         self.influx = influx
         self.event_to_json = event_to_json
         self.max_tries = max_tries
+        self.database = database
         self.write_errors = 0
         self.shutdown = False
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
 
+    @property
+    def backlog(self):
+        """Return the number of events waiting to be written."""
+        return self.queue.qsize()
+
     def _event_listener(self, event):
         """Listen for new messages on the bus and queue them for Influx."""
         item = (time.monotonic(), event)
@@ -303,21 +334,35 @@ class InfluxThread(threading.Thread):
         """Return number of seconds to wait for more events."""
         return BATCH_TIMEOUT
 
-    def get_events_json(self):
-        """Return a batch of events formatted for writing."""
+    def get_events_lines(self):
+        """Return a batch of events encoded in line protocol.
+
+        The batch is complete when it is full or the batch timeout passed
+        since its first event.
+        """
         queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
+        batch_size = min(
+            max(BATCH_BUFFER_SIZE, self.queue.qsize()), BATCH_BUFFER_MAX_SIZE
+        )
 
         count = 0
-        json = []
+        lines = []
+        deadline = None
 
         dropped = 0
 
         try:
-            while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
+            while len(lines) < batch_size and not self.shutdown:
+                if deadline is None:
+                    timeout = None
+                else:
+                    timeout = max(0, deadline - time.monotonic())
                 item = self.queue.get(timeout=timeout)
                 count += 1
 
+                if deadline is None:
+                    deadline = time.monotonic() + self.batch_timeout()
+
                 if item is None:
                     self.shutdown = True
                 else:
@@ -327,7 +372,11 @@ class InfluxThread(threading.Thread):
                     if age < queue_seconds:
                         event_json = self.event_to_json(event)
                         if event_json:
-                            json.append(event_json)
+                            lines.append(
+                                line_protocol.make_lines(
+                                    {"points": [event_json]}
+                                ).rstrip("\n")
+                            )
                     else:
                         dropped += 1
 
@@ -337,20 +386,43 @@ class InfluxThread(threading.Thread):
         if dropped:
             _LOGGER.warning("Catching up, dropped %d old events", dropped)
 
-        return count, json
+        return count, lines
+
+    def _write(self, lines):
+        """Write lines to influxdb."""
+        if self.database is None:
+            self.influx.write_points(lines, protocol="line")
+            return
+
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        self.influx.request(
+            url="write",
+            method="POST",
+            params={"db": self.database},
+            data=gzip.compress(body),
+            expected_response_code=204,
+            headers=GZIP_HEADERS,
+        )
 
-    def write_to_influxdb(self, json):
-        """Write preprocessed events to influxdb, with retry."""
+    def write_to_influxdb(self, lines):
+        """Write encoded events to influxdb, with retry."""
 
         for retry in range(self.max_tries + 1):
             try:
-                self.influx.write_points(json)
+                timer_start = time.perf_counter()
+                self._write(lines)
+                write_latency = time.perf_counter() - timer_start
 
                 if self.write_errors:
                     _LOGGER.error("Resumed, lost %d events", self.write_errors)
                     self.write_errors = 0
 
-                _LOGGER.debug("Wrote %d events", len(json))
+                _LOGGER.debug(
+                    "Wrote %d events in %.3fs, %d queued",
+                    len(lines),
+                    write_latency,
+                    self.backlog,
+                )
                 break
             except (
                 exceptions.InfluxDBClientError,
@@ -362,14 +434,14 @@ class InfluxThread(threading.Thread):
                 else:
                     if not self.write_errors:
                         _LOGGER.error("Write error: %s", err)
-                    self.write_errors += len(json)
+                    self.write_errors += len(lines)
 
     def run(self):
         """Process incoming events."""
         while not self.shutdown:
-            count, json = self.get_events_json()
-            if json:
-                self.write_to_influxdb(json)
+            count, lines = self.get_events_lines()
+            if lines:
+                self.write_to_influxdb(lines)
             for _ in range(count):
                 self.queue.task_done()
 
@@ -1,9 +1,12 @@
 """Event parser and human readable log generator."""
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
+from typing import Set
 
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 import voluptuous as vol
 
@@ -16,7 +19,12 @@ from homeassistant.components.homekit.const import (
     EVENT_HOMEKIT_CHANGED,
 )
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.http.stream import async_stream_json_array
+from homeassistant.components.recorder.models import (
+    Events,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import (
     QUERY_RETRY_WAIT,
     RETRIES,
@@ -44,6 +52,7 @@ from homeassistant.const import (
 from homeassistant.core import DOMAIN as HA_DOMAIN, State, callback, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
@@ -57,8 +66,13 @@ CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
 
+DATA_KNOWN_ENTITIES = "logbook_known_entities"
+
 GROUP_BY_MINUTES = 15
 
+# Number of entries encoded at once when streaming
+STREAM_CHUNK_SIZE = 100
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -139,6 +153,16 @@ async def async_setup(hass, config):
         message = message.async_render()
         async_log_entry(hass, name, message, domain, entity_id)
 
+    known_entities = hass.data[DATA_KNOWN_ENTITIES] = KnownEntities()
+    known_entities.entity_ids.update(hass.states.async_entity_ids())
+
+    @callback
+    def state_changed(event):
+        """Keep the known entities up to date."""
+        known_entities.entity_ids.add(event.data["entity_id"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+
     hass.http.register_view(LogbookView(config.get(DOMAIN, {})))
 
     hass.components.frontend.async_register_built_in_panel(
@@ -149,6 +173,49 @@ async def async_setup(hass, config):
     return True
 
 
+class KnownEntities:
+    """Entity ids with recorded states, kept in memory.
+
+    The ids are read from the database the first time they are needed and
+    are then updated from state changes, instead of scanning all states on
+    every request.
+    """
+
+    def __init__(self):
+        """Initialize the known entities."""
+        self.entity_ids: Set[str] = set()
+        self.loaded = False
+
+    def load(self, session):
+        """Read the entity ids of the recorded states, once."""
+        if self.loaded:
+            return
+
+        timer_start = time.perf_counter()
+        query = session.query(States.entity_id).distinct()
+
+        for tryno in range(0, RETRIES):
+            try:
+                self.entity_ids.update(row.entity_id for row in query)
+                self.loaded = True
+
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    elapsed = time.perf_counter() - timer_start
+                    _LOGGER.debug(
+                        "fetching %d distinct entity_ids took %fs",
+                        len(self.entity_ids),
+                        elapsed,
+                    )
+
+                return
+            except SQLAlchemyError as err:
+                _LOGGER.error("Error executing query: %s", err)
+
+                if tryno == RETRIES - 1:
+                    raise
+                time.sleep(QUERY_RETRY_WAIT)
+
+
 class LogbookView(HomeAssistantView):
     """Handle logbook view requests."""
 
@@ -181,13 +248,26 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=period)
         hass = request.app["hass"]
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(hass, self.config, start_day, end_day, entity_id)
-            )
+        def encode(entries):
+            """Encode entries like HomeAssistantView.json, without brackets."""
+            return json.dumps(
+                entries, sort_keys=True, cls=JSONEncoder, allow_nan=False
+            )[1:-1]
+
+        def produce(send):
+            """Read and encode the entries in the executor."""
+            entries = []
+            for entry in _yield_events(
+                hass, self.config, start_day, end_day, entity_id
+            ):
+                entries.append(entry)
+                if len(entries) == STREAM_CHUNK_SIZE:
+                    send(encode(entries))
+                    entries = []
+            if entries:
+                send(encode(entries))
 
-        return await hass.async_add_job(json_events)
+        return await async_stream_json_array(request, produce)
 
 
 def humanify(hass, events):
@@ -379,30 +459,13 @@ def humanify(hass, events):
                 }
 
 
-def _get_related_entity_ids(session, entity_filter):
-    timer_start = time.perf_counter()
-
-    query = session.query(States).with_entities(States.entity_id).distinct()
-
-    for tryno in range(0, RETRIES):
-        try:
-            result = [row.entity_id for row in query if entity_filter(row.entity_id)]
-
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                elapsed = time.perf_counter() - timer_start
-                _LOGGER.debug(
-                    "fetching %d distinct domain/entity_id pairs took %fs",
-                    len(result),
-                    elapsed,
-                )
-
-            return result
-        except SQLAlchemyError as err:
-            _LOGGER.error("Error executing query: %s", err)
-
-            if tryno == RETRIES - 1:
-                raise
-            time.sleep(QUERY_RETRY_WAIT)
+def _has_entity_filter(config):
+    """Return if the config includes or excludes any entities."""
+    return any(
+        config.get(conf, {}).get(key)
+        for conf in (CONF_EXCLUDE, CONF_INCLUDE)
+        for key in (CONF_ENTITIES, CONF_DOMAINS)
+    )
 
 
 def _generate_filter_from_config(config):
@@ -427,7 +490,13 @@ def _generate_filter_from_config(config):
 
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
+    return list(_yield_events(hass, config, start_day, end_day, entity_id))
+
+
+def _yield_events(hass, config, start_day, end_day, entity_id=None):
+    """Yield the entries of a period of time while they are read."""
     entities_filter = _generate_filter_from_config(config)
+    known_entities = hass.data[DATA_KNOWN_ENTITIES]
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
@@ -437,27 +506,48 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
                 yield event
 
     with session_scope(hass=hass) as session:
+        state_condition = States.last_updated == States.last_changed
+
         if entity_id is not None:
-            entity_ids = [entity_id.lower()]
+            state_condition &= States.entity_id == entity_id.lower()
         else:
-            entity_ids = _get_related_entity_ids(session, entities_filter)
+            if _has_entity_filter(config):
+                known_entities.load(session)
+                state_condition &= States.entity_id.in_(
+                    [
+                        known_id
+                        for known_id in set(known_entities.entity_ids)
+                        if entities_filter(known_id)
+                    ]
+                )
+
+            # Skip the continuous sensor values humanify does not show,
+            # checked for each state like humanify does
+            attributes = func.coalesce(States.attributes, StateAttributes.shared_attrs)
+            state_condition &= (
+                attributes.is_(None)
+                | ~States.domain.in_(CONTINUOUS_DOMAINS)
+                | ~(
+                    attributes.like('%"unit_of_measurement": %')
+                    & ~attributes.like('%"unit_of_measurement": null%')
+                    & ~attributes.like('%"unit_of_measurement": ""%')
+                )
+            )
 
         query = (
             session.query(Events)
             .order_by(Events.time_fired)
             .outerjoin(States, (Events.event_id == States.event_id))
+            .outerjoin(
+                StateAttributes,
+                (States.attributes_id == StateAttributes.attributes_id),
+            )
             .filter(Events.event_type.in_(ALL_EVENT_TYPES))
             .filter((Events.time_fired > start_day) & (Events.time_fired < end_day))
-            .filter(
-                (
-                    (States.last_updated == States.last_changed)
-                    & States.entity_id.in_(entity_ids)
-                )
-                | (States.state_id.is_(None))
-            )
+            .filter(state_condition | (States.state_id.is_(None)))
         )
 
-        return list(humanify(hass, yield_events(query)))
+        yield from humanify(hass, yield_events(query))
 
 
 def _keep_event(event, entities_filter):
@@ -1,17 +1,27 @@
 """Support for MQTT message handling."""
 import asyncio
+from collections import deque
 from functools import partial, wraps
 import inspect
-from itertools import groupby
 import json
 import logging
-from operator import attrgetter
 import os
 import socket
 import ssl
 import sys
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import attr
 import requests.certs
@@ -120,6 +130,11 @@ ATTR_RETAIN = CONF_RETAIN
 
 MAX_RECONNECT_WAIT = 300  # seconds
 
+# Maximum number of topics sent in a single SUBSCRIBE or UNSUBSCRIBE
+MAX_TOPICS_PER_REQUEST = 500
+# Number of queued publishes that is logged as a backlog
+PUBLISH_BACKLOG_WARNING = 1000
+
 CONNECTION_SUCCESS = "connection_success"
 CONNECTION_FAILED = "connection_failed"
 CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
@@ -727,16 +742,30 @@ class MQTT:
         # should be able to optionally rely on MQTT.
         # pylint: disable=import-outside-toplevel
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        # Lists of subscriptions by topic filter, to match received topics
+        self._matching_subscriptions = MQTTMatcher()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
         self._paho_lock = asyncio.Lock()
+        # Topics to subscribe to with their qos, and to unsubscribe from,
+        # sent together by the next requests task
+        self._pending_subscriptions: Dict[str, int] = {}
+        self._pending_unsubscribes: Set[str] = set()
+        self._requests_task: Optional[asyncio.Future] = None
+        # Messages waiting to be passed to paho, in order
+        self._pending_publishes: Deque[
+            Tuple[str, PublishPayloadType, int, bool]
+        ] = deque()
+        self._publish_job: Optional[asyncio.Future] = None
+        self._publish_backlog = False
 
         if protocol == PROTOCOL_31:
             proto: int = mqtt.MQTTv31
@@ -771,18 +800,65 @@ class MQTT:
                 *attr.astuple(will_message)
             )
 
+    @property
+    def pending_publishes(self) -> int:
+        """Return the number of messages waiting to be published."""
+        return len(self._pending_publishes)
+
     async def async_publish(
         self, topic: str, payload: PublishPayloadType, qos: int, retain: bool
     ) -> None:
         """Publish a MQTT message.
 
+        The message is queued and passed to paho by a job in the executor,
+        which publishes all queued messages in order. This returns once the
+        message is queued, errors publishing it are logged.
+
         This method must be run in the event loop and returns a coroutine.
         """
-        async with self._paho_lock:
+        self._pending_publishes.append((topic, payload, qos, retain))
+
+        if len(self._pending_publishes) >= PUBLISH_BACKLOG_WARNING:
+            if not self._publish_backlog:
+                _LOGGER.warning(
+                    "%s MQTT messages are waiting to be published",
+                    len(self._pending_publishes),
+                )
+                self._publish_backlog = True
+        else:
+            self._publish_backlog = False
+
+        if self._publish_job is None:
+            self._async_start_publishing()
+
+    @callback
+    def _async_start_publishing(self) -> None:
+        """Start a job publishing the queued messages."""
+        self._publish_job = self.hass.async_add_executor_job(self._publish_pending)
+        self._publish_job.add_done_callback(self._async_publish_done)
+
+    @callback
+    def _async_publish_done(self, _job) -> None:
+        """Publish the messages queued after the job stopped."""
+        self._publish_job = None
+        if self._pending_publishes:
+            self._async_start_publishing()
+
+    def _publish_pending(self) -> None:
+        """Publish the queued messages until the queue is empty."""
+        while True:
+            try:
+                topic, payload, qos, retain = self._pending_publishes.popleft()
+            except IndexError:
+                return
+
             _LOGGER.debug("Transmitting message on %s: %s", topic, payload)
-            await self.hass.async_add_job(
-                self._mqttc.publish, topic, payload, qos, retain
-            )
+            try:
+                self._mqttc.publish(topic, payload, qos, retain)
+            except ValueError as err:
+                _LOGGER.error("Unable to publish message on %s: %s", topic, err)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error publishing message on %s", topic)
 
     async def async_connect(self) -> str:
         """Connect to the host. Does process messages yet.
@@ -809,10 +885,10 @@ class MQTT:
         return CONNECTION_SUCCESS
 
     @callback
-    def async_disconnect(self):
-        """Stop the MQTT client.
+    async def async_disconnect(self):
+        """Stop the MQTT client once the queued messages are published.
 
-        This method must be run in the event loop and returns a coroutine.
+        This method is a coroutine.
         """
 
         def stop():
@@ -820,7 +896,11 @@ class MQTT:
             self._mqttc.disconnect()
             self._mqttc.loop_stop()
 
-        return self.hass.async_add_job(stop)
+        # The job restarts itself for messages queued while it runs
+        while self._publish_job is not None:
+            await asyncio.shield(self._publish_job)
+
+        await self.hass.async_add_job(stop)
 
     async def async_subscribe(
         self,
@@ -838,8 +918,12 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        try:
+            self._matching_subscriptions[topic].append(subscription)
+        except KeyError:
+            self._matching_subscriptions[topic] = [subscription]
 
-        await self._async_perform_subscription(topic, qos)
+        await asyncio.shield(self._async_queue_subscriptions([(topic, qos)]))
 
         @callback
         def async_remove() -> None:
@@ -848,34 +932,115 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = self._matching_subscriptions[topic]
+            topic_subscriptions.remove(subscription)
+
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
+            del self._matching_subscriptions[topic]
+
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    @callback
+    def _async_queue_subscriptions(
+        self, subscriptions: Iterable[Tuple[str, int]]
+    ) -> asyncio.Future:
+        """Queue topics to subscribe to, return the task sending them."""
+        for topic, qos in subscriptions:
+            self._pending_unsubscribes.discard(topic)
+            self._pending_subscriptions[topic] = max(
+                qos, self._pending_subscriptions.get(topic, 0)
+            )
+
+        return self._async_schedule_requests()
+
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> asyncio.Future:
+        """Queue a topic to unsubscribe from, return the task sending it."""
+        self._pending_subscriptions.pop(topic, None)
+        self._pending_unsubscribes.add(topic)
+
+        return self._async_schedule_requests()
+
+    @callback
+    def _async_schedule_requests(self) -> asyncio.Future:
+        """Return the task sending the queued requests.
+
+        Requests queued while an earlier task is still talking to paho are
+        coalesced and sent together once it is done.
+        """
+        if self._requests_task is None:
+            self._requests_task = self.hass.async_create_task(
+                self._async_perform_requests()
+            )
+            self._requests_task.add_done_callback(self._async_requests_done)
+        return self._requests_task
+
+    @callback
+    def _async_requests_done(self, task: asyncio.Future) -> None:
+        """Log the error of a task sending requests.
+
+        The task is not awaited by all callers, the topics it did not send
+        are queued again and sent with the next request.
+        """
+        if task.cancelled():
+            return
+        err = task.exception()
+        if err is not None:
+            _LOGGER.error("Unable to update MQTT subscriptions: %s", err)
+
+    async def _async_perform_requests(self) -> None:
+        """Send the queued subscribe and unsubscribe requests to paho.
 
         This method is a coroutine.
         """
         async with self._paho_lock:
+            self._requests_task = None
+            unsubscribes = list(self._pending_unsubscribes)
+            subscriptions = list(self._pending_subscriptions.items())
+            self._pending_unsubscribes.clear()
+            self._pending_subscriptions.clear()
+
             result: int = None
-            result, _ = await self.hass.async_add_job(self._mqttc.unsubscribe, topic)
-            _raise_on_error(result)
 
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
-        _LOGGER.debug("Subscribing to %s", topic)
+            try:
+                while unsubscribes:
+                    topics = unsubscribes[:MAX_TOPICS_PER_REQUEST]
+                    _LOGGER.debug("Unsubscribing from %s", ", ".join(topics))
+                    result, _ = await self.hass.async_add_job(
+                        self._mqttc.unsubscribe, topics
+                    )
+                    _raise_on_error(result)
+                    del unsubscribes[:MAX_TOPICS_PER_REQUEST]
 
-        async with self._paho_lock:
-            result: int = None
-            result, _ = await self.hass.async_add_job(self._mqttc.subscribe, topic, qos)
-            _raise_on_error(result)
+                while subscriptions:
+                    topics_qos = subscriptions[:MAX_TOPICS_PER_REQUEST]
+                    _LOGGER.debug(
+                        "Subscribing to %s", ", ".join(topic for topic, _ in topics_qos)
+                    )
+                    result, _ = await self.hass.async_add_job(
+                        self._mqttc.subscribe, topics_qos
+                    )
+                    _raise_on_error(result)
+                    del subscriptions[:MAX_TOPICS_PER_REQUEST]
+
+            finally:
+                # Queue the requests not sent again, unless they were
+                # replaced by newer requests meanwhile.
+                for topic in unsubscribes:
+                    if topic not in self._pending_subscriptions:
+                        self._pending_unsubscribes.add(topic)
+                for topic, qos in subscriptions:
+                    if topic not in self._pending_unsubscribes:
+                        self._pending_subscriptions[topic] = max(
+                            qos, self._pending_subscriptions.get(topic, 0)
+                        )
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -896,12 +1061,15 @@ class MQTT:
 
         self.connected = True
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        # Re-subscribe to all topics with the highest requested qos, the
+        # queued topics are sent in as few requests as possible.
+        self.hass.add_job(
+            self._async_queue_subscriptions,
+            [
+                (subscription.topic, subscription.qos)
+                for subscription in self.subscriptions
+            ],
+        )
 
         if self.birth_message:
             self.hass.add_job(
@@ -923,27 +1091,42 @@ class MQTT:
             msg.payload,
         )
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        subscriptions = [
+            subscription
+            for topic_subscriptions in self._matching_subscriptions.iter_match(
+                msg.topic
+            )
+            for subscription in topic_subscriptions
+        ]
 
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
+        # Messages by encoding, None if the payload can't be decoded
+        messages: Dict[Optional[str], Optional[Message]] = {}
+
+        for subscription in subscriptions:
+            encoding = subscription.encoding
+            if encoding not in messages:
+                payload: SubscribePayloadType = msg.payload
                 try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload,
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.callback,
+                    if encoding is not None:
+                        payload = msg.payload.decode(encoding)
+                    messages[encoding] = Message(
+                        msg.topic, payload, msg.qos, msg.retain
                     )
-                    continue
+                except (AttributeError, UnicodeDecodeError):
+                    messages[encoding] = None
+
+            message = messages[encoding]
+            if message is None:
+                _LOGGER.warning(
+                    "Can't decode payload %s on %s with encoding %s (for %s)",
+                    msg.payload,
+                    msg.topic,
+                    subscription.encoding,
+                    subscription.callback,
+                )
+                continue
 
-            self.hass.async_run_job(
-                subscription.callback, Message(msg.topic, payload, msg.qos, msg.retain)
-            )
+            self.hass.async_run_job(subscription.callback, message)
 
     def _mqtt_on_disconnect(self, _mqttc, _userdata, result_code: int) -> None:
         """Disconnected callback."""
@@ -986,20 +1169,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -5,8 +5,7 @@ import logging
 
 import voluptuous as vol
 
-from homeassistant.components.recorder.models import States
-from homeassistant.components.recorder.util import execute, session_scope
+from homeassistant.components.recorder.preload import async_load_states
 from homeassistant.const import (
     ATTR_TEMPERATURE,
     ATTR_UNIT_OF_MEASUREMENT,
@@ -23,6 +22,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.event import async_track_state_change
+import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -287,7 +287,7 @@ class Plant(Entity):
         This only needs to be done once during startup.
         """
 
-        start_date = datetime.now() - timedelta(days=self._conf_check_days)
+        start_date = dt_util.utcnow() - timedelta(days=self._conf_check_days)
         entity_id = self._readingmap.get(READING_BRIGHTNESS)
         if entity_id is None:
             _LOGGER.debug(
@@ -297,26 +297,17 @@ class Plant(Entity):
             return
 
         _LOGGER.debug("Initializing values for %s from the database", self._name)
-        with session_scope(hass=self.hass) as session:
-            query = (
-                session.query(States)
-                .filter(
-                    (States.entity_id == entity_id.lower())
-                    and (States.last_updated > start_date)
+        states = await async_load_states(self.hass, entity_id, start_time=start_date)
+
+        for state in states:
+            # filter out all None, NaN and "unknown" states
+            # only keep real values
+            try:
+                self._brightness_history.add_measurement(
+                    int(state.state), state.last_updated
                 )
-                .order_by(States.last_updated.asc())
-            )
-            states = execute(query)
-
-            for state in states:
-                # filter out all None, NaN and "unknown" states
-                # only keep real values
-                try:
-                    self._brightness_history.add_measurement(
-                        int(state.state), state.last_updated
-                    )
-                except ValueError:
-                    pass
+            except ValueError:
+                pass
         _LOGGER.debug("Initializing from database completed")
         self.async_schedule_update_ha_state()
 
@@ -35,6 +35,7 @@ CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_DEFAULT_METRIC = "default_metric"
 CONF_OVERRIDE_METRIC = "override_metric"
+CONF_UPDATE_ON_SCRAPE = "update_on_scrape"
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_METRIC): cv.string}
 )
@@ -47,6 +48,7 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_PROM_NAMESPACE): cv.string,
                 vol.Optional(CONF_DEFAULT_METRIC): cv.string,
                 vol.Optional(CONF_OVERRIDE_METRIC): cv.string,
+                vol.Optional(CONF_UPDATE_ON_SCRAPE, default=False): cv.boolean,
                 vol.Optional(CONF_COMPONENT_CONFIG, default={}): vol.Schema(
                     {cv.entity_id: COMPONENT_CONFIG_SCHEMA_ENTRY}
                 ),
@@ -65,8 +67,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass, config):
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
@@ -89,12 +89,25 @@ def setup(hass, config):
         default_metric,
     )
 
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    if conf[CONF_UPDATE_ON_SCRAPE]:
+        hass.http.register_view(PrometheusView(prometheus_client, metrics))
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.async_mark_changed)
+    else:
+        hass.http.register_view(PrometheusView(prometheus_client))
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
     return True
 
 
 class PrometheusMetrics:
-    """Model all of the metrics which should be exposed to Prometheus."""
+    """Model all of the metrics which should be exposed to Prometheus.
+
+    Metrics are either updated on every state change by handle_event, or
+    only for the changed entities from their current state when scraped.
+    """
+
+    # Handlers counting state changes instead of reading the state, they run
+    # once for every change when metrics are updated on scrape.
+    COUNTING_HANDLERS = ("_handle_automation",)
 
     def __init__(
         self,
@@ -126,6 +139,8 @@ class PrometheusMetrics:
             self.metrics_prefix = ""
         self._metrics = {}
         self._climate_units = climate_units
+        # Number of changes by entity_id since the last scrape
+        self._changed = {}
 
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
@@ -135,20 +150,43 @@ class PrometheusMetrics:
 
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
-        domain, _ = hacore.split_entity_id(entity_id)
 
         if not self._filter(state.entity_id):
             return
 
-        handler = f"_handle_{domain}"
+        self._handle_state(state)
+
+    @hacore.callback
+    def async_mark_changed(self, event):
+        """Count a state change, to update the metrics on the next scrape."""
+        state = event.data.get("new_state")
+        if state is None or not self._filter(state.entity_id):
+            return
+
+        self._changed[state.entity_id] = self._changed.get(state.entity_id, 0) + 1
+
+    @hacore.callback
+    def async_update_changed(self, hass):
+        """Update the metrics of entities changed since the last scrape."""
+        changed, self._changed = self._changed, {}
+
+        for entity_id, changes in changed.items():
+            state = hass.states.get(entity_id)
+            if state is not None:
+                self._handle_state(state, changes)
+
+    def _handle_state(self, state, changes=1):
+        """Update the metrics of a state."""
+        handler = f"_handle_{state.domain}"
 
         if hasattr(self, handler):
-            getattr(self, handler)(state)
+            for _ in range(changes if handler in self.COUNTING_HANDLERS else 1):
+                getattr(self, handler)(state)
 
         metric = self._metric(
             "state_change", self.prometheus_cli.Counter, "The number of state changes"
         )
-        metric.labels(**self._labels(state)).inc()
+        metric.labels(**self._labels(state)).inc(changes)
 
     def _metric(self, metric, factory, documentation, labels=None):
         if labels is None:
@@ -382,14 +420,21 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_cli):
-        """Initialize Prometheus view."""
+    def __init__(self, prometheus_cli, metrics=None):
+        """Initialize Prometheus view.
+
+        With metrics, changed entities are updated before each scrape.
+        """
         self.prometheus_cli = prometheus_cli
+        self.metrics = metrics
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
+        if self.metrics is not None:
+            self.metrics.async_update_changed(request.app["hass"])
+
         return web.Response(
             body=self.prometheus_cli.generate_latest(),
             content_type=CONTENT_TYPE_TEXT_PLAIN,
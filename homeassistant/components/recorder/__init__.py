@@ -1,6 +1,6 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -8,7 +8,7 @@ import queue
 from sqlite3 import Connection
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 from sqlalchemy import create_engine, exc
 from sqlalchemy.engine import Engine
@@ -30,7 +30,7 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.typing import ConfigType
@@ -38,7 +38,8 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import DATA_INSTANCE
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
+from .statistics import StatisticsCompiler
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -64,6 +65,19 @@ CONF_DB_URL = "db_url"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
+CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_MAX_BATCH_SIZE = "max_batch_size"
+CONF_MAX_QUEUE_SIZE = "max_queue_size"
+CONF_QUEUE_OVERFLOW = "queue_overflow"
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+
+DEFAULT_COMMIT_INTERVAL = 0
+DEFAULT_MAX_BATCH_SIZE = 500
+DEFAULT_MAX_QUEUE_SIZE = 0
+
+ATTRIBUTES_CACHE_SIZE = 2048
 
 CONNECT_RETRY_WAIT = 3
 
@@ -96,6 +110,18 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Coerce(int), vol.Range(min=0)
                 ),
                 vol.Optional(CONF_DB_URL): cv.string,
+                vol.Optional(
+                    CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_MAX_BATCH_SIZE, default=DEFAULT_MAX_BATCH_SIZE
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MAX_QUEUE_SIZE, default=DEFAULT_MAX_QUEUE_SIZE
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(CONF_QUEUE_OVERFLOW, default=OVERFLOW_DROP_OLDEST): vol.In(
+                    [OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE]
+                ),
             }
         )
     },
@@ -133,6 +159,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config[DOMAIN]
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, DEFAULT_COMMIT_INTERVAL)
+    max_batch_size = conf.get(CONF_MAX_BATCH_SIZE, DEFAULT_MAX_BATCH_SIZE)
+    max_queue_size = conf.get(CONF_MAX_QUEUE_SIZE, DEFAULT_MAX_QUEUE_SIZE)
+    queue_overflow = conf.get(CONF_QUEUE_OVERFLOW, OVERFLOW_DROP_OLDEST)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -144,6 +174,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         hass=hass,
         keep_days=keep_days,
         purge_interval=purge_interval,
+        commit_interval=commit_interval,
+        max_batch_size=max_batch_size,
+        max_queue_size=max_queue_size,
+        queue_overflow=queue_overflow,
         uri=db_url,
         include=include,
         exclude=exclude,
@@ -163,6 +197,112 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
+CommitTask = namedtuple("CommitTask", [])
+
+
+def _is_attribute_only_change(event: Event) -> bool:
+    """Return if the event is a state change that only updated attributes."""
+    if event.event_type != EVENT_STATE_CHANGED:
+        return False
+
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+
+    return (
+        old_state is not None
+        and new_state is not None
+        and old_state.state == new_state.state
+    )
+
+
+def _event_attributes(event: Event) -> Mapping:
+    """Return the attributes of the new state of a state_changed event."""
+    new_state = event.data.get("new_state")
+    if new_state is None:
+        return {}
+
+    return new_state.attributes
+
+
+class RecorderQueue(queue.Queue):
+    """Event queue that applies an overflow policy once it is full.
+
+    Tasks for the recorder thread itself are always queued. The policy
+    never blocks the caller, which runs in the event loop.
+    """
+
+    def __init__(self, max_size: int = 0, overflow: str = OVERFLOW_DROP_OLDEST):
+        """Initialize the queue."""
+        super().__init__()
+        self.max_size = max_size
+        self.overflow = overflow
+        self.dropped = 0
+
+    def _put(self, item):
+        """Put an item on the queue, dropping an event if it is full."""
+        if (
+            not self.max_size
+            or not isinstance(item, Event)
+            or len(self.queue) < self.max_size
+        ):
+            self.queue.append(item)
+            return
+
+        index = None
+        if self.overflow == OVERFLOW_COALESCE:
+            index = self._find_pending_state_change(item)
+        if index is None:
+            index = self._find_attribute_only_change()
+        if index is None and not _is_attribute_only_change(item):
+            # Keep the newest data when all we have is regular events
+            index = self._find_oldest_event()
+
+        if index is not None:
+            del self.queue[index]
+            self.queue.append(item)
+
+        if not self.dropped:
+            _LOGGER.warning(
+                "The recorder queue reached its maximum size of %d, "
+                "events are being dropped",
+                self.max_size,
+            )
+        self.dropped += 1
+        # put() counts the new item as unfinished, but one event is gone
+        self.unfinished_tasks -= 1
+
+    def _find_pending_state_change(self, event: Event) -> Optional[int]:
+        """Return the index of a queued state change for the same entity."""
+        if event.event_type != EVENT_STATE_CHANGED:
+            return None
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        for index in range(len(self.queue) - 1, -1, -1):
+            item = self.queue[index]
+            if (
+                isinstance(item, Event)
+                and item.event_type == EVENT_STATE_CHANGED
+                and item.data.get(ATTR_ENTITY_ID) == entity_id
+            ):
+                return index
+
+        return None
+
+    def _find_oldest_event(self) -> Optional[int]:
+        """Return the index of the oldest queued event."""
+        for index, item in enumerate(self.queue):
+            if isinstance(item, Event):
+                return index
+
+        return None
+
+    def _find_attribute_only_change(self) -> Optional[int]:
+        """Return the index of the oldest queued attribute-only update."""
+        for index, item in enumerate(self.queue):
+            if isinstance(item, Event) and _is_attribute_only_change(item):
+                return index
+
+        return None
 
 
 class Recorder(threading.Thread):
@@ -173,6 +313,10 @@ class Recorder(threading.Thread):
         hass: HomeAssistant,
         keep_days: int,
         purge_interval: int,
+        commit_interval: int,
+        max_batch_size: int,
+        max_queue_size: int,
+        queue_overflow: str,
         uri: str,
         include: Dict,
         exclude: Dict,
@@ -183,7 +327,10 @@ class Recorder(threading.Thread):
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
-        self.queue: Any = queue.Queue()
+        self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
+        self.queue: Any = RecorderQueue(max_queue_size, queue_overflow)
+        self.write_latency: Optional[float] = None
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.async_db_ready = asyncio.Future()
@@ -199,6 +346,13 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude.get(CONF_EVENT_TYPES, [])
 
         self.get_session = None
+        self._pending_events: List[Event] = []
+        # Recently written attributes by hash, and the last attributes
+        # written for each entity, mapped to their attributes_id
+        self._attributes_ids: "OrderedDict[int, int]" = OrderedDict()
+        self._entity_attributes: Dict[str, Tuple[Mapping, int]] = {}
+        self._statistics = StatisticsCompiler()
+        self._batch_started: Optional[float] = None
 
     @callback
     def async_initialize(self):
@@ -311,15 +465,31 @@ class Recorder(threading.Thread):
             self.hass.helpers.event.track_point_in_time(async_purge, run)
 
         while True:
-            event = self.queue.get()
+            try:
+                event = self.queue.get(timeout=self._commit_timeout())
+            except queue.Empty:
+                self._commit_pending_events()
+                continue
 
             if event is None:
+                self._commit_pending_events()
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
+            if isinstance(event, CommitTask):
+                self._commit_pending_events()
+                self.queue.task_done()
+                continue
             if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+                self._commit_pending_events()
+                done = purge.purge_old_data(self, event.keep_days, event.repack)
+                # Each round may have removed attributes rows we know about
+                self._attributes_ids.clear()
+                self._entity_attributes.clear()
+                if not done:
+                    # Continue once the events queued meanwhile are written
+                    self.queue.put(event)
                 self.queue.task_done()
                 continue
             if event.event_type == EVENT_TIME_CHANGED:
@@ -335,62 +505,180 @@ class Recorder(threading.Thread):
                     self.queue.task_done()
                     continue
 
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
-                try:
-                    with session_scope(session=self.get_session()) as session:
-                        try:
-                            dbevent = Events.from_event(event)
-                            session.add(dbevent)
-                            session.flush()
-                        except (TypeError, ValueError):
-                            _LOGGER.warning("Event is not JSON serializable: %s", event)
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            try:
-                                dbstate = States.from_event(event)
-                                dbstate.event_id = dbevent.event_id
-                                session.add(dbstate)
-                            except (TypeError, ValueError):
-                                _LOGGER.warning(
-                                    "State is not JSON serializable: %s",
-                                    event.data.get("new_state"),
-                                )
-
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error(
-                        "Error in database connectivity: %s. "
-                        "(retrying in %s seconds)",
-                        err,
-                        CONNECT_RETRY_WAIT,
-                    )
-                    tries += 1
+            if not self._pending_events:
+                self._batch_started = time.monotonic()
+            self._pending_events.append(event)
 
-                except exc.SQLAlchemyError:
-                    updated = True
-                    _LOGGER.exception("Error saving event: %s", event)
+            # Without a commit interval we still batch whatever is already
+            # waiting in the queue, but never hold back an event once it
+            # has been drained.
+            if len(self._pending_events) >= self.max_batch_size or (
+                not self.commit_interval and self.queue.empty()
+            ):
+                self._commit_pending_events()
 
-            if not updated:
+    def _commit_timeout(self) -> Optional[float]:
+        """Return how long to wait for the next event before committing."""
+        if not self._pending_events or self._batch_started is None:
+            return None
+
+        if not self.commit_interval:
+            return 0
+
+        return max(0, self._batch_started + self.commit_interval - time.monotonic())
+
+    def _commit_pending_events(self):
+        """Write all pending events to the database in one transaction."""
+        if not self._pending_events:
+            return
+
+        events = self._pending_events
+        self._pending_events = []
+        self._batch_started = None
+
+        for event in events:
+            if event.event_type == EVENT_STATE_CHANGED:
+                self._statistics.add_event(event)
+
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                timer_start = time.perf_counter()
+                with session_scope(session=self.get_session()) as session:
+                    written_attributes = self._write_events(session, events)
+                    new_statistics = self._statistics.write(session)
+
+                self._remember_attributes(written_attributes)
+                self._statistics.committed(new_statistics)
+                self.write_latency = time.perf_counter() - timer_start
+                updated = True
+
+            except exc.OperationalError as err:
                 _LOGGER.error(
-                    "Error in database update. Could not save "
-                    "after %d tries. Giving up",
-                    tries,
+                    "Error in database connectivity: %s. (retrying in %s seconds)",
+                    err,
+                    CONNECT_RETRY_WAIT,
                 )
+                tries += 1
 
+            except exc.SQLAlchemyError:
+                updated = True
+                _LOGGER.exception("Error saving %d events", len(events))
+
+        if not updated:
+            _LOGGER.error(
+                "Error in database update. Could not save after %d tries. Giving up",
+                tries,
+            )
+
+        for _ in events:
             self.queue.task_done()
 
+    def _write_events(self, session, events):
+        """Add a batch of events and their states to the session.
+
+        Return the attributes used, to be remembered once committed.
+        """
+        dbevents = []
+        dbstates = []
+        new_attributes: Dict[int, StateAttributes] = {}
+
+        for event in events:
+            try:
+                dbevent = Events.from_event(event)
+                dbevents.append(dbevent)
+            except (TypeError, ValueError):
+                dbevent = None
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+
+            if event.event_type == EVENT_STATE_CHANGED:
+                try:
+                    dbstate = States.from_event(event)
+                    attrs_hash, attributes = self._get_attributes(
+                        session, event, new_attributes
+                    )
+                    dbstates.append((dbstate, dbevent, event, attrs_hash, attributes))
+                except (TypeError, ValueError):
+                    _LOGGER.warning(
+                        "State is not JSON serializable: %s",
+                        event.data.get("new_state"),
+                    )
+
+        # Events and attributes need their primary keys assigned before the
+        # states referencing them can be inserted.
+        session.add_all(dbevents)
+        session.add_all(new_attributes.values())
+        session.flush()
+
+        written_attributes = []
+        for dbstate, dbevent, event, attrs_hash, attributes in dbstates:
+            if dbevent is not None:
+                dbstate.event_id = dbevent.event_id
+            if isinstance(attributes, StateAttributes):
+                attributes = attributes.attributes_id
+            dbstate.attributes_id = attributes
+            written_attributes.append(
+                (dbstate.entity_id, _event_attributes(event), attrs_hash, attributes)
+            )
+
+        session.bulk_save_objects([dbstate[0] for dbstate in dbstates])
+
+        return written_attributes
+
+    def _get_attributes(
+        self, session, event: Event, new_attributes: Dict[int, StateAttributes]
+    ) -> Tuple[Optional[int], Union[int, StateAttributes]]:
+        """Return the hash and the row or id of the attributes of a state.
+
+        Attributes equal to the ones last written for the entity are reused
+        without serializing them. New attributes are added to new_attributes.
+        """
+        entity_id = event.data[ATTR_ENTITY_ID]
+        last = self._entity_attributes.get(entity_id)
+        if last is not None and last[0] == _event_attributes(event):
+            return None, last[1]
+
+        dbattrs = StateAttributes.from_event(event)
+        attributes_id = self._attributes_ids.get(dbattrs.hash)
+        if attributes_id is not None:
+            return dbattrs.hash, attributes_id
+
+        if dbattrs.hash in new_attributes:
+            return dbattrs.hash, new_attributes[dbattrs.hash]
+
+        with session.no_autoflush:
+            for attributes_id, shared_attrs in session.query(
+                StateAttributes.attributes_id, StateAttributes.shared_attrs
+            ).filter(StateAttributes.hash == dbattrs.hash):
+                if shared_attrs == dbattrs.shared_attrs:
+                    return dbattrs.hash, attributes_id
+
+        new_attributes[dbattrs.hash] = dbattrs
+        return dbattrs.hash, dbattrs
+
+    def _remember_attributes(self, written_attributes):
+        """Update the attributes caches with a committed batch."""
+        for entity_id, attributes, attrs_hash, attributes_id in written_attributes:
+            self._entity_attributes[entity_id] = (attributes, attributes_id)
+            if attrs_hash is None:
+                continue
+
+            self._attributes_ids[attrs_hash] = attributes_id
+            self._attributes_ids.move_to_end(attrs_hash)
+            if len(self._attributes_ids) > ATTRIBUTES_CACHE_SIZE:
+                self._attributes_ids.popitem(last=False)
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
         self.queue.put(event)
 
     def block_till_done(self):
-        """Block till all events processed."""
+        """Block till all events processed and written."""
+        self.queue.put(CommitTask())
         self.queue.join()
 
     def _setup_connection(self):
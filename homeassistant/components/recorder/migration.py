@@ -249,6 +249,11 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 7:
         _create_index(engine, "states", "ix_states_entity_id")
     elif new_version == 8:
+        # The state_attributes table is created by create_all, existing
+        # rows keep their inline attributes.
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 9:
         # Pending migration, want to group a few.
         pass
         # _add_columns(engine, "events", [
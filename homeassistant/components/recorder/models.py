@@ -1,12 +1,15 @@
 """Models for SQLAlchemy."""
 from datetime import datetime
+import hashlib
 import json
 import logging
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -15,17 +18,19 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dumps_event_data
 import homeassistant.util.dt as dt_util
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 7
+SCHEMA_VERSION = 8
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,9 +52,19 @@ class Events(Base):  # type: ignore
     @staticmethod
     def from_event(event):
         """Create an event database object from a native event."""
+        event_data = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            # Reuse the JSON of the states, unless they are not finite
+            try:
+                event_data = json_dumps_event_data(event.data)
+            except ValueError:
+                pass
+        if event_data is None:
+            event_data = json.dumps(event.data, cls=JSONEncoder)
+
         return Events(
             event_type=event.event_type,
-            event_data=json.dumps(event.data, cls=JSONEncoder),
+            event_data=event_data,
             origin=str(event.origin),
             time_fired=event.time_fired,
             context_id=event.context.id,
@@ -74,6 +89,33 @@ class Events(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attributes, shared between all states having the same ones."""
+
+    __tablename__ = "state_attributes"
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from the new state of a state_changed event."""
+        state = event.data.get("new_state")
+        attributes = {} if state is None else dict(state.attributes)
+        shared_attrs = json.dumps(attributes, cls=JSONEncoder)
+
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return a stable 64 bit hash of serialized attributes."""
+        digest = hashlib.blake2b(shared_attrs.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -82,7 +124,12 @@ class States(Base):  # type: ignore
     domain = Column(String(64))
     entity_id = Column(String(255), index=True)
     state = Column(String(255))
+    # Only set for rows written before attributes were stored in
+    # state_attributes
     attributes = Column(Text)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event_id = Column(Integer, ForeignKey("events.event_id"), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
@@ -97,9 +144,14 @@ class States(Base):  # type: ignore
         Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
     )
 
+    state_attributes = relationship(StateAttributes, lazy="joined")
+
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are stored separately, see StateAttributes.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
@@ -114,13 +166,11 @@ class States(Base):  # type: ignore
         if state is None:
             dbstate.state = ""
             dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -129,11 +179,18 @@ class States(Base):  # type: ignore
     def to_native(self):
         """Convert to an HA state object."""
         context = Context(id=self.context_id, user_id=self.context_user_id)
+        attributes = self.attributes
+        if attributes is None:
+            if self.state_attributes is None:
+                attributes = "{}"
+            else:
+                attributes = self.state_attributes.shared_attrs
+
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes),
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated),
                 context=context,
@@ -147,6 +204,36 @@ class States(Base):  # type: ignore
             return None
 
 
+class Statistics(Base):  # type: ignore
+    """Statistics of a numeric sensor over a period."""
+
+    __tablename__ = "statistics"
+    statistics_id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    # Length of the period in seconds
+    period = Column(Integer)
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    count = Column(Integer)
+    created = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_statistics_entity_id_period_start", "entity_id", "period", "start"),
+    )
+
+    def to_native(self):
+        """Convert to a dictionary."""
+        return {
+            "entity_id": self.entity_id,
+            "start": _process_timestamp(self.start),
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -0,0 +1,281 @@
+"""Load the recorded states of many entities with a few queries.
+
+Entities that restore their history when they are added, like statistics or
+filter sensors, request it with async_load_states. Requests made close
+together are loaded in batches, and each request gets its own slice.
+"""
+import asyncio
+from datetime import datetime
+from itertools import groupby
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import attr
+from sqlalchemy import or_
+
+from homeassistant.core import HomeAssistant, State, callback
+
+from .const import DATA_INSTANCE
+from .models import RecorderRuns, States
+from .util import session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PRELOADER = "recorder_preloader"
+
+# Seconds to wait for more requests before loading them
+PRELOAD_DELAY = 0.1
+# Number of requests loaded by each query
+PRELOAD_BATCH_SIZE = 100
+
+
+@attr.s(slots=True)
+class PreloadRequest:
+    """Request for the recorded states of an entity."""
+
+    entity_id = attr.ib(type=str)
+    start_time = attr.ib(type=Optional[datetime], default=None)
+    end_time = attr.ib(type=Optional[datetime], default=None)
+    number_of_states = attr.ib(type=Optional[int], default=None)
+    changes_only = attr.ib(type=bool, default=False)
+    include_start_time_state = attr.ib(type=bool, default=False)
+    future = attr.ib(type=Optional[asyncio.Future], default=None)
+
+    def condition(self, last_states_cutoff=None):
+        """Return the filter for the states of the request."""
+        condition = States.entity_id == self.entity_id
+        if self.changes_only:
+            condition &= States.last_changed == States.last_updated
+        if self.start_time is not None:
+            condition &= States.last_updated > self.start_time
+        if self.end_time is not None:
+            condition &= States.last_updated < self.end_time
+        if last_states_cutoff is not None:
+            condition &= States.last_updated >= last_states_cutoff
+        return condition
+
+    def matches(self, state: State) -> bool:
+        """Return if a state loaded for the entity is part of the request."""
+        if self.changes_only and state.last_changed != state.last_updated:
+            return False
+        if self.start_time is not None and state.last_updated <= self.start_time:
+            return False
+        if self.end_time is not None and state.last_updated >= self.end_time:
+            return False
+        return True
+
+
+@callback
+def async_get_preloader(hass: HomeAssistant) -> "HistoryPreloader":
+    """Return the history preloader, creating it if needed."""
+    preloader = hass.data.get(DATA_PRELOADER)
+    if preloader is None:
+        preloader = hass.data[DATA_PRELOADER] = HistoryPreloader(hass)
+    return preloader
+
+
+async def async_load_states(
+    hass: HomeAssistant,
+    entity_id: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    number_of_states: Optional[int] = None,
+    changes_only: bool = False,
+    include_start_time_state: bool = False,
+) -> List[State]:
+    """Return the recorded states of an entity, oldest first.
+
+    Only states updated after start_time and before end_time are returned,
+    limited to the last number_of_states. With changes_only, states where
+    only the attributes changed are skipped. With include_start_time_state,
+    the state of the entity at start_time is returned first, as
+    history.get_significant_states does.
+    """
+    request = PreloadRequest(
+        entity_id.lower(),
+        start_time,
+        end_time,
+        number_of_states,
+        changes_only,
+        include_start_time_state and start_time is not None,
+    )
+    return await async_get_preloader(hass).async_load(request)
+
+
+class HistoryPreloader:
+    """Coalesce requests for recorded states into batched queries."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the preloader."""
+        self.hass = hass
+        self._pending: List[PreloadRequest] = []
+        self._unsub_flush: Optional[asyncio.TimerHandle] = None
+        self._loading = False
+
+    async def async_load(self, request: PreloadRequest) -> List[State]:
+        """Queue a request and return its states once they are loaded."""
+        request.future = self.hass.loop.create_future()
+        self._pending.append(request)
+
+        # Requests made while loading are flushed when the load is done
+        if self._unsub_flush is None and not self._loading:
+            self._unsub_flush = self.hass.loop.call_later(
+                PRELOAD_DELAY, self._async_flush
+            )
+
+        return await request.future
+
+    @callback
+    def _async_flush(self):
+        """Start loading the pending requests."""
+        self._unsub_flush = None
+        requests, self._pending = self._pending, []
+        self._loading = True
+        self.hass.async_create_task(self._async_load(requests))
+
+    async def _async_load(self, requests: List[PreloadRequest]):
+        """Load requests in the executor and hand out the results."""
+        try:
+            results = await self.hass.async_add_executor_job(self._load, requests)
+        except Exception as err:  # pylint: disable=broad-except
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(err)
+        else:
+            for request, states in zip(requests, results):
+                if not request.future.done():
+                    request.future.set_result(states)
+        finally:
+            self._loading = False
+            if self._pending:
+                self._async_flush()
+
+    def _load(self, requests: List[PreloadRequest]) -> List[List[State]]:
+        """Load the states of the requests."""
+        instance = self.hass.data[DATA_INSTANCE]
+        results = []
+
+        _LOGGER.debug("Loading the history of %d requests", len(requests))
+        with session_scope(hass=self.hass) as session:
+            for index in range(0, len(requests), PRELOAD_BATCH_SIZE):
+                batch = requests[index : index + PRELOAD_BATCH_SIZE]
+                results.extend(_load_batch(session, instance, batch))
+
+        return results
+
+
+def _load_batch(session, instance, requests: List[PreloadRequest]):
+    """Load the states of a batch of requests with two queries."""
+    # The bounds of the requests are selected at once with subqueries
+    columns = []
+    for index, request in enumerate(requests):
+        if request.number_of_states is not None:
+            columns.append(
+                _last_states_cutoff(session, request).label(f"cutoff_{index}")
+            )
+        if request.include_start_time_state:
+            columns.append(
+                _start_state_id(session, instance, request).label(f"start_{index}")
+            )
+
+    bounds = session.query(*columns).one() if columns else None
+    cutoffs = []
+    start_state_ids = []
+    for index in range(len(requests)):
+        cutoffs.append(getattr(bounds, f"cutoff_{index}", None))
+        start_state_ids.append(getattr(bounds, f"start_{index}", None))
+
+    conditions = [
+        request.condition(cutoff) for request, cutoff in zip(requests, cutoffs)
+    ]
+    state_ids = [state_id for state_id in start_state_ids if state_id is not None]
+    if state_ids:
+        conditions.append(States.state_id.in_(state_ids))
+
+    query = (
+        session.query(States)
+        .filter(or_(*conditions))
+        .order_by(States.entity_id, States.last_updated)
+    )
+
+    entities: Dict[str, List[Tuple[int, State]]] = {}
+    for entity_id, rows in groupby(query, lambda row: row.entity_id):
+        entities[entity_id] = [
+            (row.state_id, state)
+            for row, state in ((row, row.to_native()) for row in rows)
+            if state is not None
+        ]
+
+    results = []
+    for request, start_state_id in zip(requests, start_state_ids):
+        loaded = entities.get(request.entity_id, [])
+        states = [
+            state
+            for state_id, state in loaded
+            if state_id != start_state_id and request.matches(state)
+        ]
+        if request.number_of_states is not None:
+            states = states[-request.number_of_states :]
+
+        if start_state_id is not None:
+            for state_id, state in loaded:
+                if state_id == start_state_id:
+                    states.insert(
+                        0,
+                        State(
+                            state.entity_id,
+                            state.state,
+                            state.attributes,
+                            request.start_time,
+                            request.start_time,
+                            state.context,
+                        ),
+                    )
+                    break
+
+        results.append(states)
+
+    return results
+
+
+def _last_states_cutoff(session, request: PreloadRequest):
+    """Return a subquery for the oldest of the last states of a request."""
+    return (
+        session.query(States.last_updated)
+        .filter(request.condition())
+        .order_by(States.last_updated.desc())
+        .limit(1)
+        .offset(request.number_of_states - 1)
+        .as_scalar()
+    )
+
+
+def _start_state_id(session, instance, request: PreloadRequest):
+    """Return a subquery for the id of the state at the start of a request.
+
+    Like recorder.run_information, states recorded before the run covering
+    the start time are not used.
+    """
+    start_time = request.start_time
+
+    if start_time > instance.recording_start:
+        run_start = instance.run_info.start
+    else:
+        run_start = (
+            session.query(RecorderRuns.start)
+            .filter((RecorderRuns.start < start_time) & (RecorderRuns.end > start_time))
+            .limit(1)
+            .as_scalar()
+        )
+
+    return (
+        session.query(States.state_id)
+        .filter(
+            (States.entity_id == request.entity_id)
+            & (States.last_updated >= run_start)
+            & (States.last_updated < start_time)
+        )
+        .order_by(States.last_updated.desc())
+        .limit(1)
+        .as_scalar()
+    )
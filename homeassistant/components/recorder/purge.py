@@ -1,37 +1,56 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
+from sqlalchemy import exists, or_
 from sqlalchemy.exc import SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, States
+from .models import Events, StateAttributes, States, Statistics
+from .statistics import PERIODS
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of rows deleted per transaction
+PURGE_BATCH_SIZE = 1000
+# Seconds a purge may run before the recorder continues with its queue
+PURGE_TIME_BUDGET = 1
+
 
 def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
+    """Purge events, states and statistics older than purge_days ago.
+
+    Rows are deleted in batches until the time budget is used up. Returns
+    True when the purge is done, False when it has to be continued.
+    """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging events before %s", purge_before)
+    deadline = time.monotonic() + PURGE_TIME_BUDGET
 
     try:
-        with session_scope(session=instance.get_session()) as session:
-            deleted_rows = (
-                session.query(States)
-                .filter((States.last_updated < purge_before))
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+        while True:
+            with session_scope(session=instance.get_session()) as session:
+                # Attributes are purged once no old states reference them
+                for name, purge_batch in (
+                    ("states", _purge_states_batch),
+                    ("events", _purge_events_batch),
+                    ("state attributes", _purge_attributes_batch),
+                    ("statistics", _purge_statistics_batch),
+                ):
+                    deleted_rows = purge_batch(session, purge_before)
+                    if deleted_rows:
+                        _LOGGER.debug("Deleted %s %s", deleted_rows, name)
+                        break
 
-            deleted_rows = (
-                session.query(Events)
-                .filter((Events.time_fired < purge_before))
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            if not deleted_rows:
+                break
+
+            if time.monotonic() >= deadline:
+                _LOGGER.debug("Purge time budget used, continuing later")
+                return False
 
         # Execute sqlite vacuum command to free up space on disk
         if repack and instance.engine.driver in ("pysqlite", "postgresql"):
@@ -40,3 +59,88 @@ def purge_old_data(instance, purge_days, repack):
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+
+    return True
+
+
+def _purge_states_batch(session, purge_before):
+    """Delete a batch of the oldest states, return the number deleted."""
+    state_ids = [
+        row[0]
+        for row in session.query(States.state_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.state_id)
+        .limit(PURGE_BATCH_SIZE)
+    ]
+    if not state_ids:
+        return 0
+
+    return (
+        session.query(States)
+        .filter(States.state_id.in_(state_ids))
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge_events_batch(session, purge_before):
+    """Delete a batch of the oldest events, return the number deleted."""
+    event_ids = [
+        row[0]
+        for row in session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.event_id)
+        .limit(PURGE_BATCH_SIZE)
+    ]
+    if not event_ids:
+        return 0
+
+    return (
+        session.query(Events)
+        .filter(Events.event_id.in_(event_ids))
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge_attributes_batch(session, purge_before):
+    """Delete a batch of attributes no longer used by any state."""
+    attributes_ids = [
+        row[0]
+        for row in session.query(StateAttributes.attributes_id)
+        .filter(~exists().where(States.attributes_id == StateAttributes.attributes_id))
+        .limit(PURGE_BATCH_SIZE)
+    ]
+    if not attributes_ids:
+        return 0
+
+    return (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge_statistics_batch(session, purge_before):
+    """Delete a batch of statistics of periods ended before purge_before."""
+    statistics_ids = [
+        row[0]
+        for row in session.query(Statistics.statistics_id)
+        .filter(
+            or_(
+                *(
+                    (Statistics.period == period)
+                    & (Statistics.start < purge_before - timedelta(seconds=period))
+                    for period in PERIODS
+                )
+            )
+        )
+        .order_by(Statistics.statistics_id)
+        .limit(PURGE_BATCH_SIZE)
+    ]
+    if not statistics_ids:
+        return 0
+
+    return (
+        session.query(Statistics)
+        .filter(Statistics.statistics_id.in_(statistics_ids))
+        .delete(synchronize_session=False)
+    )
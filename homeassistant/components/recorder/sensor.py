@@ -0,0 +1,87 @@
+"""Entities to monitor the recorder queue and database writes."""
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_INSTANCE
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the recorder monitoring sensors."""
+    instance = hass.data[DATA_INSTANCE]
+
+    async_add_entities(
+        [
+            RecorderQueueDepthSensor(instance),
+            RecorderDroppedEventsSensor(instance),
+            RecorderWriteLatencySensor(instance),
+        ],
+        True,
+    )
+
+
+class RecorderSensor(Entity):
+    """Base class for sensors reading recorder statistics."""
+
+    def __init__(self, instance):
+        """Initialize the sensor."""
+        self._instance = instance
+        self._state = None
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+
+class RecorderQueueDepthSensor(RecorderSensor):
+    """Number of items waiting to be written by the recorder."""
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return "Recorder queue depth"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return "events"
+
+    async def async_update(self):
+        """Read the current queue depth."""
+        self._state = self._instance.queue.qsize()
+
+
+class RecorderDroppedEventsSensor(RecorderSensor):
+    """Number of events dropped because the recorder queue was full."""
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return "Recorder dropped events"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return "events"
+
+    async def async_update(self):
+        """Read the number of dropped events."""
+        self._state = self._instance.queue.dropped
+
+
+class RecorderWriteLatencySensor(RecorderSensor):
+    """Duration of the last transaction written by the recorder."""
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return "Recorder write latency"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return "ms"
+
+    async def async_update(self):
+        """Read the duration of the last write."""
+        latency = self._instance.write_latency
+        self._state = None if latency is None else round(latency * 1000, 1)
@@ -0,0 +1,165 @@
+"""Statistics of numeric sensors, compiled while recording their states."""
+import math
+from typing import Dict, List, Set, Tuple
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+import homeassistant.util.dt as dt_util
+
+from .models import Statistics
+
+PERIOD_5MINUTE = 300
+PERIOD_HOUR = 3600
+PERIODS = (PERIOD_5MINUTE, PERIOD_HOUR)
+
+
+def period_start(timestamp, period):
+    """Return the start of the period containing timestamp."""
+    seconds = dt_util.as_timestamp(timestamp)
+    return dt_util.utc_from_timestamp(seconds - seconds % period)
+
+
+class StatisticsPeriod:
+    """Running min, max and mean of a sensor during a period."""
+
+    __slots__ = ("entity_id", "period", "start", "count", "mean", "min", "max")
+
+    def __init__(self, entity_id, period, start):
+        """Initialize an empty period."""
+        self.entity_id = entity_id
+        self.period = period
+        self.start = start
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """Add a sample."""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, row):
+        """Merge the values of an already recorded period."""
+        total = self.count + row.count
+        self.mean = (self.mean * self.count + row.mean * row.count) / total
+        self.count = total
+        self.min = min(self.min, row.min)
+        self.max = max(self.max, row.max)
+
+    def as_dict(self):
+        """Return the values to write to the database."""
+        return {
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+        }
+
+
+class StatisticsCompiler:
+    """Keep the statistics of the current periods of each sensor.
+
+    Samples are added in memory, write() then inserts or updates the rows
+    of all periods changed since the last committed write.
+    """
+
+    def __init__(self):
+        """Initialize the compiler."""
+        self._periods: Dict[Tuple[str, int], StatisticsPeriod] = {}
+        self._changed: Set[StatisticsPeriod] = set()
+        # Database ids of the periods, known once they are read or written
+        self._ids: Dict[StatisticsPeriod, int] = {}
+        self._loaded: Set[StatisticsPeriod] = set()
+
+    def add_event(self, event):
+        """Add the new state of a state_changed event if it is numeric."""
+        new_state = event.data.get("new_state")
+        if (
+            new_state is None
+            or new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) is None
+        ):
+            return
+
+        try:
+            value = float(new_state.state)
+        except ValueError:
+            return
+
+        if not math.isfinite(value):
+            return
+
+        for period in PERIODS:
+            key = (new_state.entity_id, period)
+            start = period_start(new_state.last_updated, period)
+            stats = self._periods.get(key)
+
+            if stats is not None and start < stats.start:
+                # Ignore samples for periods that have been closed
+                continue
+
+            if stats is None or start > stats.start:
+                if stats is not None and stats not in self._changed:
+                    self._forget(stats)
+                stats = self._periods[key] = StatisticsPeriod(
+                    new_state.entity_id, period, start
+                )
+
+            stats.add(value)
+            self._changed.add(stats)
+
+    def write(self, session) -> List[Tuple[StatisticsPeriod, int]]:
+        """Write the changed periods, return the ids of inserted rows."""
+        inserted = []
+
+        for stats in self._changed:
+            if stats not in self._loaded:
+                # Continue a period recorded before a restart
+                row = (
+                    session.query(Statistics)
+                    .filter(
+                        (Statistics.entity_id == stats.entity_id)
+                        & (Statistics.period == stats.period)
+                        & (Statistics.start == stats.start)
+                    )
+                    .first()
+                )
+                self._loaded.add(stats)
+                if row is not None:
+                    stats.merge(row)
+                    self._ids[stats] = row.statistics_id
+
+            statistics_id = self._ids.get(stats)
+            if statistics_id is None:
+                row = Statistics(
+                    entity_id=stats.entity_id,
+                    period=stats.period,
+                    start=stats.start,
+                    **stats.as_dict(),
+                )
+                session.add(row)
+                inserted.append((stats, row))
+            else:
+                session.query(Statistics).filter(
+                    Statistics.statistics_id == statistics_id
+                ).update(stats.as_dict(), synchronize_session=False)
+
+        session.flush()
+        return [(stats, row.statistics_id) for stats, row in inserted]
+
+    def committed(self, inserted: List[Tuple[StatisticsPeriod, int]]):
+        """Mark the changed periods as written."""
+        for stats, statistics_id in inserted:
+            self._ids[stats] = statistics_id
+
+        for stats in self._changed:
+            if self._periods.get((stats.entity_id, stats.period)) is not stats:
+                self._forget(stats)
+
+        self._changed.clear()
+
+    def _forget(self, stats):
+        """Forget a period that is closed and written."""
+        self._ids.pop(stats, None)
+        self._loaded.discard(stats)
@@ -1,12 +1,13 @@
 """Support for statistics for sensor values."""
+from bisect import bisect_left, insort
 from collections import deque
+from datetime import timedelta
 import logging
-import statistics
+import math
 
 import voluptuous as vol
 
-from homeassistant.components.recorder.models import States
-from homeassistant.components.recorder.util import execute, session_scope
+from homeassistant.components.recorder.preload import async_load_states
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
@@ -64,6 +65,83 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 )
 
 
+# Bits to shift any float by to get an integer
+_EXACT_SHIFT = 1074
+
+
+def _exact(value):
+    """Return a float as an exact integer, scaled by 2 ** _EXACT_SHIFT."""
+    numerator, denominator = value.as_integer_ratio()
+    return numerator << (_EXACT_SHIFT + 1 - denominator.bit_length())
+
+
+class RunningStatistics:
+    """Statistics of a window of samples, updated as samples come and go.
+
+    Samples are kept sorted for the median, minimum and maximum. Sums are
+    kept as exact integers, so the mean is the same as statistics.mean and
+    the variance is the exact variance statistics.variance approximates.
+    """
+
+    def __init__(self):
+        """Initialize without samples."""
+        self.sorted = []
+        self._sum = 0
+        self._sum_squares = 0
+
+    def add(self, value):
+        """Add a sample."""
+        insort(self.sorted, value)
+        exact = _exact(value)
+        self._sum += exact
+        self._sum_squares += exact * exact
+
+    def remove(self, value):
+        """Remove a sample that was added."""
+        del self.sorted[bisect_left(self.sorted, value)]
+        exact = _exact(value)
+        self._sum -= exact
+        self._sum_squares -= exact * exact
+
+    @property
+    def count(self):
+        """Return the number of samples."""
+        return len(self.sorted)
+
+    @property
+    def total(self):
+        """Return the sum of the samples."""
+        return self._sum / (1 << _EXACT_SHIFT)
+
+    @property
+    def mean(self):
+        """Return the mean, at least one sample is required."""
+        return self._sum / (self.count << _EXACT_SHIFT)
+
+    @property
+    def median(self):
+        """Return the median, at least one sample is required."""
+        count = self.count
+        middle = count // 2
+        if count % 2:
+            return self.sorted[middle]
+        return (self.sorted[middle - 1] + self.sorted[middle]) / 2
+
+    @property
+    def variance(self):
+        """Return the sample variance, at least two samples are required."""
+        count = self.count
+        # n * sum(x ** 2) - sum(x) ** 2 == n * sum((x - mean) ** 2)
+        return (count * self._sum_squares - self._sum * self._sum) / (
+            (count * (count - 1)) << (2 * _EXACT_SHIFT)
+        )
+
+    @property
+    def stdev(self):
+        """Return the sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the Statistics sensor."""
     entity_id = config.get(CONF_ENTITY_ID)
@@ -93,6 +171,7 @@ class StatisticsSensor(Entity):
         self._unit_of_measurement = None
         self.states = deque(maxlen=self._sampling_size)
         self.ages = deque(maxlen=self._sampling_size)
+        self._statistics = RunningStatistics()
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -139,10 +218,16 @@ class StatisticsSensor(Entity):
 
         try:
             if self.is_binary:
-                self.states.append(new_state.state)
+                value = new_state.state
             else:
-                self.states.append(float(new_state.state))
-
+                value = float(new_state.state)
+                if not math.isfinite(value):
+                    raise ValueError
+                if len(self.states) == self._sampling_size:
+                    self._statistics.remove(self.states[0])
+                self._statistics.add(value)
+
+            self.states.append(value)
             self.ages.append(new_state.last_updated)
         except ValueError:
             _LOGGER.error(
@@ -216,7 +301,9 @@ class StatisticsSensor(Entity):
                 (now - self.ages[0]),
             )
             self.ages.popleft()
-            self.states.popleft()
+            value = self.states.popleft()
+            if not self.is_binary:
+                self._statistics.remove(value)
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
@@ -236,24 +323,28 @@ class StatisticsSensor(Entity):
         self.count = len(self.states)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            stats = self._statistics
+
+            if self.count >= 1:
+                self.mean = round(stats.mean, self._precision)
+                self.median = round(stats.median, self._precision)
+            else:
+                _LOGGER.debug("%s: at least one data point is required", self.entity_id)
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if self.count >= 2:
+                self.stdev = round(stats.stdev, self._precision)
+                self.variance = round(stats.variance, self._precision)
+            else:
+                _LOGGER.debug(
+                    "%s: at least two data points are required", self.entity_id
+                )
                 self.stdev = self.variance = STATE_UNKNOWN
 
             if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+                self.total = round(stats.total, self._precision)
+                self.min = round(stats.sorted[0], self._precision)
+                self.max = round(stats.sorted[-1], self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
@@ -302,38 +393,37 @@ class StatisticsSensor(Entity):
     async def _async_initialize_from_database(self):
         """Initialize the list of states from the database.
 
-        The query will get the list of states in DESCENDING order so that we
-        can limit the result to self._sample_size. Afterwards reverse the
-        list so that we get it in the right order again.
-
-        If MaxAge is provided then query will restrict to entries younger then
-        current datetime - MaxAge.
+        The states are loaded by the recorder preloader, limited to the
+        last self._sampling_size states. If MaxAge is provided then only
+        entries younger then current datetime - MaxAge are loaded.
         """
 
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
-        with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
-                States.entity_id == self._entity_id.lower()
-            )
-
-            if self._max_age is not None:
-                records_older_then = dt_util.utcnow() - self._max_age
-                _LOGGER.debug(
-                    "%s: retrieve records not older then %s",
-                    self.entity_id,
-                    records_older_then,
-                )
-                query = query.filter(States.last_updated >= records_older_then)
-            else:
-                _LOGGER.debug("%s: retrieving all records.", self.entity_id)
-
-            query = query.order_by(States.last_updated.desc()).limit(
-                self._sampling_size
+        records_older_then = None
+        if self._max_age is not None:
+            records_older_then = dt_util.utcnow() - self._max_age
+            _LOGGER.debug(
+                "%s: retrieve records not older then %s",
+                self.entity_id,
+                records_older_then,
             )
-            states = execute(query)
+        else:
+            _LOGGER.debug("%s: retrieving all records.", self.entity_id)
+
+        start_time = None
+        if records_older_then is not None:
+            # Keep states exactly MaxAge old, like _purge_old does
+            start_time = records_older_then - timedelta(microseconds=1)
+
+        states = await async_load_states(
+            self.hass,
+            self._entity_id,
+            start_time=start_time,
+            number_of_states=self._sampling_size,
+        )
 
-        for state in reversed(states):
+        for state in states:
             self._add_state_to_queue(state)
 
         self.async_schedule_update_ha_state(True)
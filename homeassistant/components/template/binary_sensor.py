@@ -24,9 +24,13 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_same_state, async_track_state_change
+from homeassistant.helpers.event import (
+    RenderInfoTracker,
+    async_track_same_state,
+    async_track_state_change,
+)
 
-from . import extract_entities, initialise_templates
+from . import initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 _LOGGER = logging.getLogger(__name__)
@@ -79,13 +83,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "binary sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             BinarySensorTemplate(
@@ -147,6 +145,9 @@ class BinarySensorTemplate(BinarySensorDevice):
         self._available = True
         self._attribute_templates = attribute_templates
         self._attributes = {}
+        self._render_tracker = None
+        self._render_infos = []
+        self._warned_untracked = False
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -156,14 +157,26 @@ class BinarySensorTemplate(BinarySensorDevice):
             """Handle the target device state changes."""
             self.async_check_state()
 
+        @callback
+        def template_bsensor_render_listener(event):
+            """Handle state changes of the states the templates depend on."""
+            self.async_check_state()
+
         @callback
         def template_bsensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_bsensor_state_listener
+            if self._entities is not None:
+                self.async_on_remove(
+                    async_track_state_change(
+                        self.hass, self._entities, template_bsensor_state_listener
+                    )
                 )
+            else:
+                # Track the states accessed by the last render of the templates
+                self._render_tracker = RenderInfoTracker(
+                    self.hass, template_bsensor_render_listener
+                )
+                self.async_on_remove(self._render_tracker.async_remove)
 
             self.async_check_state()
 
@@ -211,12 +224,49 @@ class BinarySensorTemplate(BinarySensorDevice):
         """Availability indicator."""
         return self._available
 
+    @callback
+    def _async_render_template(self, template):
+        """Render a template, collecting the states it accesses."""
+        if self._render_tracker is None:
+            return template.async_render()
+
+        info = template.async_render_to_info()
+        self._render_infos.append(info)
+        return info.result
+
     @callback
     def _async_render(self):
         """Get the state of template."""
+        self._render_infos = []
+        state = self._async_render_templates()
+
+        if self._render_tracker is not None:
+            self._render_tracker.async_set_render_infos(self._render_infos)
+            self._async_warn_untracked()
+
+        return state
+
+    @callback
+    def _async_warn_untracked(self):
+        """Warn once when the templates access no state to track."""
+        if self._warned_untracked or self._render_tracker.tracks_states:
+            return
+
+        self._warned_untracked = True
+        _LOGGER.warning(
+            "Template binary_sensor '%s' has no entity ids configured to track"
+            " nor were we able to extract the entities to track from its "
+            "templates. This entity will only be able to be updated "
+            "manually.",
+            self._name,
+        )
+
+    @callback
+    def _async_render_templates(self):
+        """Render the state, attributes and properties."""
         state = None
         try:
-            state = self._template.async_render().lower() == "true"
+            state = self._async_render_template(self._template).lower() == "true"
         except TemplateError as ex:
             if ex.args and ex.args[0].startswith(
                 "UndefinedError: 'None' has no attribute"
@@ -232,7 +282,7 @@ class BinarySensorTemplate(BinarySensorDevice):
         if self._attribute_templates is not None:
             for key, value in self._attribute_templates.items():
                 try:
-                    attrs[key] = value.async_render()
+                    attrs[key] = self._async_render_template(value)
                 except TemplateError as err:
                     _LOGGER.error("Error rendering attribute %s: %s", key, err)
             self._attributes = attrs
@@ -248,7 +298,7 @@ class BinarySensorTemplate(BinarySensorDevice):
                 continue
 
             try:
-                value = template.async_render()
+                value = self._async_render_template(template)
                 if property_name == "_available":
                     value = value.lower() == "true"
                 setattr(self, property_name, value)
@@ -295,11 +345,16 @@ class BinarySensorTemplate(BinarySensorDevice):
             return
 
         period = self._delay_on if state else self._delay_off
+        if self._render_tracker is not None:
+            entity_ids = self._render_tracker.entities
+        else:
+            entity_ids = self._entities or MATCH_ALL
+
         async_track_same_state(
             self.hass,
             period,
             set_state,
-            entity_ids=self._entities,
+            entity_ids=entity_ids,
             async_check_same_func=lambda *args: self._async_render() == state,
         )
 
@@ -20,15 +20,14 @@ from homeassistant.const import (
     CONF_SENSORS,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
 )
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import RenderInfoTracker, async_track_state_change
 
-from . import extract_entities, initialise_templates
+from . import initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 CONF_ATTRIBUTE_TEMPLATES = "attribute_templates"
@@ -81,13 +80,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             SensorTemplate(
@@ -149,6 +142,9 @@ class SensorTemplate(Entity):
         self._available = True
         self._attribute_templates = attribute_templates
         self._attributes = {}
+        self._render_tracker = None
+        self._render_infos = []
+        self._warned_untracked = False
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -158,14 +154,26 @@ class SensorTemplate(Entity):
             """Handle device state changes."""
             self.async_schedule_update_ha_state(True)
 
+        @callback
+        def template_sensor_render_listener(event):
+            """Handle state changes of the states the templates depend on."""
+            self.async_schedule_update_ha_state(True)
+
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_sensor_state_listener
+            if self._entities is not None:
+                self.async_on_remove(
+                    async_track_state_change(
+                        self.hass, self._entities, template_sensor_state_listener
+                    )
                 )
+            else:
+                # Track the states accessed by the last render of the templates
+                self._render_tracker = RenderInfoTracker(
+                    self.hass, template_sensor_render_listener
+                )
+                self.async_on_remove(self._render_tracker.async_remove)
 
             self.async_schedule_update_ha_state(True)
 
@@ -218,10 +226,45 @@ class SensorTemplate(Entity):
         """No polling needed."""
         return False
 
+    @callback
+    def _async_render_template(self, template):
+        """Render a template, collecting the states it accesses."""
+        if self._render_tracker is None:
+            return template.async_render()
+
+        info = template.async_render_to_info()
+        self._render_infos.append(info)
+        return info.result
+
     async def async_update(self):
-        """Update the state from the template."""
+        """Update the state from the templates."""
+        self._render_infos = []
+        self._async_render_templates()
+
+        if self._render_tracker is not None:
+            self._render_tracker.async_set_render_infos(self._render_infos)
+            self._async_warn_untracked()
+
+    @callback
+    def _async_warn_untracked(self):
+        """Warn once when the templates access no state to track."""
+        if self._warned_untracked or self._render_tracker.tracks_states:
+            return
+
+        self._warned_untracked = True
+        _LOGGER.warning(
+            "Template sensor '%s' has no entity ids configured to track nor"
+            " were we able to extract the entities to track from its "
+            "templates. This entity will only be able to be updated "
+            "manually.",
+            self._name,
+        )
+
+    @callback
+    def _async_render_templates(self):
+        """Render the state, attributes and properties."""
         try:
-            self._state = self._template.async_render()
+            self._state = self._async_render_template(self._template)
             self._available = True
         except TemplateError as ex:
             self._available = False
@@ -239,7 +282,7 @@ class SensorTemplate(Entity):
         attrs = {}
         for key, value in self._attribute_templates.items():
             try:
-                attrs[key] = value.async_render()
+                attrs[key] = self._async_render_template(value)
             except TemplateError as err:
                 _LOGGER.error("Error rendering attribute %s: %s", key, err)
 
@@ -257,7 +300,7 @@ class SensorTemplate(Entity):
                 continue
 
             try:
-                value = template.async_render()
+                value = self._async_render_template(template)
                 if property_name == "_available":
                     value = value.lower() == "true"
                 setattr(self, property_name, value)
@@ -1,24 +1,32 @@
 """Commands part of Websocket API."""
+from datetime import timedelta
+import logging
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
 import voluptuous as vol
 
 from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
+from homeassistant.core import DOMAIN as HASS_DOMAIN, callback, split_entity_id
 from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, Unauthorized
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import async_call_later, async_track_state_change
 from homeassistant.helpers.service import async_get_all_descriptions
+import homeassistant.util.dt as dt_util
 
 from . import const, decorators, messages
 
 # mypy: allow-untyped-calls, allow-untyped-defs
 
+_LOGGER = logging.getLogger(__name__)
+
 
 @callback
 def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -27,6 +35,225 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_render_template)
 
 
+class EventForwarder:
+    """Forward events of one type to all subscribed connections.
+
+    A single bus listener is shared by all subscriptions, and each event is
+    encoded once for all of them.
+    """
+
+    def __init__(self, hass, event_type):
+        """Initialize the forwarder."""
+        self.hass = hass
+        self.event_type = event_type
+        self.subscriptions: Dict[Tuple[Any, int], None] = {}
+        self._unsub_bus = None
+
+    @callback
+    def async_subscribe(self, connection, iden):
+        """Subscribe a connection, return a function to unsubscribe."""
+        key = (connection, iden)
+        self.subscriptions[key] = None
+
+        if self._unsub_bus is None:
+            self._unsub_bus = self.hass.bus.async_listen(
+                self.event_type, self._async_forward
+            )
+
+        @callback
+        def async_unsubscribe():
+            """Remove the subscription."""
+            self.subscriptions.pop(key, None)
+            if not self.subscriptions and self._unsub_bus is not None:
+                self._unsub_bus()
+                self._unsub_bus = None
+
+        return async_unsubscribe
+
+    @callback
+    def _async_forward(self, event):
+        """Forward an event to the subscribed connections."""
+        check_permissions = self.event_type == EVENT_STATE_CHANGED
+
+        if not check_permissions and event.event_type == EVENT_TIME_CHANGED:
+            return
+
+        template = None
+
+        for connection, iden in list(self.subscriptions):
+            if check_permissions and not connection.user.permissions.check_entity(
+                event.data["entity_id"], POLICY_READ
+            ):
+                continue
+
+            if template is None:
+                try:
+                    template = messages.event_message_template(event)
+                except (ValueError, TypeError) as err:
+                    _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, event)
+                    return
+
+            connection.send_message(messages.event_message_json(iden, template))
+
+
+class EntitySubscription:
+    """Subscription of a connection to the state changes of some entities.
+
+    With a minimum interval, the state changes of an entity sent within the
+    interval of the previous one are coalesced into the latest of them.
+    """
+
+    def __init__(self, hass, connection, iden, min_interval):
+        """Initialize the subscription."""
+        self.hass = hass
+        self.connection = connection
+        self.iden = iden
+        self.min_interval = min_interval
+        self._last_sent: Dict[str, Any] = {}
+        self._pending: Dict[str, Any] = {}
+        self._unsub_timers: Dict[str, Callable] = {}
+
+    @callback
+    def async_handle_event(self, event, get_template):
+        """Send a state changed event or delay it until the interval passed."""
+        entity_id = event.data["entity_id"]
+
+        if not self.connection.user.permissions.check_entity(entity_id, POLICY_READ):
+            return
+
+        if not self.min_interval:
+            self._async_send(get_template())
+            return
+
+        if entity_id in self._pending:
+            self._pending[entity_id] = event
+            return
+
+        now = dt_util.utcnow()
+        last_sent = self._last_sent.get(entity_id)
+
+        if last_sent is None or now - last_sent >= self.min_interval:
+            self._last_sent[entity_id] = now
+            self._async_send(get_template())
+            return
+
+        self._pending[entity_id] = event
+
+        @callback
+        def async_send_pending(_):
+            """Send the latest state changed event of the entity."""
+            self._unsub_timers.pop(entity_id)
+            self._last_sent[entity_id] = dt_util.utcnow()
+            pending = self._pending.pop(entity_id)
+            try:
+                template = messages.event_message_template(pending)
+            except (ValueError, TypeError) as err:
+                _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, pending)
+                return
+            self._async_send(template)
+
+        self._unsub_timers[entity_id] = async_call_later(
+            self.hass,
+            (last_sent + self.min_interval - now).total_seconds(),
+            async_send_pending,
+        )
+
+    @callback
+    def _async_send(self, template):
+        """Send an encoded event message."""
+        self.connection.send_message(messages.event_message_json(self.iden, template))
+
+    @callback
+    def async_cancel(self):
+        """Cancel the delayed events."""
+        for unsub in self._unsub_timers.values():
+            unsub()
+        self._unsub_timers.clear()
+        self._pending.clear()
+
+
+class EntitySubscriptionIndex:
+    """Dispatch state changes to the subscriptions of their entity or domain.
+
+    Subscriptions are indexed by entity_id and domain, so only the
+    subscriptions of the changed entity are visited for each event.
+    """
+
+    def __init__(self, hass):
+        """Initialize the index."""
+        self.hass = hass
+        self.by_entity_id: Dict[str, Set[EntitySubscription]] = {}
+        self.by_domain: Dict[str, Set[EntitySubscription]] = {}
+        self._unsub_bus = None
+
+    @callback
+    def async_subscribe(self, subscription, entity_ids, domains):
+        """Add a subscription, return a function to unsubscribe."""
+        keys = [(self.by_entity_id, entity_id) for entity_id in entity_ids]
+        keys.extend((self.by_domain, domain) for domain in domains)
+
+        for index, key in keys:
+            index.setdefault(key, set()).add(subscription)
+
+        if self._unsub_bus is None:
+            self._unsub_bus = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed
+            )
+
+        @callback
+        def async_unsubscribe():
+            """Remove the subscription."""
+            subscription.async_cancel()
+            for index, key in keys:
+                subscriptions = index.get(key)
+                if subscriptions is None:
+                    continue
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del index[key]
+
+            if (
+                not self.by_entity_id
+                and not self.by_domain
+                and self._unsub_bus is not None
+            ):
+                self._unsub_bus()
+                self._unsub_bus = None
+
+        return async_unsubscribe
+
+    @callback
+    def _async_state_changed(self, event):
+        """Pass a state change to the subscriptions of the entity."""
+        entity_id = event.data["entity_id"]
+        subscriptions = self.by_entity_id.get(entity_id)
+        domain_subscriptions = self.by_domain.get(split_entity_id(entity_id)[0])
+
+        if domain_subscriptions:
+            if subscriptions:
+                subscriptions = subscriptions | domain_subscriptions
+            else:
+                subscriptions = domain_subscriptions
+        elif not subscriptions:
+            return
+
+        template: Optional[str] = None
+
+        def get_template():
+            """Encode the event once for all subscriptions."""
+            nonlocal template
+            if template is None:
+                template = messages.event_message_template(event)
+            return template
+
+        for subscription in list(subscriptions):
+            try:
+                subscription.async_handle_event(event, get_template)
+            except (ValueError, TypeError) as err:
+                _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, event)
+                return
+
+
 def pong_message(iden):
     """Return a pong message."""
     return {"id": iden, "type": "pong"}
@@ -53,30 +280,13 @@ def handle_subscribe_events(hass, connection, msg):
     if event_type not in SUBSCRIBE_WHITELIST and not connection.user.is_admin:
         raise Unauthorized
 
-    if event_type == EVENT_STATE_CHANGED:
-
-        @callback
-        def forward_events(event):
-            """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                event.data["entity_id"], POLICY_READ
-            ):
-                return
-
-            connection.send_message(messages.event_message(msg["id"], event))
-
-    else:
-
-        @callback
-        def forward_events(event):
-            """Forward events to websocket."""
-            if event.event_type == EVENT_TIME_CHANGED:
-                return
+    forwarders = hass.data.setdefault(const.DATA_EVENT_FORWARDERS, {})
+    forwarder = forwarders.get(event_type)
+    if forwarder is None:
+        forwarder = forwarders[event_type] = EventForwarder(hass, event_type)
 
-            connection.send_message(messages.event_message(msg["id"], event.as_dict()))
-
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        event_type, forward_events
+    connection.subscriptions[msg["id"]] = forwarder.async_subscribe(
+        connection, msg["id"]
     )
 
     connection.send_message(messages.result_message(msg["id"]))
@@ -107,6 +317,46 @@ def handle_unsubscribe_events(hass, connection, msg):
         )
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("min_interval"): vol.All(cv.time_period, cv.positive_timedelta),
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Async friendly.
+    """
+    entity_ids = msg.get("entity_ids", [])
+    domains = msg.get("domains", [])
+
+    if not entity_ids and not domains:
+        connection.send_message(
+            messages.error_message(
+                msg["id"], const.ERR_INVALID_FORMAT, "No entity_ids or domains."
+            )
+        )
+        return
+
+    index = hass.data.get(const.DATA_ENTITY_SUBSCRIPTIONS)
+    if index is None:
+        index = EntitySubscriptionIndex(hass)
+        hass.data[const.DATA_ENTITY_SUBSCRIPTIONS] = index
+
+    subscription = EntitySubscription(
+        hass, connection, msg["id"], msg.get("min_interval", timedelta())
+    )
+    connection.subscriptions[msg["id"]] = index.async_subscribe(
+        subscription, entity_ids, domains
+    )
+
+    connection.send_message(messages.result_message(msg["id"]))
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "call_service",
@@ -178,7 +428,7 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -43,5 +43,9 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS = DOMAIN + ".connections"
+# Data used to store the event forwarders by event type
+DATA_EVENT_FORWARDERS = DOMAIN + ".event_forwarders"
+# Data used to store the index of entity subscriptions
+DATA_ENTITY_SUBSCRIPTIONS = DOMAIN + ".entity_subscriptions"
 
 JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
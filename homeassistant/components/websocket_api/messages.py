@@ -2,7 +2,9 @@
 
 import voluptuous as vol
 
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import json_dumps_event_data
 
 from . import const
 
@@ -17,12 +19,29 @@ MINIMAL_MESSAGE_SCHEMA = vol.Schema(
 # Base schema to extend by message handlers
 BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
+# Placeholder for the id in messages encoded once for many subscriptions
+IDEN_TEMPLATE = "__IDEN__"
+IDEN_JSON_TEMPLATE = '"__IDEN__"'
+# Placeholder for parts of messages encoded separately
+JSON_PLACEHOLDER = "__JSON__"
+
 
 def result_message(iden, result=None):
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def states_result_message(iden, states):
+    """Return a success result message with states, encoded as JSON.
+
+    The states are encoded with their cached JSON.
+    """
+    states_json = "[{}]".format(", ".join(state.as_json() for state in states))
+    return _replace_placeholder(
+        const.JSON_DUMP(result_message(iden, JSON_PLACEHOLDER)), states_json
+    )
+
+
 def error_message(iden, code, message):
     """Return an error result message."""
     return {
@@ -36,3 +55,32 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def event_message_template(event):
+    """Return an event message encoded as JSON with a placeholder id.
+
+    The result is shared between subscriptions, see event_message_json.
+    """
+    if event.event_type != EVENT_STATE_CHANGED:
+        return const.JSON_DUMP(event_message(IDEN_TEMPLATE, event))
+
+    # The states in the data are encoded with their cached JSON
+    event_dict = event.as_dict()
+    event_dict["data"] = JSON_PLACEHOLDER
+    return _replace_placeholder(
+        const.JSON_DUMP(event_message(IDEN_TEMPLATE, event_dict)),
+        json_dumps_event_data(event.data),
+    )
+
+
+def event_message_json(iden, template):
+    """Return an encoded event message for a subscription."""
+    # The id is the first key, so the first match is the placeholder
+    return template.replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+def _replace_placeholder(template, encoded):
+    """Insert JSON encoded separately in place of JSON_PLACEHOLDER."""
+    # The placeholder is encoded before any user data, so it matches first
+    return template.replace(f'"{JSON_PLACEHOLDER}"', encoded, 1)
@@ -6,9 +6,11 @@ of entities and react to changes.
 """
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 import datetime
 import enum
 import functools
+import json
 import logging
 import os
 import pathlib
@@ -63,9 +65,11 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import location, slugify
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
 
 # Typing imports that create a circular dependency
@@ -693,6 +697,8 @@ class State:
         "last_changed",
         "last_updated",
         "context",
+        "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -728,6 +734,8 @@ class State:
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
+        self._as_dict: Optional[ReadOnlyDict] = None
+        self._as_json: Optional[str] = None
 
     @property
     def domain(self) -> str:
@@ -751,17 +759,59 @@ class State:
 
         Async friendly.
 
-        To be used for JSON serialization.
+        To be used for JSON serialization. The dict is created once and
+        shared by all callers, so it is read only.
         Ensures: state == State.from_dict(state.as_dict())
         """
-        return {
-            "entity_id": self.entity_id,
-            "state": self.state,
-            "attributes": dict(self.attributes),
-            "last_changed": self.last_changed,
-            "last_updated": self.last_updated,
-            "context": self.context.as_dict(),
-        }
+        if self._as_dict is None:
+            self._as_dict = ReadOnlyDict(
+                {
+                    "entity_id": self.entity_id,
+                    "state": self.state,
+                    "attributes": ReadOnlyDict(self.attributes),
+                    "last_changed": self.last_changed,
+                    "last_updated": self.last_updated,
+                    "context": ReadOnlyDict(self.context.as_dict()),
+                }
+            )
+        return self._as_dict
+
+    def __copy__(self) -> "State":
+        """Return a copy of the state without its cached dict and JSON.
+
+        Copies are changed by some integrations, like filter sensors.
+        """
+        state = self.__class__.__new__(self.__class__)
+        for slot in self.__slots__:
+            setattr(state, slot, getattr(self, slot))
+        state._as_dict = None
+        state._as_json = None
+        return state
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "State":
+        """Return a deep copy of the state without its cached dict and JSON."""
+        state = self.__class__.__new__(self.__class__)
+        memo[id(self)] = state
+        for slot in self.__slots__:
+            if slot not in ("attributes", "_as_dict", "_as_json"):
+                setattr(state, slot, deepcopy(getattr(self, slot), memo))
+        # Mapping proxies can't be copied, copy the attributes they wrap
+        state.attributes = MappingProxyType(deepcopy(dict(self.attributes), memo))
+        state._as_dict = None
+        state._as_json = None
+        return state
+
+    def as_json(self) -> str:
+        """Return the State encoded as JSON.
+
+        Async friendly.
+
+        The JSON is encoded once and shared by all callers. Raises ValueError
+        if the attributes contain values that are not finite.
+        """
+        if self._as_json is None:
+            self._as_json = json.dumps(self.as_dict(), cls=JSONEncoder, allow_nan=False)
+        return self._as_json
 
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
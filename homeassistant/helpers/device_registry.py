@@ -1,8 +1,8 @@
 """Provide a way to connect entities belonging to one device."""
 from asyncio import Event
-from collections import OrderedDict
+from collections import UserDict
 import logging
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 import uuid
 
 import attr
@@ -67,10 +67,72 @@ def format_mac(mac: str) -> str:
     return mac
 
 
+class DeviceRegistryItems(UserDict):
+    """Container for the entries of the device registry.
+
+    Keeps the entries indexed by identifier and connection.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the container."""
+        self._identifiers: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._connections: Dict[Tuple[str, str], Dict[str, None]] = {}
+        super().__init__()
+
+    def __setitem__(self, key: str, device: DeviceEntry) -> None:
+        """Add or replace an entry."""
+        old = self.data.get(key)
+        self.data[key] = device
+
+        if old is not None:
+            if (
+                old.identifiers == device.identifiers
+                and old.connections == device.connections
+            ):
+                return
+            self._unindex(key, old)
+
+        for index, index_keys in (
+            (self._identifiers, device.identifiers),
+            (self._connections, device.connections),
+        ):
+            for index_key in index_keys:
+                index.setdefault(index_key, {})[key] = None
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an entry."""
+        self._unindex(key, self.data.pop(key))
+
+    def _unindex(self, key: str, device: DeviceEntry) -> None:
+        """Remove an entry from the indexes."""
+        for index, index_keys in (
+            (self._identifiers, device.identifiers),
+            (self._connections, device.connections),
+        ):
+            for index_key in index_keys:
+                keys = index.get(index_key)
+                if keys is None:
+                    continue
+                keys.pop(key, None)
+                if not keys:
+                    del index[index_key]
+
+    def get_device_ids(self, identifiers: set, connections: set) -> Set[str]:
+        """Return the ids of devices with any of the identifiers or connections."""
+        device_ids: Set[str] = set()
+        for index, index_keys in (
+            (self._identifiers, identifiers),
+            (self._connections, connections),
+        ):
+            for index_key in index_keys:
+                device_ids.update(index.get(index_key, ()))
+        return device_ids
+
+
 class DeviceRegistry:
     """Class to hold a registry of devices."""
 
-    devices: Dict[str, DeviceEntry]
+    devices: DeviceRegistryItems
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -87,11 +149,19 @@ class DeviceRegistry:
         self, identifiers: set, connections: set
     ) -> Optional[DeviceEntry]:
         """Check if device is registered."""
-        for device in self.devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or any(
-                conn in device.connections for conn in connections
-            ):
+        device_ids = self.devices.get_device_ids(identifiers, connections)
+
+        if not device_ids:
+            return None
+
+        if len(device_ids) == 1:
+            return self.devices[device_ids.pop()]
+
+        # Return the first registered device that matches
+        for device_id, device in self.devices.items():
+            if device_id in device_ids:
                 return device
+
         return None
 
     @callback
@@ -272,7 +342,7 @@ class DeviceRegistry:
         """Load the device registry."""
         data = await self._store.async_load()
 
-        devices = OrderedDict()
+        devices = DeviceRegistryItems()
 
         if data is not None:
             for device in data["devices"]:
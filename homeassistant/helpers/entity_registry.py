@@ -8,10 +8,10 @@ registered. Registering a new entity while a timer is in progress resets the
 timer.
 """
 import asyncio
-from collections import OrderedDict
+from collections import UserDict
 from itertools import chain
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, cast
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, cast
 
 import attr
 
@@ -92,13 +92,88 @@ class RegistryEntry:
         return self.disabled_by is not None
 
 
+class EntityRegistryItems(UserDict):
+    """Container for the entries of the entity registry.
+
+    Keeps the entries indexed by unique id, device and config entry.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the container."""
+        self._unique_ids: Dict[Tuple[str, str, str], str] = {}
+        self._device_ids: Dict[str, Dict[str, None]] = {}
+        self._config_entry_ids: Dict[str, Dict[str, None]] = {}
+        super().__init__()
+
+    def __setitem__(self, key: str, entry: RegistryEntry) -> None:
+        """Add or replace an entry."""
+        old = self.data.get(key)
+        self.data[key] = entry
+
+        if old is not None:
+            if (
+                old.domain == entry.domain
+                and old.platform == entry.platform
+                and old.unique_id == entry.unique_id
+                and old.device_id == entry.device_id
+                and old.config_entry_id == entry.config_entry_id
+            ):
+                return
+            self._unindex(key, old)
+
+        self._unique_ids[(entry.domain, entry.platform, entry.unique_id)] = key
+        if entry.device_id is not None:
+            self._device_ids.setdefault(entry.device_id, {})[key] = None
+        if entry.config_entry_id is not None:
+            self._config_entry_ids.setdefault(entry.config_entry_id, {})[key] = None
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an entry."""
+        self._unindex(key, self.data.pop(key))
+
+    def _unindex(self, key: str, entry: RegistryEntry) -> None:
+        """Remove an entry from the indexes."""
+        unique_id = (entry.domain, entry.platform, entry.unique_id)
+        if self._unique_ids.get(unique_id) == key:
+            del self._unique_ids[unique_id]
+
+        for index, index_key in (
+            (self._device_ids, entry.device_id),
+            (self._config_entry_ids, entry.config_entry_id),
+        ):
+            keys = index.get(index_key)
+            if keys is None:
+                continue
+            keys.pop(key, None)
+            if not keys:
+                del index[index_key]
+
+    def get_entity_id(
+        self, domain: str, platform: str, unique_id: str
+    ) -> Optional[str]:
+        """Return the entity_id of a unique id."""
+        return self._unique_ids.get((domain, platform, unique_id))
+
+    def get_entries_for_device_id(self, device_id: str) -> List[RegistryEntry]:
+        """Return the entries of a device."""
+        return [self.data[key] for key in self._device_ids.get(device_id, ())]
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> List[RegistryEntry]:
+        """Return the entries of a config entry."""
+        return [
+            self.data[key] for key in self._config_entry_ids.get(config_entry_id, ())
+        ]
+
+
 class EntityRegistry:
     """Class to hold a registry of entities."""
 
     def __init__(self, hass: HomeAssistantType):
         """Initialize the registry."""
         self.hass = hass
-        self.entities: Dict[str, RegistryEntry]
+        self.entities: EntityRegistryItems
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
@@ -119,14 +194,7 @@ class EntityRegistry:
         self, domain: str, platform: str, unique_id: str
     ) -> Optional[str]:
         """Check if an entity_id is currently registered."""
-        for entity in self.entities.values():
-            if (
-                entity.domain == domain
-                and entity.platform == platform
-                and entity.unique_id == unique_id
-            ):
-                return entity.entity_id
-        return None
+        return self.entities.get_entity_id(domain, platform, unique_id)
 
     @callback
     def async_generate_entity_id(
@@ -318,20 +386,13 @@ class EntityRegistry:
             entity_id = changes["entity_id"] = new_entity_id
 
         if new_unique_id is not _UNDEF:
-            conflict = next(
-                (
-                    entity
-                    for entity in self.entities.values()
-                    if entity.unique_id == new_unique_id
-                    and entity.domain == old.domain
-                    and entity.platform == old.platform
-                ),
-                None,
+            conflict_entity_id = self.entities.get_entity_id(
+                old.domain, old.platform, new_unique_id
             )
-            if conflict:
+            if conflict_entity_id:
                 raise ValueError(
                     f"Unique id '{new_unique_id}' is already in use by "
-                    f"'{conflict.entity_id}'"
+                    f"'{conflict_entity_id}'"
                 )
             changes["unique_id"] = new_unique_id
 
@@ -361,7 +422,7 @@ class EntityRegistry:
             old_conf_load_func=load_yaml,
             old_conf_migrate_func=_async_migrate,
         )
-        entities: Dict[str, RegistryEntry] = OrderedDict()
+        entities = EntityRegistryItems()
 
         if data is not None:
             for entity in data["entities"]:
@@ -413,12 +474,8 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in self.entities.get_entries_for_config_entry_id(config_entry):
+            self.async_remove(entry.entity_id)
 
 
 @bind_hass
@@ -449,9 +506,7 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    return registry.entities.get_entries_for_device_id(device_id)
 
 
 @callback
@@ -459,11 +514,7 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    return registry.entities.get_entries_for_config_entry_id(config_entry_id)
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
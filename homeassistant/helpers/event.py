@@ -1,7 +1,22 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
-from typing import Any, Callable, Dict, Iterable, Optional, Union, cast
+import heapq
+import itertools
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import attr
 
@@ -14,13 +29,27 @@ from homeassistant.const import (
     SUN_EVENT_SUNRISE,
     SUN_EVENT_SUNSET,
 )
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.sun import get_astral_event_next
-from homeassistant.helpers.template import Template
+from homeassistant.helpers.template import RenderInfo, Template, is_template_string
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
+TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
+TRACK_TIME_TIMERS = "track_time_timers"
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -81,12 +110,6 @@ def async_track_state_change(
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
-        if (
-            entity_ids != MATCH_ALL
-            and cast(str, event.data.get("entity_id")) not in entity_ids
-        ):
-            return
-
         old_state = event.data.get("old_state")
         if old_state is not None:
             old_state = old_state.state
@@ -103,12 +126,192 @@ def async_track_state_change(
                 event.data.get("new_state"),
             )
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+
+    return async_track_state_change_event(hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+@bind_hass
+def async_track_state_change_event(
+    hass: HomeAssistant,
+    entity_ids: Union[str, Iterable[str]],
+    action: Callable[[Event], None],
+) -> CALLBACK_TYPE:
+    """Track state changed events of specific entities.
+
+    The trackers of all entities share a single listener, which only calls
+    the actions tracking the entity of the event.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by entity_id."""
+            entity_id = event.data.get("entity_id")
+
+            if entity_id not in entity_callbacks:
+                return
+
+            for action in entity_callbacks[entity_id][:]:
+                try:
+                    hass.async_run_job(action, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s", entity_id
+                    )
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+        )
+
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+
+    entity_ids = {entity_id.lower() for entity_id in entity_ids}
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(action)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            callbacks = entity_callbacks.get(entity_id)
+            if callbacks is None or action not in callbacks:
+                continue
+            callbacks.remove(action)
+            if not callbacks:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
+class RenderInfoTracker:
+    """Track the states accessed by the last renders of templates.
+
+    The action is called with the state_changed event of an entity whose
+    state was accessed, or of an entity that was added to or removed from
+    the states or domains that were iterated.
+
+    With match_all, all state changes are tracked as long as the renders do
+    not access any state, for templates that only depend on the time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        action: Callable[[Event], None],
+        match_all: bool = False,
+    ):
+        """Initialize the tracker."""
+        self.hass = hass
+        self._action = action
+        self._match_all_fallback = match_all
+        self._match_all = False
+        self._entities: FrozenSet[str] = frozenset()
+        self._domains: FrozenSet[str] = frozenset()
+        self._all_states = False
+        self._unsub_entities: Optional[CALLBACK_TYPE] = None
+        self._unsub_lifecycle: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def entities(self) -> FrozenSet[str]:
+        """Return the tracked entities."""
+        return self._entities
+
+    @property
+    def tracks_states(self) -> bool:
+        """Return if the last renders accessed any state."""
+        return bool(self._entities or self._domains or self._all_states)
+
+    @callback
+    def async_set_render_infos(self, infos: Iterable[RenderInfo]) -> None:
+        """Track the states accessed by the renders."""
+        entities: Set[str] = set()
+        domains: Set[str] = set()
+        all_states = False
+
+        for info in infos:
+            try:
+                info.result
+            except TemplateError:
+                # The render stopped early, keep what was tracked before
+                entities |= self._entities
+                domains |= self._domains
+                all_states |= self._all_states
+
+            entities |= info.entities
+            domains |= info.domains
+            all_states |= info.all_states
+
+        if entities != self._entities:
+            if self._unsub_entities is not None:
+                self._unsub_entities()
+                self._unsub_entities = None
+            if entities:
+                self._unsub_entities = async_track_state_change_event(
+                    self.hass, entities, self._action
+                )
+
+        self._entities = frozenset(entities)
+        self._domains = frozenset(domains)
+        self._all_states = all_states
+        self._match_all = self._match_all_fallback and not (
+            entities or domains or all_states
+        )
+
+        if not domains and not all_states and not self._match_all:
+            if self._unsub_lifecycle is not None:
+                self._unsub_lifecycle()
+                self._unsub_lifecycle = None
+        elif self._unsub_lifecycle is None:
+            self._unsub_lifecycle = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_lifecycle_listener
+            )
+
+    @callback
+    def _async_lifecycle_listener(self, event: Event) -> None:
+        """Call the action when an entity of the iterated states comes or goes."""
+        if self._match_all:
+            self.hass.async_run_job(self._action, event)
+            return
+
+        entity_id = event.data["entity_id"]
+
+        if entity_id in self._entities or (
+            event.data.get("old_state") is not None
+            and event.data.get("new_state") is not None
+        ):
+            return
+
+        if self._all_states or split_entity_id(entity_id)[0] in self._domains:
+            self.hass.async_run_job(self._action, event)
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop tracking."""
+        if self._unsub_entities is not None:
+            self._unsub_entities()
+            self._unsub_entities = None
+        if self._unsub_lifecycle is not None:
+            self._unsub_lifecycle()
+            self._unsub_lifecycle = None
+
+
 @callback
 @bind_hass
 def async_track_template(
@@ -117,28 +320,44 @@ def async_track_template(
     action: Callable[[str, State, State], None],
     variables: Optional[Dict[str, Any]] = None,
 ) -> CALLBACK_TYPE:
-    """Add a listener that track state changes with template condition."""
-    from . import condition
+    """Add a listener that track state changes with template condition.
 
+    The states to track are taken from the last render of the template.
+    """
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
     @callback
-    def template_condition_listener(entity_id: str, from_s: State, to_s: State) -> None:
+    def template_condition_listener(event: Event) -> None:
         """Check if condition is correct and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+        info = template.async_render_to_info(variables)
+        tracker.async_set_render_infos([info])
+
+        try:
+            template_result = info.result.lower() == "true"
+        except TemplateError as ex:
+            _LOGGER.error("Error during template condition: %s", ex)
+            template_result = False
 
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            hass.async_run_job(
+                action,
+                event.data.get("entity_id"),
+                event.data.get("old_state"),
+                event.data.get("new_state"),
+            )
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables), template_condition_listener
+    tracker = RenderInfoTracker(
+        hass, template_condition_listener, is_template_string(template.template)
     )
+    tracker.async_set_render_infos([template.async_render_to_info(variables)])
+
+    return tracker.async_remove
 
 
 track_template = threaded_listener_factory(async_track_template)
@@ -231,27 +450,7 @@ def async_track_point_in_utc_time(
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, "run"):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        setattr(point_in_time_listener, "run", True)
-        async_unsub()
-
-        hass.async_run_job(action, now)
-
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
-
-    return async_unsub
+    return _async_get_timers(hass).async_schedule(point_in_time, action)
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -416,42 +615,46 @@ def async_track_utc_time_change(
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    next_time = None
+    timers = _async_get_timers(hass)
+    cancel_timer: Optional[CALLBACK_TYPE] = None
 
-    def calculate_next(now: datetime) -> None:
-        """Calculate and set the next time the trigger should fire."""
-        nonlocal next_time
+    @callback
+    def schedule_next(now: datetime) -> None:
+        """Schedule the next time the trigger should fire."""
+        nonlocal cancel_timer
 
         localized_now = dt_util.as_local(now) if local else now
         next_time = dt_util.find_next_time_expression_time(
             localized_now, matching_seconds, matching_minutes, matching_hours
         )
-
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now: Optional[datetime] = None
+        cancel_timer = timers.async_schedule(
+            dt_util.as_utc(next_time), pattern_time_change_listener
+        )
 
     @callback
-    def pattern_time_change_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
-
-        now = event.data[ATTR_NOW]
+    def pattern_time_change_listener(now: datetime) -> None:
+        """Fire the action and schedule the next time."""
+        hass.async_run_job(action, dt_util.as_local(now) if local else now)
+        schedule_next(now + timedelta(seconds=1))
 
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
-            calculate_next(now)
+    @callback
+    def time_rolled_back(now: datetime) -> None:
+        """Make sure rolling back the clock doesn't prevent the trigger."""
+        assert cancel_timer is not None
+        cancel_timer()
+        schedule_next(now)
 
-        last_now = now
+    schedule_next(dt_util.utcnow())
+    remove_rollback_listener = timers.async_listen_rollback(time_rolled_back)
 
-        if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
-            calculate_next(now + timedelta(seconds=1))
+    @callback
+    def remove_listener() -> None:
+        """Remove the pattern listener."""
+        assert cancel_timer is not None
+        remove_rollback_listener()
+        cancel_timer()
 
-    # We can't use async_track_point_in_utc_time here because it would
-    # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED, pattern_time_change_listener)
+    return remove_listener
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -473,6 +676,127 @@ def async_track_time_change(
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+class _TimerQueue:
+    """Timers of the event helpers, fired by the time changed events.
+
+    Timers are kept in a heap ordered by their point in time, so a time
+    changed event only visits the timers that are due. The clock rolling
+    back is detected here once for all time pattern listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer queue."""
+        self.hass = hass
+        # Entries are (point in time, sequence, [action]), the action is
+        # set to None once the timer is cancelled or fired.
+        self._heap: List[Tuple[datetime, int, List[Any]]] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._rollback_listeners: List[Callable[[datetime], None]] = []
+        self._last_now = dt_util.utcnow()
+        self._unsub_time_changed: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_schedule(
+        self, point_in_time: datetime, action: Callable[..., None]
+    ) -> CALLBACK_TYPE:
+        """Schedule an action, return a function to cancel it."""
+        entry = [action]
+        heapq.heappush(self._heap, (point_in_time, next(self._sequence), entry))
+        self._async_listen()
+
+        @callback
+        def async_cancel() -> None:
+            """Cancel the timer if it did not fire yet."""
+            if entry[0] is None:
+                return
+
+            entry[0] = None
+            self._cancelled += 1
+
+            if self._cancelled > len(self._heap) // 2:
+                self._heap = [item for item in self._heap if item[2][0] is not None]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+            self._async_unlisten_if_idle()
+
+        return async_cancel
+
+    @callback
+    def async_listen_rollback(
+        self, listener: Callable[[datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Call listener with the new time when the clock rolls back."""
+        self._rollback_listeners.append(listener)
+        self._async_listen()
+
+        @callback
+        def async_remove() -> None:
+            """Remove the rollback listener."""
+            self._rollback_listeners.remove(listener)
+            self._async_unlisten_if_idle()
+
+        return async_remove
+
+    @callback
+    def _async_listen(self) -> None:
+        """Listen for time changed events."""
+        if self._unsub_time_changed is None:
+            self._unsub_time_changed = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+    @callback
+    def _async_unlisten_if_idle(self) -> None:
+        """Stop listening when there is nothing left to fire."""
+        if (
+            self._unsub_time_changed is not None
+            and len(self._heap) == self._cancelled
+            and not self._rollback_listeners
+        ):
+            self._unsub_time_changed()
+            self._unsub_time_changed = None
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Fire the timers that are due."""
+        now = dt_util.as_utc(event.data[ATTR_NOW])
+
+        if now < self._last_now:
+            for listener in list(self._rollback_listeners):
+                listener(now)
+
+        self._last_now = now
+
+        # Timers scheduled by the actions fire on the next time changed event
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, entry = heapq.heappop(self._heap)
+            if entry[0] is None:
+                self._cancelled -= 1
+                continue
+            due.append(entry[0])
+            entry[0] = None
+
+        for action in due:
+            try:
+                self.hass.async_run_job(action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running timer action %s", action)
+
+        self._async_unlisten_if_idle()
+
+
+@callback
+def _async_get_timers(hass: HomeAssistant) -> _TimerQueue:
+    """Return the timer queue of the event helpers."""
+    timers = hass.data.get(TRACK_TIME_TIMERS)
+    if timers is None:
+        timers = hass.data[TRACK_TIME_TIMERS] = _TimerQueue(hass)
+    return cast(_TimerQueue, timers)
+
+
 def _process_state_match(
     parameter: Union[None, str, Iterable[str]]
 ) -> Callable[[str], bool]:
@@ -2,7 +2,7 @@
 from datetime import datetime
 import json
 import logging
-from typing import Any
+from typing import Any, Mapping
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,3 +24,20 @@ class JSONEncoder(json.JSONEncoder):
             return o.as_dict()
 
         return json.JSONEncoder.default(self, o)
+
+
+def json_dumps_event_data(data: Mapping[str, Any]) -> str:
+    """Encode event data like JSONEncoder, reusing the JSON of its states.
+
+    Values with an as_json method, like State, are not encoded again.
+    Raises ValueError for values that are not finite.
+    """
+    parts = []
+    for key, value in data.items():
+        as_json = getattr(value, "as_json", None)
+        if as_json is None:
+            encoded = json.dumps(value, cls=JSONEncoder, allow_nan=False)
+        else:
+            encoded = as_json()
+        parts.append(f"{json.dumps(key)}: {encoded}")
+    return "{" + ", ".join(parts) + "}"
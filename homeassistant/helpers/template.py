@@ -1,16 +1,28 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 import base64
+from collections import OrderedDict
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, partial, wraps
 import json
 import logging
 import math
 import random
 import re
-from typing import Any, Dict, Iterable, List, Optional, Union
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 import jinja2
-from jinja2 import contextfilter, contextfunction
+from jinja2 import contextfilter, contextfunction, nodes
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace  # type: ignore
 
@@ -40,6 +52,12 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 
+# Number of templates kept compiled by source
+COMPILED_CACHE_SIZE = 4096
+
+# Filters value templates can apply without being rendered by jinja
+_VALUE_FILTERS = ("float", "int", "round")
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:states\.|(?:is_state|is_state_attr|state_attr|states)"
@@ -49,6 +67,63 @@ _RE_GET_ENTITIES = re.compile(
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{")
 
 
+class CompiledCache:
+    """Least recently used cache of compiled templates, with hit stats."""
+
+    def __init__(self, maxsize: int):
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compile_func: Callable[[], Any]) -> Any:
+        """Return the cached value of key, compiling it on a miss."""
+        with self._lock:
+            value = self._cache.get(key, _SENTINEL)
+            if value is not _SENTINEL:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Errors are raised to the caller and not cached
+        value = compile_func()
+
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return value
+
+    def info(self) -> Dict[str, int]:
+        """Return the stats of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        """Clear the cache and its stats."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+
+# Code of the compiled templates by source and environment flavor, shared
+# by all environments of the same flavor.
+_COMPILED_CODE = CompiledCache(COMPILED_CACHE_SIZE)
+
+
+def compiled_cache_info() -> Dict[str, int]:
+    """Return the stats of the compiled template code cache."""
+    return _COMPILED_CODE.info()
+
+
 @bind_hass
 def attach(hass, obj):
     """Recursively attach hass to all template instances in list and dict."""
@@ -73,11 +148,16 @@ def render_complex(value, variables=None):
     return value
 
 
+def is_template_string(maybe_template: str) -> bool:
+    """Check if the input is a Jinja2 template."""
+    return _RE_JINJA_DELIMITERS.search(maybe_template) is not None
+
+
 def extract_entities(
     template: Optional[str], variables: Optional[Dict[str, Any]] = None
 ) -> Union[str, List[str]]:
     """Extract all entities for state_changed listener from template string."""
-    if template is None or _RE_JINJA_DELIMITERS.search(template) is None:
+    if template is None or not is_template_string(template):
         return []
 
     if _RE_NONE_ENTITIES.search(template):
@@ -139,6 +219,21 @@ class RenderInfo:
             or entity_id in self._entities
         )
 
+    @property
+    def entities(self) -> FrozenSet[str]:
+        """Return the entities whose states were accessed."""
+        return frozenset(self._entities)
+
+    @property
+    def domains(self) -> FrozenSet[str]:
+        """Return the domains whose states were iterated."""
+        return frozenset(getattr(self, "_domains", ()))
+
+    @property
+    def all_states(self) -> bool:
+        """Return if all states were iterated."""
+        return self._all_states
+
     @property
     def result(self) -> str:
         """Results of the template computation."""
@@ -170,6 +265,7 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._value_renderer = _SENTINEL
         self.hass = hass
 
     @property
@@ -186,8 +282,12 @@ class Template:
         if self._compiled_code is not None:
             return
 
+        env = self._env
+
         try:
-            self._compiled_code = self._env.compile(self.template)
+            self._compiled_code = _COMPILED_CODE.get(
+                (self.template, env.flavor), partial(env.compile, self.template)
+            )
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
@@ -264,13 +364,23 @@ class Template:
         if self._compiled is None:
             self._ensure_compiled()
 
+        if self._value_renderer is _SENTINEL:
+            self._value_renderer = _compile_value_renderer(self.template)
+
+        renderer = self._value_renderer
         variables = dict(variables or {})
         variables["value"] = value
 
-        try:
-            variables["value_json"] = json.loads(value)
-        except (ValueError, TypeError):
-            pass
+        if renderer is None or renderer.name == "value_json":
+            try:
+                variables["value_json"] = json.loads(value)
+            except (ValueError, TypeError):
+                pass
+
+        if renderer is not None:
+            result = renderer.render(variables)
+            if result is not None:
+                return result
 
         try:
             return self._compiled.render(variables).strip()
@@ -292,8 +402,11 @@ class Template:
 
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
+        self._compiled = env.template_cache.get(
+            self.template,
+            partial(
+                jinja2.Template.from_code, env, self._compiled_code, env.globals, None
+            ),
         )
 
         return self._compiled
@@ -315,6 +428,105 @@ class Template:
         return 'Template("' + self.template + '")'
 
 
+class ValueRenderer:
+    """Render a template that only looks up and converts a value.
+
+    Handles templates like {{ value_json.sensor.temperature | float }} with
+    the same result as jinja, as long as every key of the path exists.
+    """
+
+    def __init__(self, name, path, filters):
+        """Initialize the renderer."""
+        self.name = name
+        self.path = path
+        self.filters = filters
+
+    def render(self, variables):
+        """Return the rendered value, or None to render with jinja."""
+        value = variables.get(self.name, _SENTINEL)
+        if value is _SENTINEL:
+            return None
+
+        for is_attr, key in self.path:
+            value_type = type(value)
+            if is_attr:
+                # Jinja looks up keys which are not dict attributes
+                if value_type is not dict or key not in value:
+                    return None
+                value = value[key]
+            elif value_type is dict or value_type is list:
+                try:
+                    value = value[key]
+                except (LookupError, TypeError):
+                    return None
+            else:
+                return None
+
+        for func, args, kwargs in self.filters:
+            value = func(value, *args, **kwargs)
+
+        return str(value).strip()
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile_value_renderer(source: str) -> Optional[ValueRenderer]:
+    """Return a ValueRenderer for the template if it is simple enough."""
+    try:
+        body = _NO_HASS_ENV.parse(source).body
+    except jinja2.TemplateSyntaxError:
+        return None
+
+    if len(body) != 1 or not isinstance(body[0], nodes.Output):
+        return None
+
+    outputs = [
+        node
+        for node in body[0].nodes
+        if not isinstance(node, nodes.TemplateData) or node.data.strip()
+    ]
+    if len(outputs) != 1:
+        return None
+    node = outputs[0]
+
+    filters = []
+    while isinstance(node, nodes.Filter):
+        if node.name not in _VALUE_FILTERS or node.dyn_args or node.dyn_kwargs:
+            return None
+        if not all(isinstance(arg, nodes.Const) for arg in node.args) or not all(
+            isinstance(kwarg.value, nodes.Const) for kwarg in node.kwargs
+        ):
+            return None
+        filters.append(
+            (
+                _NO_HASS_ENV.filters[node.name],
+                tuple(arg.value for arg in node.args),
+                {kwarg.key: kwarg.value.value for kwarg in node.kwargs},
+            )
+        )
+        node = node.node
+
+    path = []
+    while isinstance(node, (nodes.Getattr, nodes.Getitem)):
+        if isinstance(node, nodes.Getattr):
+            if hasattr(dict, node.attr):
+                return None
+            path.append((True, node.attr))
+        elif (
+            isinstance(node.arg, nodes.Const)
+            and isinstance(node.arg.value, (str, int))
+            and not isinstance(node.arg.value, bool)
+        ):
+            path.append((False, node.arg.value))
+        else:
+            return None
+        node = node.node
+
+    if not isinstance(node, nodes.Name) or node.name not in ("value", "value_json"):
+        return None
+
+    return ValueRenderer(node.name, path[::-1], filters[::-1])
+
+
 class AllStates:
     """Class to expose all HA states as attributes."""
 
@@ -919,6 +1131,10 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__()
         self.hass = hass
+        # Environments with hass have more filters and compile differently
+        self.flavor = "no_hass" if hass is None else "hass"
+        # Templates bound to this environment by source
+        self.template_cache = CompiledCache(COMPILED_CACHE_SIZE)
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
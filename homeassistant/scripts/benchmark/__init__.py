@@ -2,13 +2,17 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from copy import copy
+from datetime import datetime, timedelta
+import json
 import logging
+import random
 from timeit import default_timer as timer
 from typing import Callable, Dict
 
 from homeassistant import core
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers.template import Template
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -138,6 +142,48 @@ async def async_million_state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def async_state_changed_helper_trackers(hass):
+    """Measure the cost of a state change by number of state trackers.
+
+    Each tracker follows its own entity, and state changes are fired for the
+    entity of the first tracker only.
+    """
+    events = 10 ** 4
+    total = 0
+
+    @core.callback
+    def listener(*args):
+        """Handle state change."""
+
+    for trackers in (1, 10, 100, 1000):
+        unsubs = [
+            hass.helpers.event.async_track_state_change(f"light.bench_{i}", listener)
+            for i in range(trackers)
+        ]
+        entity_id = "light.bench_0"
+        event_data = {
+            "entity_id": entity_id,
+            "old_state": core.State(entity_id, "off"),
+            "new_state": core.State(entity_id, "on"),
+        }
+
+        start = timer()
+
+        for _ in range(events):
+            hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+        await hass.async_block_till_done()
+        elapsed = timer() - start
+        total += elapsed
+        print(f"{trackers} trackers: {elapsed / events * 10 ** 6:.2f}us per event")
+
+        for unsub in unsubs:
+            unsub()
+
+    return total
+
+
 @benchmark
 @asyncio.coroutine
 def logbook_filtering_state(hass):
@@ -185,3 +231,120 @@ def _logbook_filtering(hass, last_changed, last_updated):
     list(logbook.humanify(None, yield_events(event)))
 
     return timer() - start
+
+
+@benchmark
+async def mqtt_value_template_fast_path(hass):
+    """Render a simple value template without jinja."""
+    return _render_value_template(hass, True)
+
+
+@benchmark
+async def mqtt_value_template_jinja(hass):
+    """Render a simple value template with jinja."""
+    return _render_value_template(hass, False)
+
+
+def _render_value_template(hass, fast_path):
+    """Time rendering a value template of a JSON payload."""
+    tpl = Template("{{ value_json.temperature | float | round(1) }}", hass)
+    payload = '{"temperature": "21.56", "humidity": 45}'
+    tpl.ensure_valid()
+
+    start = timer()
+
+    if fast_path:
+        for _ in range(10 ** 5):
+            tpl.async_render_with_possible_json_value(payload)
+    else:
+        for _ in range(10 ** 5):
+            tpl.async_render({"value": payload, "value_json": json.loads(payload)})
+
+    return timer() - start
+
+
+@benchmark
+async def filter_outlier_large_window(hass):
+    """Run a stream of states through an outlier filter with a large window."""
+    return _filter_stream([("outlier", {"window_size": 500, "radius": 2.0})])
+
+
+@benchmark
+async def filter_chain(hass):
+    """Run a stream of states through a chain of filters."""
+    return _filter_stream(
+        [
+            ("range", {"lower_bound": 10, "upper_bound": 30}),
+            ("outlier", {"window_size": 100, "radius": 2.0}),
+            ("lowpass", {"window_size": 1, "time_constant": 10}),
+            (
+                "time_simple_moving_average",
+                {"window_size": timedelta(seconds=5), "type": "last"},
+            ),
+            ("throttle", {"window_size": 2}),
+        ],
+        count=2 * 10 ** 4,
+    )
+
+
+def _filter_stream(filter_configs, count=10 ** 5):
+    """Time feeding a synthetic 10 Hz stream of states to a filter chain."""
+    from homeassistant.components.filter.sensor import FILTERS
+
+    entity_id = "sensor.filtered"
+    filters = [
+        FILTERS[name](entity=entity_id, precision=2, **config)
+        for name, config in filter_configs
+    ]
+
+    rnd = random.Random(0)
+    timestamp = dt_util.utcnow()
+    states = []
+    for _ in range(count):
+        value = rnd.gauss(20, 1) if rnd.random() > 0.01 else rnd.uniform(-100, 100)
+        states.append(core.State(entity_id, value, last_updated=timestamp))
+        timestamp += timedelta(milliseconds=100)
+
+    start = timer()
+
+    for state in states:
+        for filt in filters:
+            state = filt.filter_state(copy(state))
+            if filt.skip_processing:
+                break
+
+    return timer() - start
+
+
+@benchmark
+async def api_states(hass):
+    """Respond to /api/states for 3,000 entities, 10% changing in between."""
+    from homeassistant.auth.models import User
+    from homeassistant.components.api import APIStatesView
+
+    class MockRequest(dict):
+        """Request with the attributes used by the view."""
+
+        app = {"hass": hass}
+
+    request = MockRequest(hass_user=User(name="bench", perm_lookup=None, is_owner=True))
+    view = APIStatesView()
+    entity_ids = [f"sensor.benchmark_{index}" for index in range(3000)]
+    attributes = {
+        "unit_of_measurement": "°C",
+        "friendly_name": "Benchmark sensor",
+        "device_class": "temperature",
+    }
+    rnd = random.Random(0)
+
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, rnd.random(), attributes)
+
+    start = timer()
+
+    for _ in range(100):
+        for entity_id in rnd.sample(entity_ids, 300):
+            hass.states.async_set(entity_id, rnd.random(), attributes)
+        view.get(request)
+
+    return timer() - start
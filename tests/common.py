@@ -355,7 +355,8 @@ def mock_component(hass, component):
 def mock_registry(hass, mock_entries=None):
     """Mock the Entity Registry."""
     registry = entity_registry.EntityRegistry(hass)
-    registry.entities = mock_entries or OrderedDict()
+    registry.entities = entity_registry.EntityRegistryItems()
+    registry.entities.update(mock_entries or {})
 
     hass.data[entity_registry.DATA_REGISTRY] = registry
     return registry
@@ -373,7 +374,8 @@ def mock_area_registry(hass, mock_entries=None):
 def mock_device_registry(hass, mock_entries=None):
     """Mock the Device Registry."""
     registry = device_registry.DeviceRegistry(hass)
-    registry.devices = mock_entries or OrderedDict()
+    registry.devices = device_registry.DeviceRegistryItems()
+    registry.devices.update(mock_entries or {})
 
     hass.data[device_registry.DATA_REGISTRY] = registry
     return registry
@@ -813,7 +815,7 @@ def mock_restore_cache(hass, states):
 
     last_states = {}
     for state in states:
-        restored_state = state.as_dict()
+        restored_state = dict(state.as_dict())
         restored_state["attributes"] = json.loads(
             json.dumps(restored_state["attributes"], cls=JSONEncoder)
         )
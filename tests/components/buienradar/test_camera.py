@@ -1,7 +1,9 @@
 """The tests for generic camera component."""
 import asyncio
+from unittest.mock import patch
 
 from aiohttp.client_exceptions import ClientResponseError
+import pytest
 
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
@@ -17,6 +19,13 @@ def radar_map_url(dim: int = 512) -> str:
     )
 
 
+@pytest.fixture(autouse=True)
+def no_still_frame_ttl():
+    """Leave the caching of images to the camera."""
+    with patch("homeassistant.components.camera.broker.STILL_FRAME_TTL", 0):
+        yield
+
+
 async def test_fetching_url_and_caching(aioclient_mock, hass, hass_client):
     """Test that it fetches the given url."""
     aioclient_mock.get(radar_map_url(), text="hello world")
@@ -328,3 +328,70 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record_service.called
+
+
+async def test_frame_broker_shares_fetch(hass, image_mock_url):
+    """Test concurrent requests share a single fetch of the image."""
+    camera_entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    release = asyncio.Event()
+    calls = 0
+
+    async def camera_image():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"Test"
+
+    with patch.object(camera_entity, "async_camera_image", camera_image):
+        fetches = asyncio.gather(
+            camera.async_get_image(hass, "camera.demo_camera"),
+            camera.async_get_image(hass, "camera.demo_camera"),
+            camera_entity.frame_broker.async_get_frame(),
+        )
+        await asyncio.sleep(0)
+        release.set()
+        first, second, frame = await fetches
+
+        assert calls == 1
+        assert first.content is second.content is frame
+
+        # Frames of still requests are kept briefly
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content is frame
+        assert calls == 1
+
+
+async def test_frame_broker_keeps_stream_frames(hass, image_mock_url):
+    """Test frames fetched for streams are kept for the stream interval."""
+    camera_entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    images = [b"First", b"Second"]
+
+    async def camera_image():
+        return images.pop(0)
+
+    with patch.object(camera_entity, "async_camera_image", camera_image):
+        broker = camera_entity.frame_broker
+        assert await broker.async_get_frame(0.05) == b"First"
+        assert await broker.async_get_frame(0.05) == b"First"
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content == b"First"
+
+        await asyncio.sleep(0.06)
+        assert await broker.async_get_frame(0.05) == b"Second"
+        assert not images
+
+
+async def test_frame_broker_fetch_error(hass, image_mock_url):
+    """Test an error is passed to the waiting clients and not kept."""
+    camera_entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+
+    with patch.object(
+        camera_entity, "async_camera_image", side_effect=asyncio.TimeoutError
+    ), pytest.raises(HomeAssistantError):
+        await camera.async_get_image(hass, "camera.demo_camera")
+
+    with patch.object(
+        camera_entity, "async_camera_image", return_value=mock_coro(b"Test")
+    ):
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+    assert image.content == b"Test"
@@ -1,5 +1,8 @@
 """The test for the data filter sensor platform."""
+from collections import deque
 from datetime import timedelta
+import random
+import statistics
 import unittest
 from unittest.mock import patch
 
@@ -22,6 +25,16 @@ from tests.common import (
 )
 
 
+def mock_load_states(fake_states):
+    """Return a replacement loading the fake states of an entity."""
+
+    async def load_states(hass, entity_id, **kwargs):
+        """Return the fake states."""
+        return fake_states.get(entity_id, [])
+
+    return load_states
+
+
 class TestFilterSensor(unittest.TestCase):
     """Test the Data Filter sensor."""
 
@@ -117,25 +130,21 @@ class TestFilterSensor(unittest.TestCase):
             }
 
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
-            return_value=fake_states,
+            "homeassistant.components.filter.sensor.async_load_states",
+            side_effect=mock_load_states(fake_states),
         ):
-            with patch(
-                "homeassistant.components.history.get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
-
-                for value in self.values:
-                    self.hass.states.set(config["sensor"]["entity_id"], value.state)
-                    self.hass.block_till_done()
-
-                state = self.hass.states.get("sensor.test")
-                if missing:
-                    assert "18.05" == state.state
-                else:
-                    assert "17.05" == state.state
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
+
+            for value in self.values:
+                self.hass.states.set(config["sensor"]["entity_id"], value.state)
+                self.hass.block_till_done()
+
+            state = self.hass.states.get("sensor.test")
+            if missing:
+                assert "18.05" == state.state
+            else:
+                assert "17.05" == state.state
 
     def test_chain_history_missing(self):
         """Test if filter chaining works when recorder is enabled but the source is not recorded."""
@@ -165,19 +174,15 @@ class TestFilterSensor(unittest.TestCase):
             ]
         }
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
-            return_value=fake_states,
+            "homeassistant.components.filter.sensor.async_load_states",
+            side_effect=mock_load_states(fake_states),
         ):
-            with patch(
-                "homeassistant.components.history.get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
 
-                self.hass.block_till_done()
-                state = self.hass.states.get("sensor.test")
-                assert "18.0" == state.state
+            self.hass.block_till_done()
+            state = self.hass.states.get("sensor.test")
+            assert "18.0" == state.state
 
     def test_outlier(self):
         """Test if outlier filter works."""
@@ -208,6 +213,31 @@ class TestFilterSensor(unittest.TestCase):
             filtered = filt.filter_state(state)
         assert 21 == filtered.state
 
+    def test_outlier_window_median(self):
+        """Test the outlier filter median follows the sliding window."""
+        rng = random.Random(42)
+        filt = OutlierFilter(window_size=10, precision=2, entity=None, radius=5.0)
+        window = deque(maxlen=10)
+        for _ in range(200):
+            value = rng.choice([rng.gauss(20, 2), rng.uniform(-100, 100)])
+            state = ha.State("sensor.test_monitored", value)
+            median = statistics.median(window) if window else 0
+            expected = value
+            if len(window) == 10 and abs(value - median) > 5.0:
+                expected = median
+            window.append(value)
+
+            assert filt.filter_state(state).state == round(expected, 2)
+            assert filt._sorted_states == sorted(window)
+
+    def test_outlier_window_size_zero(self):
+        """Test the outlier filter with an empty window."""
+        filt = OutlierFilter(window_size=0, precision=2, entity=None, radius=4.0)
+        for state in self.values:
+            filtered = filt.filter_state(state)
+            assert filtered.state == 0
+        assert filt._sorted_states == []
+
     def test_precision_zero(self):
         """Test if precision of zero returns an integer."""
         filt = LowPassFilter(window_size=10, precision=0, entity=None, time_constant=10)
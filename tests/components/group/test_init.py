@@ -2,7 +2,7 @@
 # pylint: disable=protected-access
 from collections import OrderedDict
 import unittest
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 import homeassistant.components.group as group
 from homeassistant.const import (
@@ -16,6 +16,7 @@ from homeassistant.const import (
     STATE_ON,
     STATE_UNKNOWN,
 )
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component, setup_component
 
 from tests.common import assert_setup_component, get_test_home_assistant
@@ -415,7 +416,13 @@ class TestComponentsGroup(unittest.TestCase):
             "group.second_group",
             "group.test_group",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 3
+        assert sorted(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [
+            "hello.world",
+            "light.bowl",
+            "sensor.happy",
+            "test.one",
+            "test.two",
+        ]
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -436,7 +443,11 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 2
+        assert sorted(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == [
+            "light.bowl",
+            "test.one",
+            "test.two",
+        ]
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
@@ -546,3 +557,66 @@ async def test_service_group_set_group_remove_group(hass):
 
     group_state = hass.states.get("group.user_test_group")
     assert group_state is None
+
+
+async def test_groups_with_entity(hass):
+    """Test the groups of an entity follow changes of the groups."""
+    with assert_setup_component(0, "group"):
+        await async_setup_component(hass, "group", {"group": {}})
+
+    assert group.groups_with_entity(hass, "light.bowl") == []
+
+    common.async_set_group(hass, "lights", entity_ids=["light.bowl", "light.ceiling"])
+    common.async_set_group(hass, "bowl", entity_ids=["light.bowl"])
+    await hass.async_block_till_done()
+
+    assert group.groups_with_entity(hass, "light.bowl") == [
+        "group.lights",
+        "group.bowl",
+    ]
+    assert group.groups_with_entity(hass, "light.ceiling") == ["group.lights"]
+
+    common.async_set_group(hass, "lights", entity_ids=["light.ceiling"])
+    await hass.async_block_till_done()
+
+    assert group.groups_with_entity(hass, "light.bowl") == ["group.bowl"]
+
+    common.async_remove(hass, "lights")
+    await hass.async_block_till_done()
+
+    assert group.groups_with_entity(hass, "light.ceiling") == []
+
+
+async def test_member_changes_update_counts(hass):
+    """Test member changes update the group without reading all members."""
+    for index in range(10):
+        hass.states.async_set(f"light.light_{index}", STATE_OFF)
+    any_group = await group.Group.async_create_group(
+        hass, "any_lights", [f"light.light_{index}" for index in range(10)]
+    )
+    all_group = await group.Group.async_create_group(
+        hass, "all_lights", [f"light.light_{index}" for index in range(10)], mode=True
+    )
+
+    with patch.object(
+        group.Group, "_tracking_states", new_callable=PropertyMock
+    ) as mock_tracking_states:
+        for index in range(10):
+            hass.states.async_set(f"light.light_{index}", STATE_ON)
+            await hass.async_block_till_done()
+
+            assert hass.states.get(any_group.entity_id).state == STATE_ON
+            assert hass.states.get(all_group.entity_id).state == (
+                STATE_ON if index == 9 else STATE_OFF
+            )
+
+        hass.states.async_remove("light.light_0")
+        await hass.async_block_till_done()
+        assert hass.states.get(all_group.entity_id).state == STATE_ON
+
+        hass.states.async_set("light.light_1", STATE_OFF, {ATTR_ASSUMED_STATE: True})
+        await hass.async_block_till_done()
+        assert hass.states.get(all_group.entity_id).state == STATE_OFF
+        assert hass.states.get(any_group.entity_id).attributes[ATTR_ASSUMED_STATE]
+
+        assert not mock_tracking_states.called
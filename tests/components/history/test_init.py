@@ -4,6 +4,10 @@ from datetime import timedelta
 import unittest
 from unittest.mock import patch, sentinel
 
+from aiohttp import ClientPayloadError
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
 from homeassistant.components import history, recorder
 import homeassistant.core as ha
 from homeassistant.setup import async_setup_component, setup_component
@@ -650,3 +654,146 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def test_fetch_period_api_statistics(hass, hass_client):
+    """Test the fetch period view returning statistics."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    for value in ("10", "20"):
+        hass.states.async_set(
+            "sensor.power", value, {"unit_of_measurement": "W"}, force_update=True
+        )
+        await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"statistics": "5minute"},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert len(result) == 1
+    assert len(result[0]) == 1
+    assert result[0][0]["entity_id"] == "sensor.power"
+    assert result[0][0]["min"] == 10
+    assert result[0][0]["max"] == 20
+    assert result[0][0]["mean"] == 15
+
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"statistics": "week"},
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the fetch period view streaming states per entity."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 20})
+    hass.states.async_set("sensor.power", "10")
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get("/api/history/period/{}".format(start.isoformat()))
+    assert response.status == 200
+    expected = await response.json()
+
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()), params={"stream": ""}
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert sorted(result, key=lambda states: states[0]["entity_id"]) == sorted(
+        expected, key=lambda states: states[0]["entity_id"]
+    )
+
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"stream": "", "compact": "", "filter_entity_id": "light.kitchen"},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert len(result) == 1
+    assert result[0]["entity_id"] == "light.kitchen"
+    assert result[0]["state"] == ["on", "off", "on"]
+    assert result[0]["attributes"] == [{"brightness": 10}, None, {"brightness": 20}]
+    assert len(result[0]["last_updated"]) == 3
+
+
+async def test_fetch_period_api_stream_empty(hass, hass_client):
+    """Test streaming a period without states."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        "/api/history/period/{}".format(dt_util.utcnow().isoformat()),
+        params={"stream": "", "filter_entity_id": "light.kitchen"},
+    )
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_stream_error(hass, hass_client):
+    """Test a failed read does not close the streamed array."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    def stream_and_fail(hass, send, *args):
+        """Send the states of one entity, then fail."""
+        send('[{"entity_id": "light.kitchen"}]')
+        raise SQLAlchemyError("database is locked")
+
+    client = await hass_client()
+    with patch.object(history, "stream_significant_states", stream_and_fail):
+        response = await client.get(
+            "/api/history/period/{}".format(dt_util.utcnow().isoformat()),
+            params={"stream": ""},
+        )
+        assert response.status == 200
+        body = b""
+        with pytest.raises(ClientPayloadError):
+            async for data in response.content.iter_any():
+                body += data
+
+    assert body == b'[[{"entity_id": "light.kitchen"}]'
+
+
+async def test_fetch_period_api_compact(hass, hass_client):
+    """Test the fetch period view returning compact states."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "20", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        "/api/history/period/{}".format(start.isoformat()),
+        params={"compact": "", "filter_entity_id": "sensor.power"},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert result == [
+        {
+            "entity_id": "sensor.power",
+            "last_updated": result[0]["last_updated"],
+            "state": ["10", "20"],
+            "attributes": [{"unit_of_measurement": "W"}, None],
+        }
+    ]
+    assert result[0]["last_updated"][-1] == dt_util.as_timestamp(
+        hass.states.get("sensor.power").last_updated
+    )
@@ -1,5 +1,6 @@
 """The test for the History Statistics sensor platform."""
 # pylint: disable=protected-access
+import asyncio
 from datetime import datetime, timedelta
 import unittest
 from unittest.mock import patch
@@ -136,21 +137,67 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3._type == "count"
         assert sensor4._type == "ratio"
 
+        async def mock_load_states(hass, entity_id, **kwargs):
+            """Return the fake states."""
+            return fake_states.get(entity_id, [])
+
+        async def update_sensors():
+            """Update the sensors."""
+            for sensor in (sensor1, sensor2, sensor3, sensor4):
+                await sensor.async_update()
+
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
-            return_value=fake_states,
+            "homeassistant.components.history_stats.sensor.async_load_states",
+            side_effect=mock_load_states,
         ):
-            with patch("homeassistant.components.history.get_state", return_value=None):
-                sensor1.update()
-                sensor2.update()
-                sensor3.update()
-                sensor4.update()
+            asyncio.run_coroutine_threadsafe(update_sensors(), self.hass.loop).result()
 
         assert sensor1.state == 0.5
         assert sensor2.state is None
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_on_at_start(self):
+        """Test the state at start is not counted as a change."""
+        t1 = dt_util.utcnow() - timedelta(minutes=30)
+        t2 = dt_util.utcnow() - timedelta(minutes=10)
+
+        # Start               t1        t2        End
+        # |-------30min-------|--20min--|--10min--|
+        # |---------on--------|---off---|---on----|
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor1 = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "test"
+        )
+        sensor2 = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "time", "Test"
+        )
+
+        async def mock_load_states(hass, entity_id, start_time, **kwargs):
+            """Return the state at start and the changes."""
+            return [
+                ha.State(entity_id, "on", last_changed=start_time),
+                ha.State(entity_id, "off", last_changed=t1),
+                ha.State(entity_id, "on", last_changed=t2),
+            ]
+
+        async def update_sensors():
+            """Update the sensors."""
+            for sensor in (sensor1, sensor2):
+                await sensor.async_update()
+
+        with patch(
+            "homeassistant.components.history_stats.sensor.async_load_states",
+            side_effect=mock_load_states,
+        ):
+            asyncio.run_coroutine_threadsafe(update_sensors(), self.hass.loop).result()
+
+        assert sensor1.state == 1
+        assert sensor2.state == 0.67
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
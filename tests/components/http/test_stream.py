@@ -0,0 +1,61 @@
+"""Test streaming JSON arrays."""
+from aiohttp import ClientPayloadError, web
+import pytest
+
+from homeassistant.components.http.stream import async_stream_json_array
+
+
+async def get_client(hass, aiohttp_client, produce):
+    """Generate a client that streams the chunks of produce."""
+    app = web.Application()
+    app["hass"] = hass
+
+    async def handler(request):
+        """Stream the chunks."""
+        return await async_stream_json_array(request, produce)
+
+    app.router.add_get("/", handler)
+    return await aiohttp_client(app)
+
+
+async def test_stream_json_array(hass, aiohttp_client):
+    """Test the chunks are written as one array."""
+
+    def produce(send):
+        """Send two chunks."""
+        send('{"a": 1}, {"b": 2}')
+        send('{"c": 3}')
+
+    client = await get_client(hass, aiohttp_client, produce)
+    resp = await client.get("/")
+    assert resp.status == 200
+    assert resp.content_type == "application/json"
+    assert await resp.json() == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+
+async def test_stream_empty_json_array(hass, aiohttp_client):
+    """Test an empty array is written without chunks."""
+    client = await get_client(hass, aiohttp_client, lambda send: None)
+    resp = await client.get("/")
+    assert resp.status == 200
+    assert await resp.json() == []
+
+
+async def test_stream_json_array_error(hass, aiohttp_client):
+    """Test the array is left open when the producer fails."""
+
+    def produce(send):
+        """Send a chunk, then fail."""
+        send('{"a": 1}')
+        raise ValueError("failed")
+
+    client = await get_client(hass, aiohttp_client, produce)
+    resp = await client.get("/")
+    assert resp.status == 200
+
+    body = b""
+    with pytest.raises(ClientPayloadError):
+        async for data in resp.content.iter_any():
+            body += data
+
+    assert body == b'[{"a": 1}'
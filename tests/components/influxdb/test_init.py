@@ -1,8 +1,12 @@
 """The tests for the InfluxDB component."""
 import datetime
+import gzip
+import threading
 import unittest
 from unittest import mock
 
+from influxdb.line_protocol import make_lines
+
 import homeassistant.components.influxdb as influxdb
 from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON, STATE_STANDBY
 from homeassistant.setup import setup_component
@@ -10,6 +14,22 @@ from homeassistant.setup import setup_component
 from tests.common import get_test_home_assistant
 
 
+def _lines(body):
+    """Return the points of a body encoded in line protocol.
+
+    Numeric fields are always written as floats.
+    """
+    lines = []
+    for point in body:
+        fields = {
+            key: float(value) if isinstance(value, int) else value
+            for key, value in point["fields"].items()
+        }
+        point = dict(point, fields=fields)
+        lines.append(make_lines({"points": [point]}).rstrip("\n"))
+    return lines
+
+
 @mock.patch("homeassistant.components.influxdb.InfluxDBClient")
 @mock.patch(
     "homeassistant.components.influxdb.InfluxThread.batch_timeout",
@@ -145,7 +165,9 @@ class TestInfluxDB(unittest.TestCase):
             self.hass.data[influxdb.DOMAIN].block_till_done()
 
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == mock.call(
+                _lines(body), protocol="line"
+            )
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_no_units(self, mock_client):
@@ -176,7 +198,9 @@ class TestInfluxDB(unittest.TestCase):
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == mock.call(
+                _lines(body), protocol="line"
+            )
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_inf(self, mock_client):
@@ -203,7 +227,9 @@ class TestInfluxDB(unittest.TestCase):
         self.handler_method(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == mock.call(
+            _lines(body), protocol="line"
+        )
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_states(self, mock_client):
@@ -232,7 +258,7 @@ class TestInfluxDB(unittest.TestCase):
             if state_state == 1:
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -264,7 +290,7 @@ class TestInfluxDB(unittest.TestCase):
             if entity_id == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -296,7 +322,7 @@ class TestInfluxDB(unittest.TestCase):
             if domain == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -338,7 +364,7 @@ class TestInfluxDB(unittest.TestCase):
             if entity_id == "included":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -380,7 +406,7 @@ class TestInfluxDB(unittest.TestCase):
             if domain == "fake":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -422,7 +448,7 @@ class TestInfluxDB(unittest.TestCase):
             if domain == "fake":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -450,7 +476,7 @@ class TestInfluxDB(unittest.TestCase):
             if entity_id == "one":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -504,7 +530,9 @@ class TestInfluxDB(unittest.TestCase):
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == mock.call(
+                _lines(body), protocol="line"
+            )
             mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_default_measurement(self, mock_client):
@@ -544,7 +572,7 @@ class TestInfluxDB(unittest.TestCase):
             if entity_id == "ok":
                 assert mock_client.return_value.write_points.call_count == 1
                 assert mock_client.return_value.write_points.call_args == mock.call(
-                    body
+                    _lines(body), protocol="line"
                 )
             else:
                 assert not mock_client.return_value.write_points.called
@@ -584,7 +612,9 @@ class TestInfluxDB(unittest.TestCase):
         self.handler_method(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == mock.call(
+            _lines(body), protocol="line"
+        )
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_tags_attributes(self, mock_client):
@@ -625,7 +655,9 @@ class TestInfluxDB(unittest.TestCase):
         self.handler_method(event)
         self.hass.data[influxdb.DOMAIN].block_till_done()
         assert mock_client.return_value.write_points.call_count == 1
-        assert mock_client.return_value.write_points.call_args == mock.call(body)
+        assert mock_client.return_value.write_points.call_args == mock.call(
+            _lines(body), protocol="line"
+        )
         mock_client.return_value.write_points.reset_mock()
 
     def test_event_listener_component_override_measurement(self, mock_client):
@@ -676,7 +708,9 @@ class TestInfluxDB(unittest.TestCase):
             self.handler_method(event)
             self.hass.data[influxdb.DOMAIN].block_till_done()
             assert mock_client.return_value.write_points.call_count == 1
-            assert mock_client.return_value.write_points.call_args == mock.call(body)
+            assert mock_client.return_value.write_points.call_args == mock.call(
+                _lines(body), protocol="line"
+            )
             mock_client.return_value.write_points.reset_mock()
 
     def test_scheduled_write(self, mock_client):
@@ -710,7 +744,9 @@ class TestInfluxDB(unittest.TestCase):
             assert mock_sleep.called
         json_data = mock_client.return_value.write_points.call_args[0][0]
         assert mock_client.return_value.write_points.call_count == 2
-        mock_client.return_value.write_points.assert_called_with(json_data)
+        mock_client.return_value.write_points.assert_called_with(
+            json_data, protocol="line"
+        )
 
         # Write works again
         mock_client.return_value.write_points.side_effect = None
@@ -750,3 +786,91 @@ class TestInfluxDB(unittest.TestCase):
             assert mock_client.return_value.write_points.call_count == 0
 
         mock_client.return_value.write_points.reset_mock()
+
+    def test_write_line_protocol(self, mock_client):
+        """Test events are written in line protocol."""
+        self._setup(mock_client)
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="fake.entity",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+        self.handler_method(event)
+        self.hass.data[influxdb.DOMAIN].block_till_done()
+
+        assert mock_client.return_value.write_points.call_args == mock.call(
+            ["fake.entity,domain=fake,entity_id=entity value=1.0 12345"],
+            protocol="line",
+        )
+
+        assert self.hass.data[influxdb.DOMAIN].backlog == 0
+
+    def test_write_gzip(self, mock_client):
+        """Test request bodies are compressed with gzip."""
+        self._setup(mock_client, gzip=True, database="db")
+
+        for object_id in ("one", "two"):
+            state = mock.MagicMock(
+                state=1,
+                domain="fake",
+                entity_id=f"fake.{object_id}",
+                object_id=object_id,
+                attributes={},
+            )
+            event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+            self.handler_method(event)
+        self.hass.data[influxdb.DOMAIN].block_till_done()
+
+        assert not mock_client.return_value.write_points.called
+        request = mock_client.return_value.request
+        assert request.call_count == 1
+        kwargs = request.call_args[1]
+        assert kwargs["url"] == "write"
+        assert kwargs["params"] == {"db": "db"}
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert gzip.decompress(kwargs["data"]) == (
+            b"fake.one,domain=fake,entity_id=one value=1.0 12345\n"
+            b"fake.two,domain=fake,entity_id=two value=1.0 12345\n"
+        )
+
+    def test_adaptive_batch_size(self, mock_client):
+        """Test the batch size grows with the queue depth."""
+        self._setup(mock_client)
+        instance = self.hass.data[influxdb.DOMAIN]
+
+        state = mock.MagicMock(
+            state=1,
+            domain="fake",
+            entity_id="fake.entity",
+            object_id="entity",
+            attributes={},
+        )
+        event = mock.MagicMock(data={"new_state": state}, time_fired=12345)
+
+        # Hold the writer in its first write while the queue fills up
+        with mock.patch.object(instance, "write_to_influxdb") as mock_write:
+            first_write = threading.Event()
+            resume = threading.Event()
+
+            def block_first_write(lines):
+                if not first_write.is_set():
+                    first_write.set()
+                    resume.wait(5)
+
+            mock_write.side_effect = block_first_write
+
+            self.handler_method(event)
+            assert first_write.wait(5)
+            for _ in range(influxdb.BATCH_BUFFER_SIZE * 3):
+                self.handler_method(event)
+            resume.set()
+            instance.block_till_done()
+
+        assert [len(call[0][0]) for call in mock_write.call_args_list] == [
+            1,
+            influxdb.BATCH_BUFFER_SIZE * 3,
+        ]
@@ -3,6 +3,7 @@
 from datetime import datetime, timedelta
 import logging
 import unittest
+from unittest.mock import patch
 
 import pytest
 import voluptuous as vol
@@ -120,6 +121,68 @@ class TestComponentLogbook(unittest.TestCase):
 
         assert 0 == len(calls)
 
+    def test_get_events_filtered_in_database(self):
+        """Test continuous sensors and filtered entities are not read."""
+        self.hass.states.set("switch.a", STATE_OFF)
+        self.hass.states.set("sensor.temp", 10, {"unit_of_measurement": "C"})
+        self.hass.states.set("switch.b", STATE_OFF)
+        self.hass.states.set("switch.a", STATE_ON)
+        self.hass.states.set("sensor.temp", 20, {"unit_of_measurement": "C"})
+        self.hass.states.set("switch.b", STATE_ON)
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        known_entities = self.hass.data[logbook.DATA_KNOWN_ENTITIES]
+        assert not known_entities.loaded
+
+        start = dt_util.utcnow() - timedelta(hours=1)
+        end = dt_util.utcnow() + timedelta(hours=1)
+
+        with patch.object(
+            logbook, "_keep_event", wraps=logbook._keep_event
+        ) as keep_event:
+            entries = logbook._get_events(self.hass, {}, start, end)
+
+        assert [entry["entity_id"] for entry in entries] == ["switch.a", "switch.b"]
+        assert all(
+            call[0][0].data.get("entity_id") != "sensor.temp"
+            for call in keep_event.call_args_list
+        )
+
+        config = logbook.CONFIG_SCHEMA(
+            {
+                logbook.DOMAIN: {
+                    logbook.CONF_EXCLUDE: {logbook.CONF_ENTITIES: ["switch.b"]}
+                }
+            }
+        )
+        entries = logbook._get_events(self.hass, config[logbook.DOMAIN], start, end)
+
+        assert [entry["entity_id"] for entry in entries] == ["switch.a"]
+        assert known_entities.loaded
+        assert {"switch.a", "switch.b", "sensor.temp"} <= known_entities.entity_ids
+
+    def test_get_events_sensor_unit_changed(self):
+        """Test sensor states without a unit are read when it has one now."""
+        start = dt_util.utcnow().replace(minute=0, second=0) - timedelta(hours=2)
+
+        for minutes, unit in ((1, None), (31, "C"), (61, None), (91, "C")):
+            with patch(
+                "homeassistant.core.dt_util.utcnow",
+                return_value=start + timedelta(minutes=minutes),
+            ):
+                self.hass.states.set(
+                    "sensor.temp", minutes, {"unit_of_measurement": unit}
+                )
+                self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        end = dt_util.utcnow() + timedelta(hours=1)
+        entries = logbook._get_events(self.hass, {}, start, end)
+
+        # The first state is not shown, like any new entity
+        assert [entry["message"] for entry in entries] == ["changed to 61"]
+
     def test_humanify_filter_sensor(self):
         """Test humanify filter too frequent sensor values."""
         entity_id = "sensor.bla"
@@ -1484,3 +1547,30 @@ async def test_humanify_script_started_event(hass):
     assert event2["domain"] == "script"
     assert event2["message"] == "started"
     assert event2["entity_id"] == "script.bye"
+
+
+async def test_logbook_view_stream(hass, hass_client):
+    """Test the logbook view writes entries in chunks."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+
+    for index in range(3):
+        hass.states.async_set(f"switch.test_{index}", STATE_OFF)
+        hass.states.async_set(f"switch.test_{index}", STATE_ON)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    start = dt_util.utcnow() - timedelta(hours=1)
+
+    with patch.object(logbook, "STREAM_CHUNK_SIZE", 2):
+        response = await client.get(f"/api/logbook/{start.isoformat()}")
+
+    assert response.status == 200
+    json = await response.json()
+    assert [entry["entity_id"] for entry in json] == [
+        "switch.test_0",
+        "switch.test_1",
+        "switch.test_2",
+    ]
+    assert list(json[0]) == sorted(json[0])
@@ -1,5 +1,7 @@
 """The tests for the MQTT component."""
+import asyncio
 import ssl
+import time
 import unittest
 from unittest import mock
 
@@ -14,7 +16,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
 )
 from homeassistant.core import callback
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.setup import async_setup_component
 
 from tests.common import (
@@ -317,6 +319,46 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
         assert len(self.calls) == 1
 
+    def test_subscriptions_share_decoded_message(self):
+        """Test the payload is decoded once for subscriptions on a topic."""
+        mqtt.subscribe(self.hass, "test-topic", self.record_calls)
+        mqtt.subscribe(self.hass, "test-topic/#", self.record_calls)
+        mqtt.subscribe(self.hass, "+", self.record_calls, encoding=None)
+
+        fire_mqtt_message(self.hass, "test-topic", "test-payload")
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 3
+        decoded = [call[0] for call in self.calls if call[0].payload == "test-payload"]
+        assert len(decoded) == 2
+        assert decoded[0] is decoded[1]
+        assert [call[0].payload for call in self.calls].count(b"test-payload") == 1
+
+    def test_subscribe_topic_unsubscribe_one_of_many(self):
+        """Test unsubscribing one of several subscriptions of a topic."""
+        unsub_first = mqtt.subscribe(self.hass, "test-topic/+/on", self.record_calls)
+        unsub_second = mqtt.subscribe(self.hass, "test-topic/+/on", self.record_calls)
+
+        unsub_first()
+
+        fire_mqtt_message(self.hass, "test-topic/bier/on", "test-payload")
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 1
+        assert not self.hass.data["mqtt"]._mqttc.unsubscribe.called
+
+        unsub_second()
+
+        fire_mqtt_message(self.hass, "test-topic/bier/on", "test-payload")
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 1
+        assert not list(
+            self.hass.data["mqtt"]._matching_subscriptions.iter_match(
+                "test-topic/bier/on"
+            )
+        )
+
     def test_subscribe_topic(self):
         """Test the subscription of a topic."""
         unsub = mqtt.subscribe(self.hass, "test-topic", self.record_calls)
@@ -574,9 +616,9 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
 
         expected = [
-            mock.call("test/state", 2),
-            mock.call("test/state", 0),
-            mock.call("test/state", 1),
+            mock.call([("test/state", 2)]),
+            mock.call([("test/state", 0)]),
+            mock.call([("test/state", 1)]),
         ]
         assert self.hass.data["mqtt"]._mqttc.subscribe.mock_calls == expected
 
@@ -588,7 +630,7 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.data["mqtt"]._mqtt_on_connect(None, None, None, 0)
         self.hass.block_till_done()
 
-        expected.append(mock.call("test/state", 1))
+        expected.append(mock.call([("test/state", 1)]))
         assert self.hass.data["mqtt"]._mqttc.subscribe.mock_calls == expected
 
 
@@ -750,9 +792,152 @@ async def test_mqtt_subscribes_topics_on_connect(hass):
 
     assert mqtt_client.disconnect.call_count == 0
 
-    expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    assert len(hass.add_job.mock_calls) == 1
+    queue_subscriptions, subscriptions = hass.add_job.mock_calls[0][1]
+    assert queue_subscriptions == hass.data["mqtt"]._async_queue_subscriptions
+
+    await queue_subscriptions(subscriptions)
+
+    assert mqtt_client.subscribe.mock_calls[-1] == mock.call(
+        [("topic/test", 0), ("home/sensor", 2), ("still/pending", 1)]
+    )
+
+
+async def test_mqtt_coalesces_subscriptions(hass):
+    """Test subscriptions made together are sent in one request."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_client.subscribe.reset_mock()
+    hass.data["mqtt"].connected = True
+
+    unsubs = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/one", None),
+        mqtt.async_subscribe(hass, "test/two", None, 1),
+        mqtt.async_subscribe(hass, "test/two", None, 2),
+    )
+    await hass.async_block_till_done()
+
+    assert mqtt_client.subscribe.mock_calls == [
+        mock.call([("test/one", 0), ("test/two", 2)])
+    ]
+
+    for unsub in unsubs:
+        unsub()
+    await hass.async_block_till_done()
+
+    assert len(mqtt_client.unsubscribe.mock_calls) == 1
+    assert sorted(mqtt_client.unsubscribe.mock_calls[0][1][0]) == [
+        "test/one",
+        "test/two",
+    ]
+
+
+async def test_mqtt_subscribe_error(hass):
+    """Test all subscribers of a failed request receive the error."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_client.subscribe.reset_mock()
+    mqtt_client.subscribe.return_value = (4, 0)
+
+    results = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/one", None),
+        mqtt.async_subscribe(hass, "test/two", None),
+        return_exceptions=True,
+    )
+
+    assert len(mqtt_client.subscribe.mock_calls) == 1
+    assert all(isinstance(result, HomeAssistantError) for result in results)
+    assert hass.data["mqtt"]._pending_subscriptions == {"test/one": 0, "test/two": 0}
+
+
+async def test_mqtt_subscribe_error_queues_unsent_topics(hass, caplog):
+    """Test topics not sent because of an error are sent with the next request."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_client.subscribe.reset_mock()
+    mqtt_client.subscribe.side_effect = [(0, 0), (4, 0)]
+    mqtt_client.unsubscribe.return_value = (0, 0)
+    mqtt_data = hass.data["mqtt"]
+
+    with mock.patch("homeassistant.components.mqtt.MAX_TOPICS_PER_REQUEST", 1):
+        mqtt_data._async_queue_subscriptions(
+            [("test/one", 0), ("test/two", 1), ("test/three", 0)]
+        )
+        await hass.async_block_till_done()
+
+    assert mqtt_client.subscribe.mock_calls == [
+        mock.call([("test/one", 0)]),
+        mock.call([("test/two", 1)]),
+    ]
+    assert "Unable to update MQTT subscriptions" in caplog.text
+    assert "HomeAssistantError" not in caplog.text
+
+    mqtt_client.subscribe.reset_mock()
+    mqtt_client.subscribe.side_effect = None
+    mqtt_client.subscribe.return_value = (0, 0)
+
+    await mqtt_data._async_queue_unsubscribe("test/three")
+
+    assert mqtt_client.subscribe.mock_calls == [
+        mock.call([("test/two", 1)]),
+    ]
+    assert mqtt_client.unsubscribe.mock_calls[-1] == mock.call(["test/three"])
+
+
+async def test_mqtt_publishes_in_order(hass):
+    """Test queued messages are published in order by one job."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_data = hass.data["mqtt"]
+
+    for idx in range(3):
+        await mqtt_data.async_publish("test/topic", str(idx), 0, False)
+
+    assert mqtt_data.pending_publishes <= 3
+
+    await hass.async_block_till_done()
+
+    assert mqtt_data.pending_publishes == 0
+    assert mqtt_client.publish.mock_calls == [
+        mock.call("test/topic", "0", 0, False),
+        mock.call("test/topic", "1", 0, False),
+        mock.call("test/topic", "2", 0, False),
+    ]
+
+
+async def test_mqtt_disconnect_publishes_queued_messages(hass):
+    """Test the queued messages are published before disconnecting."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    calls = []
+
+    def publish(topic, payload, qos, retain):
+        """Publish slower than disconnecting."""
+        time.sleep(0.01)
+        calls.append(payload)
+
+    mqtt_client.publish.side_effect = publish
+    mqtt_client.disconnect.side_effect = lambda: calls.append("disconnect")
+    mqtt_data = hass.data["mqtt"]
+
+    for idx in range(3):
+        await mqtt_data.async_publish("test/topic", str(idx), 0, False)
+    await mqtt_data.async_disconnect()
+
+    assert calls == ["0", "1", "2", "disconnect"]
+
+
+async def test_mqtt_publish_error_keeps_publishing(hass, caplog):
+    """Test an error publishing a message does not stop the queue."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    mqtt_client.publish.side_effect = [OSError("broken"), None]
+    mqtt_data = hass.data["mqtt"]
+
+    await mqtt_data.async_publish("test/topic", "0", 0, False)
+    await mqtt_data.async_publish("test/topic", "1", 0, False)
+    await hass.async_block_till_done()
+
+    assert mqtt_data.pending_publishes == 0
+    assert mqtt_client.publish.mock_calls == [
+        mock.call("test/topic", "0", 0, False),
+        mock.call("test/topic", "1", 0, False),
+    ]
+    assert "Error publishing message on test/topic" in caplog.text
 
 
 async def test_setup_fails_without_config(hass):
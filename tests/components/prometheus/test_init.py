@@ -113,3 +113,82 @@ async def test_view(prometheus_client):  # pylint: disable=redefined-outer-name
         'entity="sensor.wind_direction",'
         'friendly_name="Wind Direction"} 25.0' in body
     )
+
+
+async def test_update_on_scrape(hass, hass_client):
+    """Test metrics are updated from the current states when scraped."""
+    assert await async_setup_component(
+        hass,
+        prometheus.DOMAIN,
+        {prometheus.DOMAIN: {"namespace": "scrape", "update_on_scrape": True}},
+    )
+    client = await hass_client()
+
+    hass.states.async_set(
+        "sensor.outside_temperature",
+        "12.5",
+        {
+            "unit_of_measurement": "°C",
+            "friendly_name": "Outside",
+            "device_class": "temperature",
+        },
+    )
+    hass.states.async_set(
+        "sensor.outside_temperature",
+        "15.6",
+        {
+            "unit_of_measurement": "°C",
+            "friendly_name": "Outside",
+            "device_class": "temperature",
+        },
+    )
+    hass.states.async_set("automation.alarm", "on", {"friendly_name": "Alarm"})
+    hass.states.async_set(
+        "automation.alarm", "on", {"friendly_name": "Alarm", "last_triggered": 1}
+    )
+    await hass.async_block_till_done()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    assert resp.status == 200
+    body = (await resp.text()).split("\n")
+
+    assert (
+        'scrape_temperature_c{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside"} 15.6' in body
+    )
+    assert (
+        'scrape_state_change_total{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside"} 2.0' in body
+    )
+    assert (
+        'scrape_automation_triggered_count_total{domain="automation",'
+        'entity="automation.alarm",'
+        'friendly_name="Alarm"} 2.0' in body
+    )
+
+    hass.states.async_set(
+        "sensor.outside_temperature",
+        "16.1",
+        {
+            "unit_of_measurement": "°C",
+            "friendly_name": "Outside",
+            "device_class": "temperature",
+        },
+    )
+    await hass.async_block_till_done()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    body = (await resp.text()).split("\n")
+
+    assert (
+        'scrape_temperature_c{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside"} 16.1' in body
+    )
+    assert (
+        'scrape_state_change_total{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside"} 3.0' in body
+    )
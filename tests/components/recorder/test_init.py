@@ -1,16 +1,17 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
+import time
 import unittest
 from unittest.mock import patch
 
 import pytest
 
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import PurgeTask, Recorder, RecorderQueue
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import Events, StateAttributes, States
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import MATCH_ALL
-from homeassistant.core import callback
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.core import Event, State, callback
 from homeassistant.setup import async_setup_component
 
 from tests.common import get_test_home_assistant, init_recorder_component
@@ -189,6 +190,144 @@ def test_saving_state_include_domain_exclude_entity(hass_recorder):
     assert hass.states.get("test.ok").state == "state2"
 
 
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test identical attributes are stored once."""
+    hass = hass_recorder()
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.set("test.one", "on", attributes)
+    hass.states.set("test.two", "on", attributes)
+    hass.data[DATA_INSTANCE].block_till_done()
+    hass.states.set("test.one", "off", attributes)
+    hass.states.set("test.two", "off", {"test_attr": 6})
+    hass.states.set("test.three", "off", {"test_attr": 6})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 5
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        assert all(db_state.attributes is None for db_state in db_states)
+        states = [db_state.to_native() for db_state in db_states]
+
+    assert states[-1] == hass.states.get("test.three")
+    assert states[0].attributes == attributes
+    assert states[-1].attributes == {"test_attr": 6}
+
+
+def test_saving_states_in_batches(hass_recorder):
+    """Test states are written in batches of at most max_batch_size."""
+    hass = hass_recorder({"commit_interval": 30, "max_batch_size": 2})
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(
+        instance, "_write_events", wraps=instance._write_events
+    ) as write_events:
+        states = _add_entities(
+            hass, ["test.recorder1", "test.recorder2", "test.recorder3"]
+        )
+
+    assert len(states) == 3
+    assert [len(call[1][1]) for call in write_events.mock_calls] == [2, 1]
+
+
+def test_commit_timeout():
+    """Test the flush latency of pending events is bounded."""
+    hass = get_test_home_assistant()
+    rec = Recorder(
+        hass,
+        keep_days=7,
+        purge_interval=2,
+        commit_interval=5,
+        max_batch_size=500,
+        max_queue_size=0,
+        queue_overflow="drop_oldest",
+        uri="sqlite://",
+        include={},
+        exclude={},
+    )
+
+    assert rec._commit_timeout() is None
+
+    rec._pending_events.append(object())
+    rec._batch_started = time.monotonic()
+    assert 0 < rec._commit_timeout() <= 5
+
+    rec._batch_started = time.monotonic() - 10
+    assert rec._commit_timeout() == 0
+
+    rec.commit_interval = 0
+    rec._batch_started = time.monotonic()
+    assert rec._commit_timeout() == 0
+
+    hass.stop()
+
+
+def _state_changed_event(entity_id, old_state, new_state, attributes=None):
+    """Create a state_changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": State(entity_id, old_state),
+            "new_state": State(entity_id, new_state, attributes),
+        },
+    )
+
+
+def test_queue_drops_attribute_only_changes_first():
+    """Test a full queue drops the oldest attribute-only update."""
+    rec_queue = RecorderQueue(3, "drop_oldest")
+    first = _state_changed_event("test.one", "on", "off")
+    attr_only = _state_changed_event("test.two", "on", "on", {"brightness": 5})
+    second = _state_changed_event("test.one", "off", "on")
+    third = Event("test_event")
+
+    for item in (first, attr_only, second, third):
+        rec_queue.put(item)
+
+    assert list(rec_queue.queue) == [first, second, third]
+    assert rec_queue.dropped == 1
+    assert rec_queue.unfinished_tasks == 3
+
+
+def test_queue_drops_oldest_event():
+    """Test a full queue without low priority events drops the oldest event."""
+    rec_queue = RecorderQueue(3, "drop_oldest")
+    purge_task = PurgeTask(1, False)
+    events = [Event("test_event", {"idx": idx}) for idx in range(3)]
+
+    rec_queue.put(purge_task)
+    for event in events:
+        rec_queue.put(event)
+
+    assert list(rec_queue.queue) == [purge_task, events[1], events[2]]
+    assert rec_queue.dropped == 1
+
+    attr_only = _state_changed_event("test.two", "on", "on", {"brightness": 5})
+    rec_queue.put(attr_only)
+    assert list(rec_queue.queue) == [purge_task, events[1], events[2]]
+    assert rec_queue.dropped == 2
+    assert rec_queue.unfinished_tasks == 3
+
+
+def test_queue_coalesces_state_changes():
+    """Test a full queue replaces pending state changes of the same entity."""
+    rec_queue = RecorderQueue(3, "coalesce")
+    first = _state_changed_event("test.one", "on", "off")
+    other = _state_changed_event("test.two", "on", "off")
+    attr_only = _state_changed_event("test.three", "on", "on", {"brightness": 5})
+    second = _state_changed_event("test.one", "off", "on")
+
+    for item in (first, other, attr_only, second):
+        rec_queue.put(item)
+
+    assert list(rec_queue.queue) == [other, attr_only, second]
+    assert rec_queue.dropped == 1
+
+
 def test_recorder_setup_failure():
     """Test some exceptions."""
     hass = get_test_home_assistant()
@@ -198,7 +337,16 @@ def test_recorder_setup_failure():
     ):
         setup.side_effect = ImportError("driver not found")
         rec = Recorder(
-            hass, keep_days=7, purge_interval=2, uri="sqlite://", include={}, exclude={}
+            hass,
+            keep_days=7,
+            purge_interval=2,
+            commit_interval=0,
+            max_batch_size=500,
+            max_queue_size=0,
+            queue_overflow="drop_oldest",
+            uri="sqlite://",
+            include={},
+            exclude={},
         )
         rec.start()
         rec.join()
@@ -222,3 +370,7 @@ async def test_defaults_set(hass):
     assert recorder_config is not None
     assert recorder_config["purge_keep_days"] == 10
     assert recorder_config["purge_interval"] == 1
+    assert recorder_config["commit_interval"] == 0
+    assert recorder_config["max_batch_size"] == 500
+    assert recorder_config["max_queue_size"] == 0
+    assert recorder_config["queue_overflow"] == "drop_oldest"
@@ -5,7 +5,13 @@ import unittest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
-from homeassistant.components.recorder.models import Base, Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Base,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.core as ha
 from homeassistant.util import dt
@@ -60,6 +66,27 @@ class TestStates(unittest.TestCase):
         )
         assert state == States.from_event(event).to_native()
 
+    def test_from_event_with_attributes(self):
+        """Test converting event to db state with shared attributes."""
+        state = ha.State("sensor.temperature", "18", {"unit_of_measurement": "°C"})
+        event = ha.Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+            context=state.context,
+        )
+        db_state = States.from_event(event)
+        db_state.state_attributes = StateAttributes.from_event(event)
+
+        assert db_state.attributes is None
+        assert state == db_state.to_native()
+
+    def test_attributes_hash(self):
+        """Test the attributes hash is stable and fits a signed 64 bit int."""
+        attrs_hash = StateAttributes.hash_shared_attrs('{"test": 1}')
+        assert attrs_hash == StateAttributes.hash_shared_attrs('{"test": 1}')
+        assert attrs_hash != StateAttributes.hash_shared_attrs('{"test": 2}')
+        assert -(2 ** 63) <= attrs_hash < 2 ** 63
+
     def test_from_event_to_delete_state(self):
         """Test converting deleting state event to db state."""
         event = ha.Event(
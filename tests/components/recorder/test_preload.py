@@ -0,0 +1,110 @@
+"""The tests for loading the history of many entities at once."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components import history
+from homeassistant.components.recorder import preload
+from homeassistant.components.recorder.const import DATA_INSTANCE
+import homeassistant.util.dt as dt_util
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass)
+    hass.start()
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+    yield hass
+    hass.stop()
+
+
+def _set_state(hass, when, entity_id, value, attributes=None):
+    """Set the state of an entity at a point in time and record it."""
+    with patch("homeassistant.util.dt.utcnow", return_value=when):
+        hass.states.set(entity_id, value, attributes)
+        hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+
+def _load(hass, *requests):
+    """Load requests together, return the states of each one."""
+
+    async def load_all():
+        """Request all states before the first load."""
+        return await asyncio.gather(
+            *(preload.async_load_states(hass, **request) for request in requests)
+        )
+
+    return asyncio.run_coroutine_threadsafe(load_all(), hass.loop).result()
+
+
+def test_load_states(hass_recorder):
+    """Test requests get the same states as the history queries."""
+    hass = hass_recorder
+    now = dt_util.utcnow()
+
+    for minutes in range(1, 6):
+        _set_state(hass, now + timedelta(minutes=minutes), "sensor.a", str(minutes))
+        _set_state(hass, now + timedelta(minutes=minutes), "sensor.b", str(minutes))
+    _set_state(hass, now + timedelta(minutes=5.5), "sensor.a", "5", {"attr": 1})
+
+    start = now + timedelta(minutes=2.5)
+    end = now + timedelta(minutes=4.5)
+
+    with patch.object(preload, "_load_batch", wraps=preload._load_batch) as load:
+        last_changes, last_states, changes, during_period, limited, missing = _load(
+            hass,
+            {"entity_id": "sensor.a", "number_of_states": 2, "changes_only": True},
+            {"entity_id": "sensor.a", "number_of_states": 2},
+            {
+                "entity_id": "sensor.a",
+                "start_time": start,
+                "changes_only": True,
+                "include_start_time_state": True,
+            },
+            {"entity_id": "sensor.a", "start_time": start, "end_time": end},
+            {"entity_id": "sensor.B", "start_time": start, "number_of_states": 2},
+            {"entity_id": "sensor.missing", "number_of_states": 2},
+        )
+
+    assert load.call_count == 1
+
+    expected = history.get_last_state_changes(hass, 2, "sensor.a")["sensor.a"]
+    assert last_changes == expected
+    assert [state.state for state in last_changes] == ["4", "5"]
+    assert [state.attributes for state in last_states] == [{}, {"attr": 1}]
+
+    expected = history.state_changes_during_period(hass, start, entity_id="sensor.a")
+    assert changes == expected["sensor.a"]
+    assert [state.last_updated for state in changes] == [
+        state.last_updated for state in expected["sensor.a"]
+    ]
+    assert [state.state for state in changes] == ["2", "3", "4", "5"]
+    assert changes[0].last_updated == start
+
+    assert [state.state for state in during_period] == ["3", "4"]
+    assert [state.state for state in limited] == ["4", "5"]
+    assert missing == []
+
+
+def test_load_states_in_batches(hass_recorder):
+    """Test many requests are split in batches."""
+    hass = hass_recorder
+    now = dt_util.utcnow()
+
+    _set_state(hass, now + timedelta(minutes=1), "sensor.a", "1")
+
+    with patch.object(preload, "PRELOAD_BATCH_SIZE", 2), patch.object(
+        preload, "_load_batch", wraps=preload._load_batch
+    ) as load:
+        results = _load(hass, *({"entity_id": "sensor.a"} for _ in range(5)))
+
+    assert load.call_count == 3
+    assert [[state.state for state in states] for states in results] == [["1"]] * 5
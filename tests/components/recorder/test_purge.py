@@ -4,11 +4,20 @@ import json
 import unittest
 from unittest.mock import patch
 
+from homeassistant import core as ha
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.models import (
+    Events,
+    StateAttributes,
+    States,
+    Statistics,
+)
+from homeassistant.components.recorder import purge
 from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.statistics import PERIOD_5MINUTE, PERIOD_HOUR
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -107,6 +116,194 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 states left after purging
             assert states.count() == 2
 
+    def test_purge_in_batches(self):
+        """Test purging stops once the time budget is used up."""
+        self._add_test_states()
+        self._add_test_events()
+
+        with patch(
+            "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2
+        ), patch("homeassistant.components.recorder.purge.PURGE_TIME_BUDGET", 0):
+            instance = self.hass.data[DATA_INSTANCE]
+            with session_scope(hass=self.hass) as session:
+                states = session.query(States)
+                events = session.query(Events).filter(
+                    Events.event_type.like("EVENT_TEST%")
+                )
+
+                assert not purge_old_data(instance, 4, repack=False)
+                assert states.count() == 4
+                assert events.count() == 6
+
+                assert not purge_old_data(instance, 4, repack=False)
+                assert states.count() == 2
+
+                assert not purge_old_data(instance, 4, repack=False)
+                assert events.count() == 4
+
+                assert not purge_old_data(instance, 4, repack=False)
+                assert purge_old_data(instance, 4, repack=False)
+                assert states.count() == 2
+                assert events.count() == 2
+
+    def test_purge_service_continues_in_batches(self):
+        """Test the purge service continues until all data is purged."""
+        self._add_test_states()
+        self._add_test_events()
+
+        with patch(
+            "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 1
+        ), patch("homeassistant.components.recorder.purge.PURGE_TIME_BUDGET", 0):
+            self.hass.services.call("recorder", "purge", service_data={"keep_days": 4})
+            self.hass.block_till_done()
+            self.hass.data[DATA_INSTANCE].block_till_done()
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(States).count() == 2
+            assert (
+                session.query(Events)
+                .filter(Events.event_type.like("EVENT_TEST%"))
+                .count()
+                == 2
+            )
+
+    def test_purge_unused_state_attributes(self):
+        """Test deleting attributes no longer used by any state."""
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for attributes_id in range(1, 3):
+                session.add(
+                    StateAttributes(
+                        attributes_id=attributes_id,
+                        hash=attributes_id,
+                        shared_attrs=json.dumps({"idx": attributes_id}),
+                    )
+                )
+            session.add(
+                States(
+                    entity_id="test.recorder2",
+                    domain="sensor",
+                    state="dontpurgeme",
+                    attributes_id=2,
+                    last_changed=datetime.now(),
+                    last_updated=datetime.now(),
+                )
+            )
+
+        with session_scope(hass=self.hass) as session:
+            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+            attributes = session.query(StateAttributes)
+            assert [attrs.attributes_id for attrs in attributes] == [2]
+
+    def test_purge_unused_state_attributes_in_batches(self):
+        """Test unused attributes are purged in batches within the budget."""
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for attributes_id in range(1, 4):
+                session.add(
+                    StateAttributes(
+                        attributes_id=attributes_id,
+                        hash=attributes_id,
+                        shared_attrs=json.dumps({"idx": attributes_id}),
+                    )
+                )
+
+        with patch(
+            "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2
+        ), patch("homeassistant.components.recorder.purge.PURGE_TIME_BUDGET", 0):
+            instance = self.hass.data[DATA_INSTANCE]
+            with session_scope(hass=self.hass) as session:
+                attributes = session.query(StateAttributes)
+
+                assert not purge_old_data(instance, 4, repack=False)
+                assert attributes.count() == 1
+
+                assert not purge_old_data(instance, 4, repack=False)
+                assert purge_old_data(instance, 4, repack=False)
+                assert attributes.count() == 0
+
+    def test_purge_rounds_forget_purged_attributes(self):
+        """Test states written between purge rounds get existing attributes."""
+        instance = self.hass.data[DATA_INSTANCE]
+        self.hass.states.set("sensor.a", "1", {"attr": "a"})
+        self.hass.block_till_done()
+        instance.block_till_done()
+        old_state = self.hass.states.get("sensor.a")
+        self.hass.states.set("sensor.a", "2", {"attr": "b"})
+        self.hass.block_till_done()
+        instance.block_till_done()
+
+        # The attributes of the first state are no longer used
+        with recorder.session_scope(hass=self.hass) as session:
+            session.query(States).filter(States.state == "1").delete()
+
+        purge_old_data = purge.purge_old_data
+
+        def purge_and_record(*args):
+            """Record a state with the purged attributes after the round."""
+            done = purge_old_data(*args)
+            instance.queue.put(
+                ha.Event(
+                    EVENT_STATE_CHANGED,
+                    {
+                        "entity_id": "sensor.a",
+                        "old_state": self.hass.states.get("sensor.a"),
+                        "new_state": ha.State("sensor.a", "3", old_state.attributes),
+                    },
+                )
+            )
+            return done
+
+        with patch.object(purge, "PURGE_BATCH_SIZE", 1), patch.object(
+            purge, "PURGE_TIME_BUDGET", 0
+        ), patch.object(purge, "purge_old_data", side_effect=purge_and_record):
+            self.hass.services.call("recorder", "purge", service_data={"keep_days": 4})
+            self.hass.block_till_done()
+            instance.block_till_done()
+
+        with session_scope(hass=self.hass) as session:
+            states = session.query(States).filter(States.state == "3").all()
+            assert len(states) == 2
+            for state in states:
+                assert state.to_native().attributes == {"attr": "a"}
+
+    def test_purge_old_statistics(self):
+        """Test deleting statistics of periods ended before keep_days."""
+        self.hass.block_till_done()
+        self.hass.data[DATA_INSTANCE].block_till_done()
+        purge_before = datetime.utcnow() - timedelta(days=4)
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for period, start, mean in (
+                (PERIOD_5MINUTE, purge_before - timedelta(minutes=10), 1),
+                (PERIOD_5MINUTE, purge_before - timedelta(minutes=2), 2),
+                (PERIOD_HOUR, purge_before - timedelta(hours=2), 3),
+                (PERIOD_HOUR, purge_before - timedelta(minutes=30), 4),
+                (PERIOD_HOUR, datetime.utcnow(), 5),
+            ):
+                session.add(
+                    Statistics(
+                        entity_id="sensor.power",
+                        period=period,
+                        start=start,
+                        mean=mean,
+                        min=mean,
+                        max=mean,
+                        count=1,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+            statistics = session.query(Statistics).order_by(Statistics.mean)
+            assert [row.mean for row in statistics] == [2, 4, 5]
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -174,6 +371,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 assert (
-                    mock_logger.debug.mock_calls[3][1][0]
+                    mock_logger.debug.mock_calls[-1][1][0]
                     == "Vacuuming SQL DB to free space"
                 )
@@ -0,0 +1,41 @@
+"""The tests for the recorder sensors."""
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.setup import setup_component
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+class TestRecorderSensor:
+    """Test the recorder sensors."""
+
+    def setup_method(self, method):
+        """Set up things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        init_recorder_component(self.hass)
+        self.hass.start()
+
+    def teardown_method(self, method):
+        """Stop everything that was started."""
+        self.hass.stop()
+
+    def test_sensors(self):
+        """Test the recorder statistics are reported."""
+        instance = self.hass.data[DATA_INSTANCE]
+        self.hass.block_till_done()
+        instance.block_till_done()
+
+        assert setup_component(
+            self.hass, "sensor", {"sensor": {"platform": "recorder"}}
+        )
+        self.hass.block_till_done()
+
+        state = self.hass.states.get("sensor.recorder_queue_depth")
+        assert state.state == "0"
+        assert state.attributes.get("unit_of_measurement") == "events"
+
+        state = self.hass.states.get("sensor.recorder_dropped_events")
+        assert state.state == "0"
+
+        state = self.hass.states.get("sensor.recorder_write_latency")
+        assert float(state.state) >= 0
+        assert state.attributes.get("unit_of_measurement") == "ms"
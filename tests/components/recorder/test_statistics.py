@@ -0,0 +1,108 @@
+"""The tests for the statistics compiled by the recorder."""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytz
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOUR,
+    period_start,
+)
+from homeassistant.components.recorder.util import session_scope
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass)
+    hass.start()
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+    yield hass
+    hass.stop()
+
+
+def _set_states(hass, entity_id, values, attributes):
+    """Set a sensor to each of the values and wait for them to be recorded."""
+    for value in values:
+        hass.states.set(entity_id, value, attributes, force_update=True)
+        hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+
+def _statistics(hass, period):
+    """Return the recorded statistics of a period length."""
+    with session_scope(hass=hass) as session:
+        return [
+            (row.entity_id, row.count, row.min, row.max, row.mean)
+            for row in session.query(Statistics).filter(Statistics.period == period)
+        ]
+
+
+def test_period_start():
+    """Test the start of the period containing a timestamp."""
+    timestamp = datetime(2020, 1, 1, 10, 17, 42, tzinfo=pytz.utc)
+
+    assert period_start(timestamp, PERIOD_5MINUTE) == datetime(
+        2020, 1, 1, 10, 15, tzinfo=pytz.utc
+    )
+    assert period_start(timestamp, PERIOD_HOUR) == datetime(
+        2020, 1, 1, 10, tzinfo=pytz.utc
+    )
+
+
+def test_compile_statistics(hass_recorder):
+    """Test statistics are compiled for numeric sensors only."""
+    hass = hass_recorder
+    now = datetime(2020, 1, 1, 10, 2, tzinfo=pytz.utc)
+
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        _set_states(
+            hass, "sensor.power", ["10", "20", "unknown"], {"unit_of_measurement": "W"}
+        )
+        _set_states(hass, "sensor.power", ["30"], {"unit_of_measurement": "W"})
+        _set_states(hass, "sensor.text", ["1", "2"], {})
+
+    assert _statistics(hass, PERIOD_5MINUTE) == [("sensor.power", 3, 10, 30, 20)]
+    assert _statistics(hass, PERIOD_HOUR) == [("sensor.power", 3, 10, 30, 20)]
+
+    now += timedelta(minutes=5)
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        _set_states(hass, "sensor.power", ["50"], {"unit_of_measurement": "W"})
+
+    assert _statistics(hass, PERIOD_5MINUTE) == [
+        ("sensor.power", 3, 10, 30, 20),
+        ("sensor.power", 1, 50, 50, 50),
+    ]
+    assert _statistics(hass, PERIOD_HOUR) == [("sensor.power", 4, 10, 50, 27.5)]
+
+
+def test_continue_recorded_period(hass_recorder):
+    """Test a period recorded before a restart is continued."""
+    hass = hass_recorder
+    now = datetime(2020, 1, 1, 10, 2, tzinfo=pytz.utc)
+
+    with session_scope(hass=hass) as session:
+        session.add(
+            Statistics(
+                entity_id="sensor.power",
+                period=PERIOD_HOUR,
+                start=datetime(2020, 1, 1, 10, tzinfo=pytz.utc),
+                mean=10,
+                min=5,
+                max=15,
+                count=2,
+            )
+        )
+
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        _set_states(hass, "sensor.power", ["40"], {"unit_of_measurement": "W"})
+
+    assert _statistics(hass, PERIOD_HOUR) == [("sensor.power", 3, 5, 40, 20)]
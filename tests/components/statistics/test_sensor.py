@@ -1,5 +1,7 @@
 """The test for the statistics sensor platform."""
+from collections import deque
 from datetime import datetime, timedelta
+import random
 import statistics
 import unittest
 from unittest.mock import patch
@@ -7,7 +9,10 @@ from unittest.mock import patch
 import pytest
 
 from homeassistant.components import recorder
-from homeassistant.components.statistics.sensor import StatisticsSensor
+from homeassistant.components.statistics.sensor import (
+    RunningStatistics,
+    StatisticsSensor,
+)
 from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, STATE_UNKNOWN, TEMP_CELSIUS
 from homeassistant.setup import setup_component
 from homeassistant.util import dt as dt_util
@@ -419,3 +424,38 @@ class TestStatisticsSensor(unittest.TestCase):
         assert mock_data["return_time"] == state.attributes.get("max_age") + timedelta(
             hours=1
         )
+
+
+def test_running_statistics():
+    """Test running statistics match the statistics module."""
+    rng = random.Random(42)
+    values = [
+        rng.choice((-1, 1)) * rng.random() * 10 ** rng.randint(-3, 6)
+        for _ in range(500)
+    ]
+    values += [0.1, 0.2, 0.3, 1e-9, 1e9, 5.0, 5.0, -0.0]
+    window = deque()
+    stats = RunningStatistics()
+
+    for value in values:
+        if len(window) == 20:
+            stats.remove(window.popleft())
+        window.append(value)
+        stats.add(value)
+
+        assert stats.count == len(window)
+        assert stats.sorted == sorted(window)
+        assert stats.mean == statistics.mean(window)
+        assert stats.median == statistics.median(window)
+        assert stats.total == pytest.approx(sum(window), rel=1e-12, abs=1e-9)
+        if len(window) > 1:
+            assert stats.variance == pytest.approx(
+                statistics.variance(window), rel=1e-12
+            )
+            assert stats.stdev == pytest.approx(statistics.stdev(window), rel=1e-12)
+
+    while window:
+        stats.remove(window.popleft())
+
+    assert stats.count == 0
+    assert stats.total == 0
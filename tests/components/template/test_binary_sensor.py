@@ -545,8 +545,8 @@ async def test_invalid_availability_template_keeps_component_available(hass, cap
     assert ("UndefinedError: 'x' is undefined") in caplog.text
 
 
-async def test_no_update_template_match_all(hass, caplog):
-    """Test that we do not update sensors that match on all."""
+async def test_templates_without_entity_ids_track_accessed_states(hass, caplog):
+    """Test sensors without entity ids follow the states their templates access."""
     hass.states.async_set("binary_sensor.test_sensor", "true")
 
     await setup.async_setup_component(
@@ -575,26 +575,6 @@ async def test_no_update_template_match_all(hass, caplog):
     )
     await hass.async_block_till_done()
     assert len(hass.states.async_all()) == 5
-    assert (
-        "Template binary sensor 'all_state' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the value template"
-    ) in caplog.text
-    assert (
-        "Template binary sensor 'all_icon' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the icon template"
-    ) in caplog.text
-    assert (
-        "Template binary sensor 'all_entity_picture' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the entity_picture template"
-    ) in caplog.text
-    assert (
-        "Template binary sensor 'all_attribute' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the test_attribute template"
-    ) in caplog.text
 
     assert hass.states.get("binary_sensor.all_state").state == "off"
     assert hass.states.get("binary_sensor.all_icon").state == "off"
@@ -608,14 +588,16 @@ async def test_no_update_template_match_all(hass, caplog):
     assert hass.states.get("binary_sensor.all_icon").state == "on"
     assert hass.states.get("binary_sensor.all_entity_picture").state == "on"
     assert hass.states.get("binary_sensor.all_attribute").state == "on"
+    assert "Template binary_sensor 'all_state' has no entity ids" in caplog.text
+    assert "Template binary_sensor 'all_icon' has no entity ids" not in caplog.text
 
     hass.states.async_set("binary_sensor.test_sensor", "false")
     await hass.async_block_till_done()
 
     assert hass.states.get("binary_sensor.all_state").state == "on"
-    assert hass.states.get("binary_sensor.all_icon").state == "on"
-    assert hass.states.get("binary_sensor.all_entity_picture").state == "on"
-    assert hass.states.get("binary_sensor.all_attribute").state == "on"
+    assert hass.states.get("binary_sensor.all_icon").state == "off"
+    assert hass.states.get("binary_sensor.all_entity_picture").state == "off"
+    assert hass.states.get("binary_sensor.all_attribute").state == "off"
 
     await hass.helpers.entity_component.async_update_entity("binary_sensor.all_state")
     await hass.helpers.entity_component.async_update_entity("binary_sensor.all_icon")
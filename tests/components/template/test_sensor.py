@@ -1,4 +1,6 @@
 """The test for the Template sensor platform."""
+from unittest.mock import patch
+
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_START,
     STATE_OFF,
@@ -517,8 +519,8 @@ async def test_invalid_availability_template_keeps_component_available(hass, cap
     assert ("UndefinedError: 'x' is undefined") in caplog.text
 
 
-async def test_no_template_match_all(hass, caplog):
-    """Test that we do not allow sensors that match on all."""
+async def test_templates_without_entity_ids_track_accessed_states(hass, caplog):
+    """Test sensors without entity ids follow the states their templates access."""
     hass.states.async_set("sensor.test_sensor", "startup")
 
     await async_setup_component(
@@ -557,31 +559,6 @@ async def test_no_template_match_all(hass, caplog):
 
     await hass.async_block_till_done()
     assert len(hass.states.async_all()) == 6
-    assert (
-        "Template sensor 'invalid_state' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the value template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_icon' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the icon template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_entity_picture' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the entity_picture template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_friendly_name' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the friendly_name template"
-    ) in caplog.text
-    assert (
-        "Template sensor 'invalid_attribute' has no entity ids "
-        "configured to track nor were we able to extract the entities to "
-        "track from the test_attribute template"
-    ) in caplog.text
 
     assert hass.states.get("sensor.invalid_state").state == "unknown"
     assert hass.states.get("sensor.invalid_icon").state == "unknown"
@@ -594,6 +571,8 @@ async def test_no_template_match_all(hass, caplog):
 
     assert hass.states.get("sensor.invalid_state").state == "2"
     assert hass.states.get("sensor.invalid_icon").state == "startup"
+    assert "Template sensor 'invalid_state' has no entity ids" in caplog.text
+    assert "Template sensor 'invalid_icon' has no entity ids" not in caplog.text
     assert hass.states.get("sensor.invalid_entity_picture").state == "startup"
     assert hass.states.get("sensor.invalid_friendly_name").state == "startup"
     assert hass.states.get("sensor.invalid_attribute").state == "startup"
@@ -602,10 +581,10 @@ async def test_no_template_match_all(hass, caplog):
     await hass.async_block_till_done()
 
     assert hass.states.get("sensor.invalid_state").state == "2"
-    assert hass.states.get("sensor.invalid_icon").state == "startup"
-    assert hass.states.get("sensor.invalid_entity_picture").state == "startup"
-    assert hass.states.get("sensor.invalid_friendly_name").state == "startup"
-    assert hass.states.get("sensor.invalid_attribute").state == "startup"
+    assert hass.states.get("sensor.invalid_icon").state == "hello"
+    assert hass.states.get("sensor.invalid_entity_picture").state == "hello"
+    assert hass.states.get("sensor.invalid_friendly_name").state == "hello"
+    assert hass.states.get("sensor.invalid_attribute").state == "hello"
 
     await hass.helpers.entity_component.async_update_entity("sensor.invalid_state")
     await hass.helpers.entity_component.async_update_entity("sensor.invalid_icon")
@@ -622,3 +601,48 @@ async def test_no_template_match_all(hass, caplog):
     assert hass.states.get("sensor.invalid_entity_picture").state == "hello"
     assert hass.states.get("sensor.invalid_friendly_name").state == "hello"
     assert hass.states.get("sensor.invalid_attribute").state == "hello"
+
+
+async def test_track_accessed_states(hass):
+    """Test sensors only update on changes of the states they access."""
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("light.one", "on")
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "total": {
+                        "value_template": "{{ states.sensor | rejectattr('entity_id', "
+                        "'eq', 'sensor.total') | map(attribute='state') "
+                        "| map('int') | sum }}"
+                    }
+                },
+            }
+        },
+    )
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total").state == "1"
+
+    hass.states.async_set("sensor.two", "2")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total").state == "3"
+
+    hass.states.async_set("sensor.one", "4")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total").state == "6"
+
+    with patch(
+        "homeassistant.helpers.template.Template.async_render_to_info"
+    ) as mock_render:
+        hass.states.async_set("light.one", "off")
+        await hass.async_block_till_done()
+        assert not mock_render.called
+
+    hass.states.async_remove("sensor.two")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.total").state == "4"
@@ -1,18 +1,23 @@
 """Tests for WebSocket API commands."""
+from datetime import timedelta
+from unittest.mock import patch
+
 from async_timeout import timeout
 
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, messages
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import URL
-from homeassistant.core import callback
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
-from tests.common import async_mock_service
+from tests.common import async_fire_time_changed, async_mock_service
 
 
 async def test_call_service(hass, websocket_client):
@@ -185,6 +190,161 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_encoded_once(hass, websocket_client):
+    """Test an event is encoded once for all subscriptions."""
+    init_count = sum(hass.bus.async_listeners().values())
+
+    for iden in (5, 6):
+        await websocket_client.send_json(
+            {"id": iden, "type": "subscribe_events", "event_type": "test_event"}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    # Both subscriptions share a listener
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    with patch(
+        "homeassistant.components.websocket_api.messages.event_message_template",
+        wraps=messages.event_message_template,
+    ) as mock_template:
+        hass.bus.async_fire("test_event", {"hello": "world"})
+
+        for iden in (5, 6):
+            with timeout(3):
+                msg = await websocket_client.receive_json()
+
+            assert msg["id"] == iden
+            assert msg["type"] == "event"
+            assert msg["event"]["event_type"] == "test_event"
+            assert msg["event"]["data"] == {"hello": "world"}
+
+    assert len(mock_template.mock_calls) == 1
+
+    for iden, subscription in ((7, 5), (8, 6)):
+        await websocket_client.send_json(
+            {"id": iden, "type": "unsubscribe_events", "subscription": subscription}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribing to the state changes of some entities."""
+    init_count = sum(hass.bus.async_listeners().values())
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen"],
+            "domains": ["sensor"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.kitchen", "on")
+    hass.states.async_set("sensor.temperature", "21")
+
+    for entity_id, state in (("light.kitchen", "on"), ("sensor.temperature", "21")):
+        with timeout(3):
+            msg = await websocket_client.receive_json()
+
+        assert msg["id"] == 5
+        assert msg["type"] == "event"
+        assert msg["event"]["event_type"] == "state_changed"
+        assert msg["event"]["data"]["entity_id"] == entity_id
+        assert msg["event"]["data"]["new_state"]["state"] == state
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    assert sum(hass.bus.async_listeners().values()) == init_count
+    assert not hass.data[const.DATA_ENTITY_SUBSCRIPTIONS].by_entity_id
+    assert not hass.data[const.DATA_ENTITY_SUBSCRIPTIONS].by_domain
+
+
+async def test_subscribe_entities_requires_filter(hass, websocket_client):
+    """Test subscribing to entities without entity_ids or domains."""
+    await websocket_client.send_json({"id": 5, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
+async def test_subscribe_entities_min_interval(hass, websocket_client):
+    """Test state changes within the minimum interval are coalesced."""
+    now = dt_util.utcnow()
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["sensor.power"],
+            "min_interval": 10,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        hass.states.async_set("sensor.power", "1")
+        hass.states.async_set("sensor.power", "2")
+        hass.states.async_set("sensor.power", "3")
+
+        with timeout(3):
+            msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["new_state"]["state"] == "1"
+
+    later = now + timedelta(seconds=10)
+    with patch("homeassistant.util.dt.utcnow", return_value=later):
+        async_fire_time_changed(hass, later)
+
+        with timeout(3):
+            msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"]["data"]["new_state"]["state"] == "3"
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+
+async def test_subscribe_entities_permissions(hass, websocket_client, hass_admin_user):
+    """Test state changes of entities the user cannot read are not sent."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.kitchen": True}}})
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_entities", "domains": ["light"]}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.kitchen", "on")
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["entity_id"] == "light.kitchen"
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -199,7 +359,7 @@ async def test_get_states(hass, websocket_client):
 
     states = []
     for state in hass.states.async_all():
-        state = state.as_dict()
+        state = dict(state.as_dict())
         state["last_changed"] = state["last_changed"].isoformat()
         state["last_updated"] = state["last_updated"].isoformat()
         states.append(state)
@@ -324,6 +484,27 @@ async def test_get_states_not_allows_nan(hass, websocket_client):
     assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
 
 
+def test_state_changed_event_message_template():
+    """Test state changed events are encoded with the JSON of the states."""
+    new_state = State("light.kitchen", "on", {"brightness": 100})
+    event = Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": "light.kitchen",
+            "old_state": State("light.kitchen", "off"),
+            "new_state": new_state,
+        },
+    )
+
+    template = messages.event_message_template(event)
+
+    assert template == const.JSON_DUMP(
+        messages.event_message(messages.IDEN_TEMPLATE, event)
+    )
+    assert new_state.as_json() in template
+    assert messages.event_message_json(5, template).startswith('{"id": 5,')
+
+
 async def test_subscribe_unsubscribe_events_whitelist(
     hass, websocket_client, hass_admin_user
 ):
@@ -480,3 +480,35 @@ async def test_loading_race_condition(hass):
 
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_lookup_follows_updates(registry):
+    """Test devices are found by their current identifiers and connections."""
+    entry = registry.async_get_or_create(
+        config_entry_id="1234",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("hue", "456")},
+    )
+
+    updated = registry.async_update_device(entry.id, new_identifiers={("hue", "789")})
+
+    assert registry.async_get_device({("hue", "456")}, set()) is None
+    assert registry.async_get_device({("hue", "789")}, set()) is updated
+    assert (
+        registry.async_get_device(
+            set(), {(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:ab:cd:ef")}
+        )
+        is updated
+    )
+
+    other = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "abc")}
+    )
+    # The first registered device is returned when several match
+    assert registry.async_get_device({("hue", "abc"), ("hue", "789")}, set()) is (
+        updated
+    )
+
+    registry.async_remove_device(entry.id)
+    assert registry.async_get_device({("hue", "789")}, set()) is None
+    assert registry.async_get_device({("hue", "abc"), ("hue", "789")}, set()) is other
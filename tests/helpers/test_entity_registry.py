@@ -535,3 +535,43 @@ async def test_restore_states(hass):
     assert hass.states.get("light.simple") is None
     assert hass.states.get("light.disabled") is None
     assert hass.states.get("light.all_info_set") is None
+
+
+async def test_indexes_follow_updates(hass, registry):
+    """Test the lookups by unique id, device and config entry stay consistent."""
+    mock_config_1 = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    mock_config_2 = MockConfigEntry(domain="light", entry_id="mock-id-2")
+    entry = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=mock_config_1, device_id="device-1"
+    )
+    other = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=mock_config_1, device_id="device-1"
+    )
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry,
+        other,
+    ]
+
+    entry = registry.async_update_entity(
+        entry.entity_id, new_entity_id="light.renamed", new_unique_id="4321"
+    )
+    assert registry.async_get_entity_id("light", "hue", "1234") is None
+    assert registry.async_get_entity_id("light", "hue", "4321") == "light.renamed"
+
+    entry = registry.async_get_or_create(
+        "light", "hue", "4321", config_entry=mock_config_2, device_id="device-2"
+    )
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [other]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [entry]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        other
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-2") == [
+        entry
+    ]
+
+    registry.async_remove(entry.entity_id)
+    assert registry.async_get_entity_id("light", "hue", "4321") is None
+    assert entity_registry.async_entries_for_device(registry, "device-2") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-2") == []
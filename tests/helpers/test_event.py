@@ -12,11 +12,14 @@ from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.helpers.event import (
+    TRACK_TIME_TIMERS,
+    RenderInfoTracker,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
     async_track_state_change,
+    async_track_state_change_event,
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
@@ -86,6 +89,48 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_order(hass):
+    """Test point in time trackers share a listener and fire in order."""
+    init_count = sum(hass.bus.async_listeners().values())
+    first = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    second = datetime(1986, 7, 9, 12, 0, 5, tzinfo=dt_util.UTC)
+    runs = []
+
+    async_track_point_in_utc_time(hass, callback(lambda x: runs.append(2)), second)
+    async_track_point_in_utc_time(hass, callback(lambda x: runs.append(1)), first)
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(3)), second
+    )
+
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    unsub()
+
+    _send_time_changed(hass, second)
+    await hass.async_block_till_done()
+    assert runs == [1, 2]
+
+    # The listener is removed once all timers fired
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_track_point_in_time_cancel_many(hass):
+    """Test cancelled timers do not pile up."""
+    point = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    async_track_point_in_utc_time(hass, callback(lambda x: runs.append(1)), point)
+
+    for _ in range(100):
+        async_track_point_in_utc_time(hass, callback(lambda x: runs.append(2)), point)()
+
+    assert len(hass.data[TRACK_TIME_TIMERS]._heap) < 100
+
+    _send_time_changed(hass, point)
+    await hass.async_block_till_done()
+    assert runs == [1]
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -165,6 +210,102 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_track_state_change_event(hass):
+    """Test track_state_change_event dispatches by entity_id."""
+    init_count = sum(hass.bus.async_listeners().values())
+    single_runs = []
+    multiple_runs = []
+
+    @ha.callback
+    def single_run_callback(event):
+        single_runs.append(event)
+
+    @ha.callback
+    def multiple_run_callback(event):
+        multiple_runs.append(event)
+
+    unsub_single = async_track_state_change_event(
+        hass, "light.Bowl", single_run_callback
+    )
+    unsub_multiple = async_track_state_change_event(
+        hass, ["light.bowl", "switch.kitchen"], multiple_run_callback
+    )
+
+    # All trackers share one listener
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(single_runs) == 1
+    assert len(multiple_runs) == 1
+    assert single_runs[0].data["entity_id"] == "light.bowl"
+    assert single_runs[0].data["new_state"].state == "on"
+
+    hass.states.async_set("switch.kitchen", "on")
+    hass.states.async_set("light.other", "on")
+    await hass.async_block_till_done()
+    assert len(single_runs) == 1
+    assert len(multiple_runs) == 2
+
+    unsub_single()
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    assert len(single_runs) == 1
+    assert len(multiple_runs) == 3
+
+    unsub_multiple()
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(multiple_runs) == 3
+
+
+async def test_track_state_change_event_duplicate_entity_ids(hass):
+    """Test an entity listed twice only calls the action once."""
+    init_count = sum(hass.bus.async_listeners().values())
+    runs = []
+
+    @ha.callback
+    def run_callback(event):
+        runs.append(event)
+
+    unsub = async_track_state_change_event(
+        hass, ["light.bowl", "LIGHT.BOWL", "light.bowl"], run_callback
+    )
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+    unsub()
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+
+async def test_track_state_change_event_exception(hass):
+    """Test an error in one tracker does not affect the others."""
+    runs = []
+
+    @ha.callback
+    def failing_callback(event):
+        raise ValueError
+
+    @ha.callback
+    def run_callback(event):
+        runs.append(event)
+
+    async_track_state_change_event(hass, "light.bowl", failing_callback)
+    async_track_state_change_event(hass, "light.bowl", run_callback)
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+
 async def test_track_template(hass):
     """Test tracking template."""
     specific_runs = []
@@ -233,6 +374,108 @@ async def test_track_template(hass):
     assert len(wildercard_runs) == 2
 
 
+async def test_track_template_dynamic(hass):
+    """Test tracking the states a template accesses while rendering."""
+    runs = []
+
+    template_condition = Template(
+        "{{ states.sensor | selectattr('state', 'eq', 'on') | list | count == 2 }}",
+        hass,
+    )
+
+    hass.states.async_set("sensor.one", "on")
+    hass.states.async_set("light.one", "on")
+
+    @callback
+    def run_callback(entity_id, old_state, new_state):
+        runs.append(entity_id)
+
+    unsub = async_track_template(hass, template_condition, run_callback)
+
+    # Changes of entities outside the iterated domain are ignored
+    with patch.object(
+        template_condition,
+        "async_render_to_info",
+        wraps=template_condition.async_render_to_info,
+    ) as mock_render:
+        hass.states.async_set("light.one", "off")
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 0
+
+        hass.states.async_set("sensor.two", "on")
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 1
+        assert runs == ["sensor.two"]
+
+        hass.states.async_set("sensor.two", "off")
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 2
+
+        hass.states.async_set("sensor.one", "on", {"changed": True})
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 3
+
+        hass.states.async_set("sensor.two", "on")
+        await hass.async_block_till_done()
+        assert runs == ["sensor.two", "sensor.two"]
+
+    unsub()
+    hass.states.async_remove("sensor.two")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+
+async def test_render_info_tracker(hass):
+    """Test tracking the states accessed by several renders."""
+    events = []
+
+    @callback
+    def action(event):
+        events.append(event.data["entity_id"])
+
+    tracker = RenderInfoTracker(hass, action)
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+
+    tracker.async_set_render_infos(
+        [
+            Template("{{ states('sensor.one') }}", hass).async_render_to_info(),
+            Template("{{ states.light | count }}", hass).async_render_to_info(),
+        ]
+    )
+    assert tracker.entities == {"sensor.one"}
+
+    hass.states.async_set("sensor.one", "2")
+    hass.states.async_set("sensor.two", "3")
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("light.one", "off")
+    await hass.async_block_till_done()
+    assert events == ["sensor.one", "light.one"]
+
+    # A failed render keeps tracking what was tracked before
+    tracker.async_set_render_infos(
+        [Template("{{ states('sensor.two') | bad }}", hass).async_render_to_info()]
+    )
+    assert tracker.entities == {"sensor.one"}
+
+    tracker.async_set_render_infos(
+        [Template("{{ states('sensor.two') }}", hass).async_render_to_info()]
+    )
+    assert tracker.entities == {"sensor.two"}
+
+    hass.states.async_set("sensor.one", "3")
+    hass.states.async_set("sensor.two", "4")
+    hass.states.async_remove("light.one")
+    await hass.async_block_till_done()
+    assert events == ["sensor.one", "light.one", "sensor.two"]
+
+    tracker.async_remove()
+    hass.states.async_set("sensor.two", "5")
+    await hass.async_block_till_done()
+    assert len(events) == 3
+
+
 async def test_track_same_state_simple_trigger(hass):
     """Test track_same_change with trigger simple."""
     thread_runs = []
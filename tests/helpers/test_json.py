@@ -1,8 +1,10 @@
 """Test Home Assistant remote methods and classes."""
+import json
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_dumps_event_data
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +21,16 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_dumps_event_data():
+    """Test event data is encoded with the JSON of its states."""
+    old_state = core.State("test.test", "hello")
+    new_state = core.State("test.test", "world", {"list": [1, 2]})
+    data = {"entity_id": "test.test", "old_state": old_state, "new_state": new_state}
+
+    assert json_dumps_event_data(data) == json.dumps(data, cls=JSONEncoder)
+    assert new_state.as_json() in json_dumps_event_data(data)
+
+    with pytest.raises(ValueError):
+        json_dumps_event_data({"value": float("nan")})
@@ -1,9 +1,11 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime
+import json
 import math
 import random
 from unittest.mock import patch
 
+import jinja2
 import pytest
 import pytz
 
@@ -738,6 +740,76 @@ def test_render_with_possible_json_value_non_string_value(hass):
     assert tpl.async_render_with_possible_json_value(value) == expected
 
 
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ value }}",
+        " {{ value_json }} ",
+        "{{ value_json.temperature }}",
+        "{{ value_json['temperature'] | float }}",
+        "{{ value_json.sensor.values[1] }}",
+        "{{ value_json.sensor['values'][-1] | int }}",
+        "{{ value_json.sensor.values[5] }}",
+        "{{ value_json.missing }}",
+        "{{ value_json[0] }}",
+        "{{ value | float }}",
+        "{{ value | int }}",
+        "{{ value | float | round(1) }}",
+        "{{ value_json.temperature | round(precision=1, method='floor') }}",
+        "{{ value_json.sensor.name | float(-1) }}",
+        "{{ value_json.temperature | multiply(2) }}",
+        "{{ value_json.temperature ~ 'C' }}",
+    ],
+)
+@pytest.mark.parametrize(
+    "value",
+    [
+        '{"temperature": 21.56, "sensor": {"name": "x", "values": [1, 2.5, "3"]}}',
+        '{"temperature": "21"}',
+        "[1, 2]",
+        "12.345",
+        "true",
+        "null",
+        "not json",
+    ],
+)
+def test_render_with_possible_json_value_simple(hass, source, value):
+    """Test simple value templates render the same as with jinja."""
+    tpl = template.Template(source, hass)
+    tpl.ensure_valid()
+    variables = {"value": value}
+    try:
+        variables["value_json"] = json.loads(value)
+    except ValueError:
+        pass
+
+    try:
+        expected = tpl.async_render(variables)
+    except TemplateError:
+        expected = "error"
+
+    assert tpl.async_render_with_possible_json_value(value, "error") == expected
+
+
+def test_render_with_possible_json_value_skips_jinja(hass):
+    """Test simple value templates are not rendered with jinja."""
+    tpl = template.Template("{{ value_json.hello.world | float }}", hass)
+    tpl.ensure_valid()
+
+    with patch.object(jinja2.Template, "render") as mock_render:
+        assert (
+            tpl.async_render_with_possible_json_value('{"hello": {"world": "2"}}')
+            == "2.0"
+        )
+        assert not mock_render.called
+
+        tpl.async_render_with_possible_json_value('{"hello": "world"}')
+        assert mock_render.called
+
+    # Jinja returns the method for keys which are dict attributes
+    assert template._compile_value_renderer("{{ value_json.items }}") is None
+
+
 def test_if_state_exists(hass):
     """Test if state exists works."""
     hass.states.async_set("test.object", "available")
@@ -1803,3 +1875,50 @@ def test_render_complex_handling_non_template_values(hass):
     assert template.render_complex(
         {True: 1, False: template.Template("{{ hello }}", hass)}, {"hello": 2}
     ) == {True: 1, False: "2"}
+
+
+def test_compiled_template_cache(hass):
+    """Test identical templates are compiled once."""
+    source = "{{ states('sensor.cached') | float + 1 }}"
+    before = template.compiled_cache_info()
+
+    tpl1 = template.Template(source, hass)
+    tpl2 = template.Template(source, hass)
+    hass.states.async_set("sensor.cached", "1")
+
+    assert tpl1.async_render() == "2.0"
+    assert tpl2.async_render() == "2.0"
+    assert tpl1._compiled_code is tpl2._compiled_code
+    assert tpl1._compiled is tpl2._compiled
+
+    info = template.compiled_cache_info()
+    assert info["misses"] == before["misses"] + 1
+    assert info["hits"] == before["hits"] + 1
+
+    # Templates without hass are compiled in a different environment
+    template.Template(source).ensure_valid()
+    assert template.compiled_cache_info()["misses"] == before["misses"] + 2
+
+    # Syntax errors are not cached
+    with pytest.raises(TemplateError):
+        template.Template("{{ 1 + }}", hass).ensure_valid()
+    with pytest.raises(TemplateError):
+        template.Template("{{ 1 + }}", hass).ensure_valid()
+    assert template.compiled_cache_info()["misses"] == before["misses"] + 4
+
+
+def test_compiled_cache_size():
+    """Test the compiled cache evicts the least recently used entries."""
+    cache = template.CompiledCache(2)
+
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    assert cache.get("a", lambda: 3) == 1
+    assert cache.get("c", lambda: 4) == 4
+    assert cache.get("b", lambda: 5) == 5
+    assert cache.get("a", lambda: 6) == 6
+
+    assert cache.info() == {"hits": 1, "misses": 5, "size": 2, "maxsize": 2}
+
+    cache.clear()
+    assert cache.info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
@@ -1,8 +1,10 @@
 """Test to verify that Home Assistant core works."""
 # pylint: disable=protected-access
 import asyncio
+from copy import copy, deepcopy
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -31,6 +33,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -510,6 +513,63 @@ def test_state_dict_conversion():
     assert state == ha.State.from_dict(state.as_dict())
 
 
+def test_state_as_dict_cached():
+    """Test the dict and JSON of a state are created once."""
+    state = ha.State("domain.hello", "world", {"some": "attr"})
+    as_dict = state.as_dict()
+
+    assert state.as_dict() is as_dict
+    assert as_dict["attributes"] == {"some": "attr"}
+    with pytest.raises(RuntimeError):
+        as_dict["state"] = "changed"
+    with pytest.raises(RuntimeError):
+        as_dict["attributes"]["some"] = "changed"
+
+    as_json = state.as_json()
+    assert state.as_json() is as_json
+    assert as_json == json.dumps(as_dict, cls=JSONEncoder)
+
+    state = ha.State("domain.hello", "world", {"some": float("nan")})
+    with pytest.raises(ValueError):
+        state.as_json()
+
+
+def test_state_copy_not_cached():
+    """Test a copy of a state does not share its cached dict and JSON."""
+    state = ha.State("domain.hello", "world", {"some": "attr"})
+    state.as_dict()
+    state.as_json()
+
+    state_copy = copy(state)
+    state_copy.state = "changed"
+
+    assert state_copy.attributes == state.attributes
+    assert state_copy.context == state.context
+    assert state_copy.last_updated == state.last_updated
+    assert state_copy.as_dict()["state"] == "changed"
+    assert json.loads(state_copy.as_json())["state"] == "changed"
+    assert state.as_dict()["state"] == "world"
+
+
+def test_state_deepcopy_not_cached():
+    """Test a deep copy of a state does not share its cached dict and JSON."""
+    state = ha.State("domain.hello", "world", {"some": ["attr"]})
+    state.as_dict()
+    state.as_json()
+
+    state_copy = deepcopy(state)
+    state_copy.state = "changed"
+
+    assert state_copy.attributes["some"] is not state.attributes["some"]
+
+    assert state_copy.attributes == state.attributes
+    assert state_copy.context == state.context
+    assert state_copy.last_updated == state.last_updated
+    assert state_copy.as_dict()["state"] == "changed"
+    assert json.loads(state_copy.as_json())["state"] == "changed"
+    assert state.as_dict()["state"] == "world"
+
+
 def test_state_dict_conversion_with_wrong_data():
     """Test conversion with wrong data."""
     assert ha.State.from_dict(None) is None